@@ -0,0 +1,89 @@
+# Benchmark de GraficadorMatplotlib
+"""
+Mide cuántos gráficos de torta por segundo se generan con 1 y con 8 hilos de larga
+vida, y con un hilo nuevo por gráfico (como el servidor de Werkzeug, que atiende cada
+petición en un hilo nuevo):
+
+- antes: `pyplot` (`plt.subplots` + `plt.savefig` + `plt.close`), que crea una figura
+  por gráfico y, por usar el estado global de `pyplot`, solo es correcto si los hilos
+  se turnan con un lock;
+- `GraficadorMatplotlib` en PNG y en SVG, con un pool de figuras compartido por los
+  hilos que se reutilizan de un gráfico al siguiente.
+
+Al final compara el tamaño de las imágenes PNG y SVG.
+
+Uso (desde la raíz del proyecto):
+    python -m apps.benchmark_graficos [graficos]
+"""
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from modules.graficador_concreto import GraficadorMatplotlib, COLORES
+
+_lock_pyplot = threading.Lock()
+
+
+def datos_torta(i):
+    """Datos distintos para cada gráfico, con 3 o 4 porciones."""
+    return {'Pendientes': i % 7 + 1, 'En proceso': i % 3, 'Resueltos': i % 5 + 2, 'Inválidos': i % 4 + 1}
+
+
+def torta_pyplot(datos, titulo):
+    """La implementación anterior, basada en el estado global de pyplot."""
+    labels = [label for label, value in datos.items() if value > 0]
+    values = [value for value in datos.values() if value > 0]
+    with _lock_pyplot:
+        fig, ax = plt.subplots(figsize=(8, 8))
+        ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90, colors=COLORES)
+        ax.axis('equal')
+        ax.set_title(titulo, fontsize=16)
+        buf = io.BytesIO()
+        plt.savefig(buf, format='png', bbox_inches='tight')
+        plt.close()
+    return buf.getvalue()
+
+
+def medir(descripcion, crear, graficos, hilos):
+    """Genera `graficos` tortas repartidas en `hilos` hilos y muestra el rendimiento."""
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        list(ejecutor.map(lambda i: crear(datos_torta(i), f'Reclamos - {i}'), range(graficos)))
+    segundos = time.perf_counter() - inicio
+    print(f"{descripcion:<30} {hilos} hilo(s) {segundos:8.2f} s {graficos / segundos:10.1f} gráficos/s")
+
+
+def medir_hilo_por_peticion(descripcion, crear, graficos, simultaneos):
+    """Genera cada torta en un hilo nuevo, con hasta `simultaneos` hilos a la vez."""
+    inicio = time.perf_counter()
+    for desde in range(0, graficos, simultaneos):
+        tanda = [threading.Thread(target=crear, args=(datos_torta(i), f'Reclamos - {i}'))
+                 for i in range(desde, min(desde + simultaneos, graficos))]
+        for hilo in tanda:
+            hilo.start()
+        for hilo in tanda:
+            hilo.join()
+    segundos = time.perf_counter() - inicio
+    print(f"{descripcion:<30} hilo nuevo por gráfico ({simultaneos} a la vez) {segundos:8.2f} s "
+          f"{graficos / segundos:10.1f} gráficos/s")
+
+
+if __name__ == "__main__":
+    graficos = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    png, svg = GraficadorMatplotlib('png'), GraficadorMatplotlib('svg')
+    print(f"{graficos} gráficos de torta\n")
+    for hilos in (1, 8):
+        medir("pyplot (antes)", torta_pyplot, graficos, hilos)
+        medir("GraficadorMatplotlib PNG", png.crear_grafico_torta, graficos, hilos)
+        medir("GraficadorMatplotlib SVG", svg.crear_grafico_torta, graficos, hilos)
+    print()
+    medir_hilo_por_peticion("pyplot (antes)", torta_pyplot, graficos, 8)
+    medir_hilo_por_peticion("GraficadorMatplotlib PNG", png.crear_grafico_torta, graficos, 8)
+
+    datos = datos_torta(1)
+    print(f"\nTamaño: PNG {len(png.crear_grafico_torta(datos, 'Reclamos')):,} bytes, "
+          f"SVG {len(svg.crear_grafico_torta(datos, 'Reclamos')):,} bytes")
@@ -0,0 +1,77 @@
+# Benchmark de construcción de montículos
+"""
+Compara la construcción de montículos y del MedianHeap elemento por elemento
+contra la construcción en lote (`construir_desde_lista` / `insertar_muchos`),
+y las versiones de listas contra las compactas de `modules.monticulo_compacto`.
+
+Uso (desde la raíz del proyecto):
+    python -m apps.benchmark_monticulos [cantidad]
+
+Por defecto usa 1.000.000 de tiempos de resolución simulados (días entre 0 y 365).
+"""
+import random
+import sys
+import time
+from modules.monticulo_binario import MonticuloBinarioMin, MonticuloBinarioMax, MedianHeap
+from modules.monticulo_compacto import MonticuloCompactoMin, MedianHeapCompacto
+
+
+def medir(descripcion, funcion):
+    """Ejecuta `funcion`, imprime el tiempo que tardó y devuelve su resultado."""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    print(f"{descripcion:<45} {time.perf_counter() - inicio:8.2f} s")
+    return resultado
+
+
+def insertar_uno_por_uno(monticulo, valores):
+    for valor in valores:
+        monticulo.insertar(valor)
+    return monticulo
+
+
+def median_heap_uno_por_uno(valores, clase=MedianHeap):
+    median_heap = clase()
+    for valor in valores:
+        median_heap.insertar(valor)
+    return median_heap
+
+
+def median_heap_en_lote(valores, clase=MedianHeap):
+    median_heap = clase()
+    median_heap.insertar_muchos(valores)
+    return median_heap
+
+
+def memoria_lista_bytes(median_heap):
+    """Bytes aproximados de un MedianHeap de listas: las listas más cada objeto numérico."""
+    total = 0
+    for lista in (median_heap.monticulo_max.listaMonticulo, median_heap.monticulo_min.listaMonticulo):
+        total += sys.getsizeof(lista) + sum(sys.getsizeof(v) for v in lista)
+    return total
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(0)
+    tiempos = [rnd.randint(0, 365) for _ in range(cantidad)]
+    print(f"{cantidad} tiempos de resolución\n")
+
+    medir("MonticuloBinarioMin.insertar (uno por uno)", lambda: insertar_uno_por_uno(MonticuloBinarioMin(), tiempos))
+    medir("MonticuloBinarioMin.construir_desde_lista", lambda: MonticuloBinarioMin().construir_desde_lista(tiempos))
+    medir("MonticuloBinarioMax.insertar (uno por uno)", lambda: insertar_uno_por_uno(MonticuloBinarioMax(), tiempos))
+    medir("MonticuloBinarioMax.construir_desde_lista", lambda: MonticuloBinarioMax().construir_desde_lista(tiempos))
+
+    uno_por_uno = medir("MedianHeap.insertar (uno por uno)", lambda: median_heap_uno_por_uno(tiempos))
+    en_lote = medir("MedianHeap.insertar_muchos", lambda: median_heap_en_lote(tiempos))
+
+    medir("MonticuloCompactoMin.insertar (uno por uno)", lambda: insertar_uno_por_uno(MonticuloCompactoMin(), tiempos))
+    medir("MonticuloCompactoMin.construir_desde_lista", lambda: MonticuloCompactoMin().construir_desde_lista(tiempos))
+    medir("MedianHeapCompacto.insertar (uno por uno)", lambda: median_heap_uno_por_uno(tiempos, MedianHeapCompacto))
+    compacto = medir("MedianHeapCompacto.insertar_muchos", lambda: median_heap_en_lote(tiempos, MedianHeapCompacto))
+    con_floats = median_heap_en_lote([float(t) for t in tiempos])
+
+    print(f"\nMediana: {uno_por_uno.obtener_mediana()} (uno por uno) / {en_lote.obtener_mediana()} (en lote)"
+          f" / {compacto.obtener_mediana()} (compacto)")
+    print(f"Memoria MedianHeap (floats en listas): {memoria_lista_bytes(con_floats) / 2**20:8.1f} MiB")
+    print(f"Memoria MedianHeapCompacto:            {compacto.memoria_bytes() / 2**20:8.1f} MiB")
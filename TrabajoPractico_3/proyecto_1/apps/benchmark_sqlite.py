@@ -0,0 +1,111 @@
+# Benchmark de lectura/escritura concurrente en SQLite
+"""
+Compara la configuración por defecto de SQLite (journal en modo rollback) con el perfil
+de `modules.perfil_sqlite` (WAL, synchronous=NORMAL, caché, mmap, busy_timeout).
+
+Para cada configuración crea una base nueva con 2000 reclamos y, durante unos segundos,
+corre a la vez hilos escritores (cada operación crea un reclamo y una adhesión, con un
+`commit()` cada una, como la aplicación) e hilos lectores (cada operación lee una página
+de 20 reclamos del listado, con la cantidad de adherentes, como el dashboard). Cada
+operación usa su propia sesión, como una petición web (ver `config.crear_engine`).
+
+Uso (desde la raíz del proyecto):
+    python -m apps.benchmark_sqlite [segundos] [escritores] [lectores]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session, sessionmaker
+from modules.dominio import Reclamo
+from modules.migraciones import migrar_esquema
+from modules.perfil_sqlite import configurar_sqlite, obtener_pragmas
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+
+RECLAMOS_INICIALES = 2000
+DEPARTAMENTOS = ("Soporte", "Maestranza", "Secretaría técnica")
+
+
+def preparar_base(directorio, optimizado):
+    """Crea la base con los reclamos iniciales y devuelve (engine, Session, repo)."""
+    engine = create_engine(f"sqlite:///{os.path.join(directorio, 'reclamos.db')}", pool_size=16, max_overflow=16)
+    if optimizado:
+        configurar_sqlite(engine)
+    migrar_esquema(engine)
+    Session = scoped_session(sessionmaker(bind=engine))
+    repo = RepositorioReclamosSQLAlchemy(Session)
+    for i in range(RECLAMOS_INICIALES):
+        repo.guardar_registro(Reclamo(None, f"Reclamo de prueba {i}", "pendiente", i, DEPARTAMENTOS[i % 3]))
+    Session.remove()
+    return engine, Session, repo
+
+
+def correr(optimizado, segundos, escritores, lectores):
+    """Corre la carga mixta y devuelve las operaciones, errores y latencias por tipo."""
+    with tempfile.TemporaryDirectory() as directorio:
+        engine, Session, repo = preparar_base(directorio, optimizado)
+        with engine.connect() as conexion:
+            pragmas = obtener_pragmas(conexion)
+        resultados = {"escritura": [], "lectura": []}
+        errores = {"escritura": 0, "lectura": 0}
+        lock = threading.Lock()
+        fin = time.perf_counter() + segundos
+
+        def trabajar(tipo, numero):
+            latencias, fallidas = [], 0
+            i = 0
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                try:
+                    if tipo == "escritura":
+                        reclamo = Reclamo(None, f"Reclamo nuevo {numero}-{i}", "pendiente", numero,
+                                          DEPARTAMENTOS[i % 3])
+                        repo.guardar_registro(reclamo)
+                        repo.adherir_usuario_a_reclamo(10000 + numero, reclamo.id)
+                    else:
+                        repo.obtener_pagina(20, departamento=DEPARTAMENTOS[i % 3])
+                    latencias.append(time.perf_counter() - inicio)
+                except OperationalError:
+                    fallidas += 1
+                finally:
+                    Session.remove()
+                i += 1
+            with lock:
+                resultados[tipo].extend(latencias)
+                errores[tipo] += fallidas
+
+        hilos = [threading.Thread(target=trabajar, args=("escritura", n)) for n in range(escritores)]
+        hilos += [threading.Thread(target=trabajar, args=("lectura", n)) for n in range(lectores)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        engine.dispose()
+        return pragmas, resultados, errores
+
+
+def percentil(valores, p):
+    """El percentil `p` (0-100) de una lista de valores."""
+    if not valores:
+        return float('nan')
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+if __name__ == "__main__":
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    escritores = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    lectores = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    print(f"{segundos:g} s por configuración, {escritores} escritores y {lectores} lectores, "
+          f"{RECLAMOS_INICIALES} reclamos iniciales\n")
+    for descripcion, optimizado in (("por defecto", False), ("perfil_sqlite", True)):
+        pragmas, resultados, errores = correr(optimizado, segundos, escritores, lectores)
+        print(f"{descripcion}: journal_mode={pragmas['journal_mode']}, synchronous={pragmas['synchronous']}")
+        for tipo in ("escritura", "lectura"):
+            latencias = resultados[tipo]
+            print(f"  {tipo:<10} {len(latencias) / segundos:9.1f} ops/s   "
+                  f"p50 {percentil(latencias, 50) * 1000:7.1f} ms   p99 {percentil(latencias, 99) * 1000:7.1f} ms   "
+                  f"errores {errores[tipo]}")
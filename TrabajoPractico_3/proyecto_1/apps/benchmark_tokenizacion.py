@@ -0,0 +1,56 @@
+# Benchmark de tokenización y stemming de TextVectorizer
+"""
+Mide cuántos tokens por segundo procesa el preprocesamiento de `TextVectorizer`
+sobre el corpus de `data/frases.json` repetido muchas veces (por defecto 1000):
+
+- antes: tokenización estilo `word_tokenize` + `SnowballStemmer.stem` en cada token;
+- punkt con la caché de raíces (`obtener_raiz`);
+- tokenizador "regex" con la caché de raíces;
+
+y el tiempo de `TextVectorizer.fit` con y sin procesos en paralelo (`n_jobs`).
+
+Uso (desde la raíz del proyecto):
+    python -m apps.benchmark_tokenizacion [repeticiones]
+"""
+import sys
+import time
+from nltk.stem import SnowballStemmer
+from modules.create_csv import crear_csv
+from modules.recursos_nlp import tokenizar_punkt
+from modules.text_vectorizer import TextVectorizer, obtener_raiz, _PATRON_TOKENS
+
+
+def preprocesar(corpus, tokenizar, raiz, stop_words):
+    """Aplica el mismo preprocesamiento que TextVectorizer y devuelve la cantidad de tokens."""
+    cantidad = 0
+    for texto in corpus:
+        tokens = tokenizar(texto.lower())
+        cantidad += len(tokens)
+        [raiz(token) for token in tokens if token not in stop_words]
+    return cantidad
+
+
+def medir(descripcion, corpus, tokenizar, raiz, stop_words):
+    inicio = time.perf_counter()
+    tokens = preprocesar(corpus, tokenizar, raiz, stop_words)
+    segundos = time.perf_counter() - inicio
+    print(f"{descripcion:<35} {segundos:8.2f} s {tokens / segundos:12,.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    corpus = list(crear_csv("./data/frases.json")['reclamo']) * repeticiones
+    stop_words = TextVectorizer().stop_words
+    print(f"{len(corpus)} reclamos ({repeticiones} repeticiones de data/frases.json)\n")
+
+    medir("punkt + stem (antes)", corpus, tokenizar_punkt, SnowballStemmer('spanish').stem, stop_words)
+    obtener_raiz.cache_clear()
+    medir("punkt + caché de raíces", corpus, tokenizar_punkt, obtener_raiz, stop_words)
+    medir("regex + caché de raíces", corpus, _PATRON_TOKENS.findall, obtener_raiz, stop_words)
+    print(f"\nCaché de raíces: {obtener_raiz.cache_info()}")
+
+    for tokenizador in ("punkt", "regex"):
+        for n_jobs in (None, -1):
+            inicio = time.perf_counter()
+            TextVectorizer(tokenizador=tokenizador, n_jobs=n_jobs).fit(corpus)
+            print(f"TextVectorizer.fit ({tokenizador}, n_jobs={n_jobs}): {time.perf_counter() - inicio:.2f} s")
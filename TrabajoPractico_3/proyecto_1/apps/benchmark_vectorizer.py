@@ -0,0 +1,62 @@
+# Benchmark de TextVectorizer: salida densa vs dispersa
+"""
+Compara el tiempo y el pico de memoria de `TextVectorizer.transform` con salida
+densa (`numpy.ndarray`) y dispersa (`scipy.sparse.csr_matrix`), y el entrenamiento
+de `ClaimsClassifier` con la matriz dispersa.
+
+Los reclamos se generan al azar a partir de un vocabulario sintético grande, para
+simular un historial de reclamos con decenas de miles de raíces distintas.
+
+Uso (desde la raíz del proyecto):
+    python -m apps.benchmark_vectorizer [cantidad_reclamos] [tamano_vocabulario]
+"""
+import random
+import string
+import sys
+import time
+import tracemalloc
+from modules.classifier import ClaimsClassifier
+from modules.text_vectorizer import TextVectorizer
+
+
+def generar_reclamos(cantidad, tamano_vocabulario, semilla=0):
+    """Genera reclamos de 8 a 20 palabras tomadas de un vocabulario sintético."""
+    rnd = random.Random(semilla)
+    vocabulario = {''.join(rnd.choices(string.ascii_lowercase, k=rnd.randint(5, 10)))
+                   for _ in range(tamano_vocabulario)}
+    vocabulario = sorted(vocabulario)
+    return [' '.join(rnd.choices(vocabulario, k=rnd.randint(8, 20))) for _ in range(cantidad)]
+
+
+def medir(descripcion, funcion):
+    """Ejecuta `funcion` e imprime el tiempo y el pico de memoria asignada por Python/NumPy."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{descripcion:<40} {segundos:8.2f} s {pico / 2**20:10.1f} MiB")
+    return resultado
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    tamano_vocabulario = int(sys.argv[2]) if len(sys.argv) > 2 else 30_000
+    reclamos = generar_reclamos(cantidad, tamano_vocabulario)
+    etiquetas = [random.Random(i).choice(["soporte informático", "maestranza", "secretaría técnica"])
+                 for i in range(cantidad)]
+
+    vectorizador = TextVectorizer().fit(reclamos)
+    print(f"{cantidad} reclamos, vocabulario de {len(vectorizador.vocabulario_)} raíces\n")
+
+    vectorizador.salida_dispersa = False
+    medir("transform (denso)", lambda: vectorizador.transform(reclamos))
+    vectorizador.salida_dispersa = True
+    matriz = medir("transform (disperso)", lambda: vectorizador.transform(reclamos))
+    densa_bytes = matriz.shape[0] * matriz.shape[1] * matriz.dtype.itemsize
+    dispersa_bytes = matriz.data.nbytes + matriz.indices.nbytes + matriz.indptr.nbytes
+    print(f"\nMatriz densa: {densa_bytes / 2**20:.1f} MiB / dispersa: {dispersa_bytes / 2**20:.1f} MiB "
+          f"({matriz.nnz} valores distintos de cero)\n")
+
+    medir("ClaimsClassifier.fit (disperso)", lambda: ClaimsClassifier().fit(reclamos, etiquetas))
@@ -1,8 +1,7 @@
-import pickle
+from modules.modelo_clasificador import ModeloClasificador
 
-# Abrir el archivo con el clasificador y guardarlo en la variable clf
-with open('./data/claims_clf.pkl', 'rb') as archivo:
-  clf  = pickle.load(archivo)
+# El artefacto del modelo se lee la primera vez que se clasifica
+clf = ModeloClasificador()
 
 # Ahora en clf tenemos el clasificador entrenado
 
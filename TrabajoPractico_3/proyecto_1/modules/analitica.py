@@ -1,41 +1,100 @@
 from modules.gestor_reclamos import GestorDeReclamos
 from modules.graficador_abstracto import Graficador
 from modules.reporte_concreto import ReporteHTML,ReportePDF
+from modules.cache_versionada import CacheVersionada
+from urllib.parse import quote
+import os
+
+# Memoria máxima de los reportes y de las imágenes de gráficos que se guardan en caché
+CAPACIDAD_CACHE_REPORTES = 64 * 2**20
+CAPACIDAD_CACHE_GRAFICOS = 16 * 2**20
+FORMATOS_REPORTE = ('html', 'pdf')
+TIPOS_GRAFICO = ('torta', 'nube')
 
 class Analitica:
     """
     Clase fachada (Facade) que actúa como un punto de entrada simplificado
     para el subsistema de reportes y analítica.
     """
-    def __init__(self, gestor_reclamos: GestorDeReclamos, graficador: Graficador):
+    def __init__(self, gestor_reclamos: GestorDeReclamos, graficador: Graficador,
+                 capacidad_cache_reportes=CAPACIDAD_CACHE_REPORTES, capacidad_cache_graficos=CAPACIDAD_CACHE_GRAFICOS):
         self._gestor_reclamos = gestor_reclamos
         self._graficador = graficador
+        # Reportes ya generados, por (departamento, formato), válidos para una versión de los datos
+        self._cache_reportes = CacheVersionada(capacidad_cache_reportes)
+        # Imágenes PNG de los gráficos, por (tipo, departamento), válidas para una versión de los datos
+        self._cache_graficos = CacheVersionada(capacidad_cache_graficos)
+        # Distingue los ETag de esta instancia de los de otro proceso o de un reinicio
+        self._instancia = os.urandom(4).hex()
     
-    def obtener_datos_dashboard(self, departamento: str = None) -> tuple:
+    def obtener_datos_dashboard(self, departamento: str = None, cursor: str = None, limite: int = None) -> tuple:
         """
         Obtiene los datos necesarios para el dashboard.
         Si se especifica un 'departamento', filtra por él.
-        Si 'departamento' es None, obtiene TODOS los reclamos.
+        Si 'departamento' es None, considera TODOS los reclamos.
+
+        El listado se devuelve paginado (ver `GestorDeReclamos.listar_reclamos_paginados`);
+        las estadísticas abarcan todos los reclamos del departamento y se leen del
+        almacén incremental del gestor, sin recorrer los reclamos.
+
+        Returns:
+            tuple: (pagina_reclamos, stats, siguiente_cursor).
         """
-        if departamento:
-            # Flujo normal para un jefe de departamento
-            lista_reclamos = self._gestor_reclamos.listar_reclamos_por_departamento(departamento)
-        else:
-            # Flujo para el secretario: obtener todos los reclamos
-            lista_reclamos = self._gestor_reclamos.obtener_todos_los_reclamos()
+        filtros = {"departamento": departamento} if departamento else {}
+        pagina, siguiente_cursor = self._gestor_reclamos.listar_reclamos_paginados(cursor, limite, **filtros)
+        stats = self._gestor_reclamos.obtener_estadisticas(departamento)
+        return pagina, stats, siguiente_cursor
 
-        # Usamos una instancia de Reporte para acceder a la lógica de cálculo
-        # que ya tenemos, pasándole la lista de reclamos (filtrada o completa).
-        reporte_temp = ReporteHTML(self._gestor_reclamos, self._graficador)
-        stats = reporte_temp._calcular_estadisticas(lista_reclamos)
-        
-        return lista_reclamos, stats
+    def obtener_estadisticas(self, departamento: str = None) -> dict:
+        """
+        Obtiene solo las estadísticas de un departamento (o globales si es None).
+        """
+        return self._gestor_reclamos.obtener_estadisticas(departamento)
     
-    def generar_reporte_formateado(self, departamento: str, formato: str) -> tuple:
+    def obtener_validadores_reporte(self, departamento: str, formato: str) -> tuple:
+        """
+        Obtiene los validadores HTTP del reporte de un departamento sin generarlo.
+
+        Ambos cambian solo cuando cambian los reclamos del departamento (ver
+        `GestorDeReclamos.obtener_version_datos`), así que permiten responder
+        304 Not Modified a una descarga repetida. Las versiones de cada departamento
+        son independientes, por lo que el ETag incluye también el departamento.
+
+        Returns:
+            tuple: (str, datetime) con el ETag (sin comillas) y la fecha de la última
+                   modificación de los datos.
+
+        Raises:
+            ValueError: Si el formato no es soportado.
+        """
+        if formato not in FORMATOS_REPORTE:
+            raise ValueError(f"Formato '{formato}' no soportado.")
+        version, ultima_modificacion = self._gestor_reclamos.obtener_version_datos(departamento)
+        return (f"reporte-{self._instancia}-{self._etiqueta_departamento(departamento)}-{version}-{formato}",
+                ultima_modificacion)
+
+    def generar_reporte_formateado(self, departamento: str, formato: str, informar_etapa=None) -> tuple:
         """
         Selecciona la estrategia de reporte correcta, la ejecuta y devuelve
         el resultado listo para ser enviado como una respuesta HTTP.
+
+        El resultado se guarda en caché hasta que cambie la versión de los datos
+        del departamento; mientras tanto, los pedidos repetidos no vuelven a
+        consultar, calcular ni renderizar el reporte.
+
+        Args:
+            informar_etapa (callable, opcional): Recibe cada etapa de la generación
+                                                 (ver `Reporte.generar`). No se llama si
+                                                 el reporte está en caché.
         """
+        if formato not in FORMATOS_REPORTE:
+            raise ValueError(f"Formato '{formato}' no soportado.")
+        version, _ = self._gestor_reclamos.obtener_version_datos(departamento)
+        clave = (departamento.strip().lower(), formato)
+        en_cache = self._cache_reportes.obtener(clave, version)
+        if en_cache is not None:
+            return en_cache
+
         if formato == 'pdf':
             estrategia = ReportePDF(self._gestor_reclamos, self._graficador)
             mimetype = 'application/pdf'
@@ -47,13 +106,38 @@ class Analitica:
         else:
             raise ValueError(f"Formato '{formato}' no soportado.")
         
-        output = estrategia.generar(departamento)
+        output = estrategia.generar(departamento, informar_etapa)
         
-        return (output, mimetype, headers)
+        resultado = (output, mimetype, headers)
+        tamano = len(output.encode('utf-8')) if isinstance(output, str) else len(output)
+        self._cache_reportes.guardar(clave, version, resultado, tamano)
+        return resultado
     
+    def obtener_validadores_grafico(self, tipo_grafico: str, departamento: str) -> tuple:
+        """
+        Obtiene los validadores HTTP de la imagen de un gráfico sin generarla.
+
+        Como en `obtener_validadores_reporte`, el ETag incluye el departamento.
+
+        Returns:
+            tuple: (str, datetime) con el ETag (sin comillas) y la fecha de la última
+                   modificación de los datos.
+
+        Raises:
+            ValueError: Si el tipo de gráfico no es válido.
+        """
+        if tipo_grafico not in TIPOS_GRAFICO:
+            raise ValueError(f"Tipo de gráfico '{tipo_grafico}' no válido. Use 'torta' o 'nube'.")
+        version, ultima_modificacion = self._gestor_reclamos.obtener_version_datos(departamento)
+        return (f"grafico-{self._instancia}-{self._etiqueta_departamento(departamento)}-{version}-{tipo_grafico}",
+                ultima_modificacion)
+
     def obtener_imagen_grafico(self, tipo_grafico: str, departamento: str) -> bytes:
         """
         Genera y devuelve la imagen de un gráfico específico en bytes.
+
+        La imagen se guarda en caché hasta que cambie la versión de los datos del
+        departamento, así que no se vuelve a dibujar en cada carga de la página.
  
         Args:
             tipo_grafico (str): El tipo de gráfico a generar ('torta' o 'nube').
@@ -65,9 +149,26 @@ class Analitica:
         Raises:
             ValueError: Si el tipo de gráfico no es válido.
         """
-        lista_reclamos = self._gestor_reclamos.listar_reclamos_por_departamento(departamento)
-        reporte_temp = ReporteHTML(self._gestor_reclamos, self._graficador)
-        stats = reporte_temp._calcular_estadisticas(lista_reclamos)
+        if tipo_grafico not in TIPOS_GRAFICO:
+            raise ValueError(f"Tipo de gráfico '{tipo_grafico}' no válido. Use 'torta' o 'nube'.")
+        version, _ = self._gestor_reclamos.obtener_version_datos(departamento)
+        clave = (tipo_grafico, departamento.strip().lower())
+        en_cache = self._cache_graficos.obtener(clave, version)
+        if en_cache is not None:
+            return en_cache[0]
+        imagen = self.__dibujar_grafico(tipo_grafico, departamento)
+        # Se guarda en una tupla para poder cachear también la ausencia de datos (None)
+        self._cache_graficos.guardar(clave, version, (imagen,), len(imagen or b""))
+        return imagen
+
+    @staticmethod
+    def _etiqueta_departamento(departamento: str) -> str:
+        """El departamento normalizado y codificado para usarlo en un ETag (solo caracteres ASCII)."""
+        return quote(departamento.strip().lower(), safe='')
+
+    def __dibujar_grafico(self, tipo_grafico: str, departamento: str) -> bytes:
+        """Dibuja un gráfico con los datos actuales del departamento."""
+        stats = self._gestor_reclamos.obtener_estadisticas(departamento)
  
         if tipo_grafico == 'torta':
             datos_torta = {
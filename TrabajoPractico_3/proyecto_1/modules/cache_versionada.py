@@ -0,0 +1,97 @@
+"""
+Caché en memoria de resultados que dependen de una versión de los datos.
+
+Generar un reporte (o un gráfico) de un departamento es caro, pero el resultado solo
+cambia cuando cambian los reclamos de ese departamento. `GestorDeReclamos` lleva un
+número de versión por departamento que aumenta con cada modificación; la caché guarda,
+para cada clave, el último resultado junto con la versión con la que se generó, y solo
+lo devuelve si la versión pedida coincide. Un resultado de una versión nueva reemplaza
+al anterior, por lo que no quedan copias viejas ocupando memoria.
+
+La memoria se acota en bytes: cuando se supera `capacidad_bytes` se descartan los
+resultados usados hace más tiempo (LRU).
+"""
+from collections import OrderedDict
+from threading import Lock
+
+
+class CacheVersionada:
+    """
+    Caché LRU acotada en bytes de valores asociados a una versión de los datos.
+
+    Atributos:
+        capacidad_bytes (int): El tamaño máximo total de los valores guardados.
+        __entradas (OrderedDict): Clave -> (versión, valor, tamaño), del menos al más usado.
+        __bytes (int): El tamaño total de los valores guardados.
+        __aciertos, __fallos (int): Contadores de consultas.
+    """
+    def __init__(self, capacidad_bytes):
+        """
+        Args:
+            capacidad_bytes (int): El tamaño máximo total de los valores guardados.
+
+        Raises:
+            ValueError: Si la capacidad es negativa.
+        """
+        if capacidad_bytes < 0:
+            raise ValueError("La capacidad de la caché no puede ser negativa")
+        self.capacidad_bytes = capacidad_bytes
+        self.__entradas = OrderedDict()
+        self.__bytes = 0
+        self.__aciertos = 0
+        self.__fallos = 0
+        self.__lock = Lock()
+
+    @property
+    def estadisticas(self):
+        """
+        Returns:
+            dict: "aciertos", "fallos", "entradas" y "bytes" ocupados.
+        """
+        with self.__lock:
+            return {"aciertos": self.__aciertos, "fallos": self.__fallos,
+                    "entradas": len(self.__entradas), "bytes": self.__bytes}
+
+    def obtener(self, clave, version):
+        """
+        Devuelve el valor guardado para la clave si se generó con la versión indicada.
+
+        Args:
+            clave (hashable): La clave del valor (ej. (departamento, formato)).
+            version: La versión actual de los datos.
+
+        Returns:
+            El valor guardado, o None si no está o es de otra versión.
+        """
+        with self.__lock:
+            entrada = self.__entradas.get(clave)
+            if entrada is None or entrada[0] != version:
+                self.__fallos += 1
+                return None
+            self.__entradas.move_to_end(clave)
+            self.__aciertos += 1
+            return entrada[1]
+
+    def guardar(self, clave, version, valor, tamano):
+        """
+        Guarda el valor generado con una versión de los datos, reemplazando el anterior.
+
+        Los valores más grandes que la capacidad total no se guardan.
+
+        Args:
+            clave (hashable): La clave del valor.
+            version: La versión de los datos con la que se generó.
+            valor: El valor a guardar.
+            tamano (int): El tamaño del valor en bytes.
+        """
+        with self.__lock:
+            anterior = self.__entradas.pop(clave, None)
+            if anterior is not None:
+                self.__bytes -= anterior[2]
+            if tamano > self.capacidad_bytes:
+                return
+            self.__entradas[clave] = (version, valor, tamano)
+            self.__bytes += tamano
+            while self.__bytes > self.capacidad_bytes:
+                _, (_, _, tamano_descartado) = self.__entradas.popitem(last=False)
+                self.__bytes -= tamano_descartado
@@ -0,0 +1,153 @@
+"""
+Clasificación de reclamos por lotes (micro-batching).
+
+Cada formulario enviado clasifica un único reclamo, y cada llamada a `predict` de
+scikit-learn tiene un costo fijo (validaciones del `Pipeline`, recorrer los árboles
+del `RandomForestClassifier`, etc.) que se paga aunque se clasifique una sola fila.
+
+`ServicioClasificacionPorLotes` se ubica delante del clasificador: las peticiones se
+encolan y un hilo trabajador las agrupa durante, a lo sumo, `latencia_maxima` segundos
+o hasta juntar `tamano_lote` reclamos, y las clasifica con una única llamada a
+`predict`. Cada llamador recibe su resultado a través de un `Future`.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Tiempo máximo que espera un reclamo a que se complete su lote, en segundos
+LATENCIA_MAXIMA_POR_DEFECTO = 0.005
+# Cantidad máxima de reclamos por llamada al clasificador
+TAMANO_LOTE_POR_DEFECTO = 32
+
+
+class ServicioClasificacionPorLotes:
+    """
+    Agrupa las clasificaciones concurrentes en lotes y las resuelve con un solo `predict`.
+
+    Tiene la misma interfaz que el clasificador (`predict`/`clasificar`), por lo que
+    se puede pasar directamente a `GestorDeReclamos`. El hilo trabajador se inicia
+    con la primera petición.
+
+    Atributos:
+        clasificador: El clasificador real; su `predict` recibe una lista de textos.
+        latencia_maxima (float): Segundos que se espera a completar un lote.
+        tamano_lote (int): Cantidad máxima de reclamos por lote.
+        __cola (queue.Queue): Peticiones pendientes: (textos, Future).
+        __hilo (threading.Thread): El hilo trabajador, o None si no se inició.
+        __tamanos_lotes (dict[int, int]): Tamaño de lote -> cantidad de lotes de ese tamaño.
+    """
+    def __init__(self, clasificador, latencia_maxima=LATENCIA_MAXIMA_POR_DEFECTO,
+                 tamano_lote=TAMANO_LOTE_POR_DEFECTO):
+        """
+        Args:
+            clasificador: El clasificador a utilizar (ej. `ModeloClasificador`).
+            latencia_maxima (float): Segundos que se espera a completar un lote.
+            tamano_lote (int): Cantidad máxima de reclamos por lote.
+
+        Raises:
+            ValueError: Si la latencia es negativa o el tamaño de lote es menor que 1.
+        """
+        if latencia_maxima < 0:
+            raise ValueError("La latencia máxima no puede ser negativa")
+        if tamano_lote < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        self.clasificador = clasificador
+        self.latencia_maxima = latencia_maxima
+        self.tamano_lote = tamano_lote
+        self.__cola = queue.Queue()
+        self.__hilo = None
+        self.__lock = threading.Lock()
+        self.__tamanos_lotes = {}
+
+    @property
+    def estadisticas(self):
+        """
+        Devuelve los tamaños de lote alcanzados.
+
+        Returns:
+            dict: "lotes" (cantidad de llamadas al clasificador), "reclamos" (clasificados),
+                  "tamano_promedio" y "tamanos" (tamaño de lote -> cantidad de lotes).
+        """
+        with self.__lock:
+            tamanos = dict(sorted(self.__tamanos_lotes.items()))
+        lotes = sum(tamanos.values())
+        reclamos = sum(tamano * cantidad for tamano, cantidad in tamanos.items())
+        return {"lotes": lotes, "reclamos": reclamos,
+                "tamano_promedio": reclamos / lotes if lotes else 0, "tamanos": tamanos}
+
+    def enviar(self, X):
+        """
+        Encola reclamos para clasificar sin esperar el resultado.
+
+        Args:
+            X (list[str]): Los textos de los reclamos.
+
+        Returns:
+            concurrent.futures.Future: Se resuelve con la lista de departamentos
+                                       (o con la excepción del clasificador).
+        """
+        futuro = Future()
+        textos = list(X)
+        if not textos:
+            futuro.set_result([])
+            return futuro
+        self.__iniciar_hilo()
+        self.__cola.put((textos, futuro))
+        return futuro
+
+    def predict(self, X):
+        """
+        Clasifica reclamos, esperando a que se procese el lote en el que se incluyeron.
+
+        Args:
+            X (list[str]): Los textos de los reclamos.
+
+        Returns:
+            list[str]: El departamento predicho para cada reclamo.
+        """
+        return self.enviar(X).result()
+
+    def clasificar(self, X):
+        """Alias de `predict`."""
+        return self.predict(X)
+
+    def __iniciar_hilo(self):
+        """Inicia el hilo trabajador si todavía no está corriendo."""
+        if self.__hilo is None:
+            with self.__lock:
+                if self.__hilo is None:
+                    self.__hilo = threading.Thread(target=self.__procesar, daemon=True,
+                                                   name="clasificacion-por-lotes")
+                    self.__hilo.start()
+
+    def __procesar(self):
+        """Bucle del hilo trabajador: arma lotes y los clasifica."""
+        while True:
+            peticiones = [self.__cola.get()]
+            cantidad = len(peticiones[0][0])
+            limite = time.monotonic() + self.latencia_maxima
+            while cantidad < self.tamano_lote:
+                restante = limite - time.monotonic()
+                try:
+                    peticion = self.__cola.get(timeout=restante) if restante > 0 else self.__cola.get_nowait()
+                except queue.Empty:
+                    break
+                peticiones.append(peticion)
+                cantidad += len(peticion[0])
+            self.__clasificar_lote(peticiones, cantidad)
+
+    def __clasificar_lote(self, peticiones, cantidad):
+        """Clasifica todos los textos de las peticiones juntos y resuelve sus futuros."""
+        with self.__lock:
+            self.__tamanos_lotes[cantidad] = self.__tamanos_lotes.get(cantidad, 0) + 1
+        try:
+            predicciones = list(self.clasificador.predict([t for textos, _ in peticiones for t in textos]))
+        except Exception as error:
+            for _, futuro in peticiones:
+                futuro.set_exception(error)
+            return
+        inicio = 0
+        for textos, futuro in peticiones:
+            futuro.set_result(predicciones[inicio:inicio + len(textos)])
+            inicio += len(textos)
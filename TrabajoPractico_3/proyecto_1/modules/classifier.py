@@ -9,17 +9,27 @@ from sklearn.utils.validation import check_X_y, check_array, check_is_fitted
 
 class ClaimsClassifier(BaseEstimator, ClassifierMixin):
 
-    def __init__(self):
-        pass
+    def __init__(self, tokenizador="punkt", n_jobs=None, max_depth=20, n_estimators=10, random_state=None):
+        # "punkt" o "regex" (ver TextVectorizer)
+        self.tokenizador = tokenizador
+        # Procesos para preprocesar los reclamos al entrenar (None: uno solo)
+        self.n_jobs = n_jobs
+        # Hiperparámetros del RandomForestClassifier (random_state fijo: entrenamiento reproducible)
+        self.max_depth = max_depth
+        self.n_estimators = n_estimators
+        self.random_state = random_state
    
     def fit(self, X, y):
         # X, y = check_X_y(X, y, accept_sparse=True) #No lo puedo usar con strings
         self.encoder_ = LabelEncoder()
         y = self.encoder_.fit_transform(y)
         pipe = Pipeline([
-            ('vectorizer', TextVectorizer()),
-            ('scaler', StandardScaler()),
-            ('classifier', RandomForestClassifier(max_depth=20, max_features='log2', n_estimators=10))
+            ('vectorizer', TextVectorizer(tokenizador=self.tokenizador, n_jobs=self.n_jobs)),
+            # with_mean=False: centrar destruiría la dispersión de la matriz de frecuencias
+            ('scaler', StandardScaler(with_mean=False)),
+            ('classifier', RandomForestClassifier(max_depth=self.max_depth, max_features='log2',
+                                                  n_estimators=self.n_estimators,
+                                                  random_state=self.random_state))
         ])
         self.clf_ = pipe.fit(X, y)
         if self.clf_:
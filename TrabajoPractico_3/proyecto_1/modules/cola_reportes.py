@@ -0,0 +1,214 @@
+"""
+Generación de reportes en segundo plano.
+
+Un reporte PDF grande ocupa un worker web durante todo el renderizado, y varios
+pedidos simultáneos pueden dejar al servidor sin workers libres. `ColaReportes`
+permite pedir el reporte sin esperarlo: el pedido se encola y lo genera un grupo
+acotado de hilos (`max_trabajadores`), mientras el navegador consulta el estado del
+trabajo y, cuando termina, descarga el resultado.
+
+- Los pedidos idénticos (mismo departamento, formato y versión de los datos) que
+  todavía están en cola, en proceso o terminados se resuelven con el mismo trabajo,
+  así que un reporte se genera una sola vez aunque lo pidan varios usuarios.
+- La cantidad de trabajos en espera está acotada (`max_en_espera`).
+- Los trabajos terminados (o fallidos) se descartan `ttl` segundos después de
+  finalizar, junto con su resultado.
+
+Los trabajos viven en la memoria del proceso: con varios procesos web, el estado y
+la descarga deben consultarse en el mismo proceso que recibió el pedido.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Cantidad de reportes que se generan a la vez
+MAX_TRABAJADORES_POR_DEFECTO = 2
+# Cantidad máxima de reportes esperando un trabajador libre
+MAX_EN_ESPERA_POR_DEFECTO = 20
+# Segundos que se conserva un trabajo finalizado
+TTL_POR_DEFECTO = 600
+
+EN_COLA = "en cola"
+GENERANDO = "generando"
+TERMINADO = "terminado"
+ERROR = "error"
+
+
+class TrabajoReporte:
+    """
+    Un pedido de reporte y su estado.
+
+    Atributos:
+        id (str): El identificador del trabajo.
+        departamento (str): El departamento del reporte.
+        formato (str): "html" o "pdf".
+        version (int): La versión de los datos del departamento al pedirlo.
+        estado (str): EN_COLA, GENERANDO, TERMINADO o ERROR.
+        etapa (str): Mientras está GENERANDO, la etapa en curso informada por el
+                     generador (ej. "renderizando"), o None.
+        resultado (tuple): (contenido, mimetype, headers) cuando está TERMINADO.
+        error (str): El mensaje de error cuando está en ERROR.
+        creado (float): Momento del pedido (`time.monotonic`).
+        finalizado (float): Momento en que terminó o falló, o None.
+    """
+    def __init__(self, departamento, formato, version):
+        self.id = uuid.uuid4().hex
+        self.departamento = departamento
+        self.formato = formato
+        self.version = version
+        self.estado = EN_COLA
+        self.etapa = None
+        self.resultado = None
+        self.error = None
+        self.creado = time.monotonic()
+        self.finalizado = None
+
+    @property
+    def clave(self):
+        """Identifica a los pedidos idénticos."""
+        return (self.departamento.strip().lower(), self.formato, self.version)
+
+    @property
+    def finalizo(self):
+        """Indica si el trabajo terminó, con o sin error."""
+        return self.estado in (TERMINADO, ERROR)
+
+
+class ColaReportes:
+    """
+    Cola de trabajos de reportes atendida por un grupo acotado de hilos.
+
+    Atributos:
+        max_trabajadores (int): Cantidad de reportes que se generan a la vez.
+        max_en_espera (int): Cantidad máxima de trabajos en cola.
+        ttl (float): Segundos que se conserva un trabajo finalizado.
+        __generar (callable): Genera un reporte: (departamento, formato, informar_etapa) ->
+                              (contenido, mimetype, headers).
+        __trabajos (dict[str, TrabajoReporte]): ID -> trabajo.
+        __por_clave (dict[tuple, TrabajoReporte]): Último trabajo de cada pedido.
+        __ejecutor (ThreadPoolExecutor): Los hilos trabajadores, creados con el primer pedido.
+    """
+    def __init__(self, generar, max_trabajadores=MAX_TRABAJADORES_POR_DEFECTO,
+                 max_en_espera=MAX_EN_ESPERA_POR_DEFECTO, ttl=TTL_POR_DEFECTO):
+        """
+        Args:
+            generar (callable): Genera un reporte a partir del departamento y el formato
+                                (ej. `Analitica.generar_reporte_formateado`). Recibe
+                                además una función a la que informar cada etapa.
+            max_trabajadores (int): Cantidad de reportes que se generan a la vez.
+            max_en_espera (int): Cantidad máxima de trabajos en cola.
+            ttl (float): Segundos que se conserva un trabajo finalizado.
+
+        Raises:
+            ValueError: Si algún límite no es válido.
+        """
+        if max_trabajadores < 1:
+            raise ValueError("La cantidad de trabajadores debe ser al menos 1")
+        if max_en_espera < 0:
+            raise ValueError("La cantidad de trabajos en espera no puede ser negativa")
+        if ttl < 0:
+            raise ValueError("El tiempo de vida de los trabajos no puede ser negativo")
+        self.max_trabajadores = max_trabajadores
+        self.max_en_espera = max_en_espera
+        self.ttl = ttl
+        self.__generar = generar
+        self.__trabajos = {}
+        self.__por_clave = {}
+        self.__ejecutor = None
+        self.__lock = threading.Lock()
+
+    def encolar(self, departamento, formato, version):
+        """
+        Pide un reporte. Si ya hay un trabajo vigente para el mismo pedido, lo devuelve.
+
+        Args:
+            departamento (str): El departamento del reporte.
+            formato (str): "html" o "pdf".
+            version (int): La versión actual de los datos del departamento.
+
+        Returns:
+            TrabajoReporte: El trabajo (nuevo o existente).
+
+        Raises:
+            ValueError: Si la cola de espera está llena.
+        """
+        trabajo = TrabajoReporte(departamento, formato, version)
+        with self.__lock:
+            self.__descartar_vencidos()
+            existente = self.__por_clave.get(trabajo.clave)
+            # Un pedido que falló se vuelve a intentar
+            if existente is not None and existente.estado != ERROR:
+                return existente
+            # Los primeros `max_trabajadores` pedidos sin finalizar se están generando; el resto espera
+            sin_finalizar = sum(1 for t in self.__trabajos.values() if not t.finalizo)
+            if sin_finalizar >= self.max_trabajadores + self.max_en_espera:
+                raise ValueError("Hay demasiados reportes en espera. Intente nuevamente en unos minutos.")
+            self.__trabajos[trabajo.id] = trabajo
+            self.__por_clave[trabajo.clave] = trabajo
+            if self.__ejecutor is None:
+                self.__ejecutor = ThreadPoolExecutor(max_workers=self.max_trabajadores,
+                                                     thread_name_prefix="reportes")
+            self.__ejecutor.submit(self.__ejecutar, trabajo)
+        return trabajo
+
+    def obtener(self, id_trabajo):
+        """
+        Busca un trabajo por su ID.
+
+        Returns:
+            TrabajoReporte: El trabajo, o None si no existe o ya venció.
+        """
+        with self.__lock:
+            self.__descartar_vencidos()
+            return self.__trabajos.get(id_trabajo)
+
+    def posicion(self, trabajo):
+        """
+        Devuelve la posición de un trabajo en la cola.
+
+        Returns:
+            int: Cantidad de trabajos en cola pedidos antes que él (0 si ya no está en cola).
+        """
+        with self.__lock:
+            if trabajo.estado != EN_COLA:
+                return 0
+            return sum(1 for t in self.__trabajos.values() if t.estado == EN_COLA and t.creado < trabajo.creado)
+
+    def cerrar(self, esperar=True):
+        """Detiene los hilos trabajadores, esperando (o no) a los trabajos en curso."""
+        with self.__lock:
+            ejecutor, self.__ejecutor = self.__ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=esperar, cancel_futures=not esperar)
+
+    def __ejecutar(self, trabajo):
+        """Genera el reporte de un trabajo y registra el resultado o el error."""
+        with self.__lock:
+            trabajo.estado = GENERANDO
+        def informar_etapa(etapa):
+            with self.__lock:
+                trabajo.etapa = etapa
+        try:
+            resultado = self.__generar(trabajo.departamento, trabajo.formato, informar_etapa)
+        except Exception as error:
+            with self.__lock:
+                trabajo.error = str(error)
+                trabajo.estado = ERROR
+                trabajo.etapa = None
+                trabajo.finalizado = time.monotonic()
+            return
+        with self.__lock:
+            trabajo.resultado = resultado
+            trabajo.estado = TERMINADO
+            trabajo.etapa = None
+            trabajo.finalizado = time.monotonic()
+
+    def __descartar_vencidos(self):
+        """Quita los trabajos finalizados hace más de `ttl` segundos. Requiere el lock."""
+        ahora = time.monotonic()
+        vencidos = [t for t in self.__trabajos.values() if t.finalizo and ahora - t.finalizado > self.ttl]
+        for trabajo in vencidos:
+            del self.__trabajos[trabajo.id]
+            if self.__por_clave.get(trabajo.clave) is trabajo:
+                del self.__por_clave[trabajo.clave]
@@ -1,10 +1,11 @@
 from flask import Flask
 from flask_session import Session
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from flask_login import LoginManager
 import datetime
-from modules.modelos import Base
+from modules.migraciones import migrar_esquema
+from modules.perfil_sqlite import configurar_sqlite, restaurar_journal_por_defecto
 import os
 
 app = Flask("ReclamosAPI")
@@ -15,26 +16,76 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH']= 16*1024*1024 #16MB
 
-URL_BD= 'sqlite:///data/base_datos.db'
+# Base de datos de la aplicación; las pruebas usan una copia temporal (ver `tests/__init__.py`)
+URL_BD= os.environ.get('URL_BD', 'sqlite:///data/base_datos.db')
+
+# Si es True, las estadísticas de reclamos calculan las medianas con montículos compactos (`modules.monticulo_compacto`)
+MONTICULO_COMPACTO = os.environ.get('MONTICULO_COMPACTO', '0') == '1'
+# Precisión de los sketches de percentiles de las estadísticas: más alta = más exacta y más memoria
+PRECISION_CUANTILES = int(os.environ.get('PRECISION_CUANTILES', '200'))
+# Cantidad de clasificaciones de reclamos que se recuerdan (ver `modules.modelo_clasificador`)
+TAMANO_CACHE_PREDICCIONES = int(os.environ.get('TAMANO_CACHE_PREDICCIONES', '1024'))
+# Clasificación por lotes (ver `modules.clasificacion_por_lotes`): espera máxima en milisegundos
+# para completar un lote (0 clasifica cada reclamo por separado) y reclamos por lote
+LATENCIA_LOTE_CLASIFICACION_MS = float(os.environ.get('LATENCIA_LOTE_CLASIFICACION_MS', '5'))
+TAMANO_LOTE_CLASIFICACION = int(os.environ.get('TAMANO_LOTE_CLASIFICACION', '32'))
+# Memoria máxima, en MiB, de los reportes y gráficos guardados en caché (ver `modules.analitica`)
+CACHE_REPORTES_MB = int(os.environ.get('CACHE_REPORTES_MB', '64'))
+CACHE_GRAFICOS_MB = int(os.environ.get('CACHE_GRAFICOS_MB', '16'))
+# Formato de las imágenes de los gráficos: 'png' o 'svg' (ver `modules.graficador_concreto`)
+FORMATO_GRAFICOS = os.environ.get('FORMATO_GRAFICOS', 'png')
+# Reportes en segundo plano (ver `modules.cola_reportes`): hilos que los generan,
+# trabajos que pueden esperar en cola y segundos que se conserva un reporte terminado
+REPORTES_TRABAJADORES = int(os.environ.get('REPORTES_TRABAJADORES', '2'))
+REPORTES_EN_ESPERA = int(os.environ.get('REPORTES_EN_ESPERA', '20'))
+REPORTES_TTL_S = int(os.environ.get('REPORTES_TTL_S', '600'))
+# Pool de conexiones a la base de datos: conexiones que se mantienen abiertas, conexiones
+# extra que se abren en los picos y segundos que se espera una conexión libre
+POOL_BD_TAMANO = int(os.environ.get('POOL_BD_TAMANO', '5'))
+POOL_BD_DESBORDE = int(os.environ.get('POOL_BD_DESBORDE', '10'))
+POOL_BD_ESPERA_S = float(os.environ.get('POOL_BD_ESPERA_S', '30'))
+# Perfil de rendimiento de SQLite (ver `modules.perfil_sqlite`): WAL, synchronous=NORMAL,
+# caché de páginas por conexión, memoria mapeada y espera ante bloqueos.
+# SQLITE_OPTIMIZADO=0 deja la configuración por defecto de SQLite
+SQLITE_OPTIMIZADO = os.environ.get('SQLITE_OPTIMIZADO', '1') == '1'
+SQLITE_CACHE_MB = int(os.environ.get('SQLITE_CACHE_MB', '64'))
+SQLITE_MMAP_MB = int(os.environ.get('SQLITE_MMAP_MB', '256'))
+SQLITE_ESPERA_MS = int(os.environ.get('SQLITE_ESPERA_MS', '5000'))
 
 def crear_engine():
     """
     Crea y configura el motor de la base de datos SQLAlchemy.
-    Inicializa la conexión con la base de datos SQLite definida en `URL_BD`.
-    Se asegura de que todas las tablas (definidas en `modules.modelos.Base.metadata`)
-    existan en la base de datos. Si no existen, las crea.
-    Finalmente, retorna una clase `Session` configurada para interactuar con la base de datos.
+    Inicializa la conexión con la base de datos SQLite definida en `URL_BD`, con un pool
+    de conexiones de `POOL_BD_TAMANO` conexiones más `POOL_BD_DESBORDE` extra y, si
+    `SQLITE_OPTIMIZADO` está activo, el perfil de `modules.perfil_sqlite` (WAL, etc.); si
+    no, restaura el journal por defecto, ya que el modo WAL queda guardado en la base.
+    Se asegura de que todas las tablas e índices (definidos en `modules.modelos.Base.metadata`)
+    existan en la base de datos. Si no existen, los crea (ver `modules.migraciones`).
+    Finalmente, retorna una sesión `scoped_session`: cada hilo obtiene su propia sesión
+    (una unidad de trabajo por petición), que se cierra al terminar el contexto de la
+    aplicación y devuelve su conexión al pool.
     Returns:
-    sqlalchemy.orm.sessionmaker: Una clase Sessionmaker configurada.
+    sqlalchemy.orm.scoped_session: El registro de sesiones, usable como una `Session`.
     """
-    engine= create_engine(URL_BD)
-    Base.metadata.create_all(engine)
-    Session= sessionmaker(bind=engine)
+    engine= create_engine(URL_BD, pool_size=POOL_BD_TAMANO, max_overflow=POOL_BD_DESBORDE,
+                          pool_timeout=POOL_BD_ESPERA_S)
+    if SQLITE_OPTIMIZADO:
+        configurar_sqlite(engine, SQLITE_CACHE_MB * 1024, SQLITE_MMAP_MB * 2**20, SQLITE_ESPERA_MS)
+    else:
+        restaurar_journal_por_defecto(engine)
+    migrar_esquema(engine)
+    Session= scoped_session(sessionmaker(bind=engine))
+
+    @app.teardown_appcontext
+    def cerrar_sesion_bd(excepcion=None):
+        """Cierra la sesión del hilo al terminar cada petición."""
+        Session.remove()
+
     return Session
 
 app.config.from_object(__name__)
 app.config["SESSION_TYPE"] = "filesystem"
-app.config["SESSION_FILE_DIR"] = "./flask_session_cache"
+app.config["SESSION_FILE_DIR"] = os.environ.get("SESSION_FILE_DIR", "./flask_session_cache")
 app.config["SESSION_PERMANENT"] = False
 app.config["PERMANENT_SESSION_LIFETIME"] = datetime.timedelta(minutes=10)  # Sesión un poco más larga
 Session(app)
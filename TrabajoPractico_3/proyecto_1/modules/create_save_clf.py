@@ -1,26 +1,30 @@
 from modules.classifier import ClaimsClassifier
 from modules.create_csv import crear_csv
-import pickle
+from modules.modelo_clasificador import guardar_modelo, RUTA_MODELO
 
 datos = crear_csv("./data/frases.json")
 X = datos['reclamo']
 y = datos['etiqueta']
 
-clf = ClaimsClassifier()
+# Hiperparámetros del RandomForest elegidos por búsqueda en grilla (GridSearchCV)
+clf = ClaimsClassifier(max_depth=None, n_estimators=100, random_state=100)
 clf.fit(X, y)
 
-with open('./data/claims_clf.pkl', 'wb') as archivo:
-    pickle.dump(clf, archivo)
+# El pipeline predice índices; las clases del encoder los traducen a departamentos
+guardar_modelo(RUTA_MODELO, clf.clf_, clf.encoder_.classes_,
+               cantidad_ejemplos=len(X), tokenizador=clf.tokenizador)
 """
 Script para entrenar y guardar el clasificador de reclamos.
 
 Este script realiza los siguientes pasos:
 1. Carga los datos de entrenamiento de reclamos desde './data/frases.json'
    utilizando la función `crear_csv`.
-2. Inicializa una instancia de `ClaimsClassifier`.
+2. Inicializa una instancia de `ClaimsClassifier` (vectorizador disperso y escalador
+   sin centrado) con los hiperparámetros del RandomForest elegidos por búsqueda en
+   grilla y una semilla fija, para que el artefacto sea reproducible.
 3. Entrena el clasificador con los reclamos y sus etiquetas.
-4. Serializa (guarda) el clasificador entrenado en un archivo binario
-   './data/claims_clf.pkl' utilizando `pickle`, para que pueda ser
-   cargado y utilizado por la aplicación principal sin necesidad de
-   volver a entrenarlo cada vez.
-"""
\ No newline at end of file
+4. Guarda el artefacto versionado del modelo en './data/modelo_reclamos.pkl'
+   con `guardar_modelo`: el pipeline entrenado, los nombres de las clases y
+   metadatos del entrenamiento. Así la aplicación principal puede clasificar
+   sin volver a entrenar ni leer los datos de entrenamiento al arrancar.
+"""
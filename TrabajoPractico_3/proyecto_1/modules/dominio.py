@@ -18,8 +18,9 @@ class Reclamo:
                                              Por defecto, se usa la fecha y hora actuales si no se provee.
         foto (str, opcional): Ruta o nombre del archivo de la foto adjunta al reclamo.
         fecha_resolucion (datetime, opcional): Fecha estimada o real de resolución del reclamo.
+        minhash (bytes, opcional): Firma MinHash serializada de la descripción (ver `modules.minhash`).
     """
-    def __init__(self, p_id, p_descripcion, p_estado, pd_id_usuario, p_departamento="sin departamento", p_fecha_creacion=None, p_foto=None, p_fecha_resolucion=None):
+    def __init__(self, p_id, p_descripcion, p_estado, pd_id_usuario, p_departamento="sin departamento", p_fecha_creacion=None, p_foto=None, p_fecha_resolucion=None, p_minhash=None):
         self.id= p_id
         self.descripcion=p_descripcion
         self.estado =p_estado
@@ -32,6 +33,7 @@ class Reclamo:
         
         self.foto=p_foto
         self.fecha_resolucion=p_fecha_resolucion
+        self.minhash=p_minhash
     
     @property
     def id(self):
@@ -72,6 +74,11 @@ class Reclamo:
     def fecha_resolucion(self):
         """Obtiene la fecha estimada o real de resolución del reclamo."""
         return self.__fecha_resolucion
+
+    @property
+    def minhash(self):
+        """Obtiene la firma MinHash serializada de la descripción."""
+        return self.__minhash
     
     @id.setter
     def id(self, p_id):
@@ -175,6 +182,20 @@ class Reclamo:
         """
         self.__fecha_resolucion= p_fecha_resolucion
 
+    @minhash.setter
+    def minhash(self, p_minhash):
+        """
+        Establece la firma MinHash serializada de la descripción.
+
+        Args:
+            p_minhash (bytes, opcional): La firma, serializada con `modules.minhash.firma_a_bytes`.
+        Raises:
+            ValueError: Si la firma no es de tipo bytes.
+        """
+        if p_minhash is not None and not isinstance(p_minhash, bytes):
+            raise ValueError("La firma MinHash debe ser de tipo bytes")
+        self.__minhash=p_minhash
+
     def calcular_tiempo_resolucion(self):
         """
         Calcula el tiempo de resolución de un reclamo en días.
@@ -0,0 +1,287 @@
+"""
+Almacén de estadísticas de reclamos mantenido de forma incremental.
+
+En lugar de recorrer la lista completa de reclamos en cada consulta del
+dashboard, `EstadisticasReclamos` se construye una única vez a partir de los
+reclamos existentes y luego se actualiza con cada alta, cambio de estado,
+derivación o baja que realiza el `GestorDeReclamos`. Leer las estadísticas
+de un departamento no requiere acceder a la base de datos.
+
+Los percentiles de tiempo de resolución (p75/p90/p99) de los reclamos resueltos se
+estiman con un `SketchCuantiles` por departamento, de memoria acotada; la vista global
+los combina.
+"""
+from collections import Counter
+from threading import Lock
+from modules.cuantiles import SketchCuantiles, PRECISION_POR_DEFECTO
+from modules.monticulo_binario import MedianHeapEliminable
+from modules.recursos_nlp import STOP_WORDS_ES
+
+# Nombre de la clave de estadísticas para cada estado de reclamo
+CLAVES_ESTADO = {
+    "pendiente": "pendientes",
+    "en proceso": "en_proceso",
+    "resuelto": "resueltos",
+    "inválido": "invalidos",
+}
+CANTIDAD_PALABRAS_CLAVE = 15
+# Estados cuyos tiempos de resolución se resumen con una mediana
+ESTADOS_CON_MEDIANA = ("resuelto", "en proceso")
+# Percentiles del tiempo de resolución de los reclamos resueltos que se informan
+PERCENTILES = (75, 90, 99)
+
+
+def extraer_palabras_clave(descripcion: str) -> list:
+    """
+    Extrae las palabras significativas de la descripción de un reclamo.
+
+    Se consideran las palabras alfabéticas que no son stopwords, en minúsculas.
+
+    Args:
+        descripcion (str): El texto del reclamo.
+
+    Returns:
+        list[str]: Las palabras clave, con repeticiones.
+    """
+    return [p.lower() for p in descripcion.split() if p.isalpha() and p.lower() not in STOP_WORDS_ES]
+
+
+def calcular_percentiles(sketch: SketchCuantiles) -> dict:
+    """
+    Estima los `PERCENTILES` de un sketch.
+
+    Returns:
+        dict or None: {"p75": ..., "p90": ..., "p99": ...}, o None si el sketch está vacío.
+    """
+    if sketch.size == 0:
+        return None
+    valores = sketch.cuantiles([p / 100 for p in PERCENTILES])
+    return {f"p{p}": v for p, v in zip(PERCENTILES, valores)}
+
+
+class _Acumulador:
+    """
+    Contadores de un grupo de reclamos (un departamento o el total global).
+
+    Atributos:
+        estados (Counter): Cantidad de reclamos por estado.
+        palabras (Counter): Frecuencia de cada palabra clave.
+        tiempos (dict): {id_reclamo: (estado, dias, marca_tiempo)} de los reclamos cuyo tiempo
+                        de resolución participa de alguna mediana.
+        medianas (dict): {estado: MedianHeapEliminable} con los tiempos de resolución.
+        sketch_resueltos (SketchCuantiles or None): Los tiempos de las resoluciones
+                                                    registradas, o None si el acumulador no
+                                                    estima percentiles. Solo se le agregan
+                                                    valores: nunca se quitan.
+    """
+    def __init__(self, ventana=None, clase_median_heap=MedianHeapEliminable, precision_cuantiles=PRECISION_POR_DEFECTO):
+        self.estados = Counter()
+        self.palabras = Counter()
+        self.tiempos = {}
+        self.medianas = {estado: clase_median_heap(ventana) for estado in ESTADOS_CON_MEDIANA}
+        self.sketch_resueltos = None
+        if precision_cuantiles is not None:
+            self.sketch_resueltos = SketchCuantiles(precision_cuantiles)
+
+    def sumar(self, reclamo, signo=1):
+        """Suma (signo=1) o resta (signo=-1) un reclamo a los contadores."""
+        self.estados[reclamo.estado] += signo
+        for palabra in extraer_palabras_clave(reclamo.descripcion):
+            self.palabras[palabra] += signo
+            if self.palabras[palabra] <= 0:
+                del self.palabras[palabra]
+        self.quitar_tiempo(reclamo.id)
+        if signo > 0:
+            self.agregar_tiempo(reclamo)
+
+    def sumar_muchos(self, reclamos):
+        """Suma un lote de reclamos nuevos; cada mediana se construye de una vez (`insertar_muchos`)."""
+        lotes = {estado: ([], []) for estado in ESTADOS_CON_MEDIANA}
+        for reclamo in reclamos:
+            self.estados[reclamo.estado] += 1
+            self.palabras.update(extraer_palabras_clave(reclamo.descripcion))
+            tiempo_resolucion = reclamo.calcular_tiempo_resolucion()
+            if reclamo.estado in ESTADOS_CON_MEDIANA and tiempo_resolucion is not None:
+                self.tiempos[reclamo.id] = (reclamo.estado, tiempo_resolucion, reclamo.fecha_resolucion)
+                valores, marcas = lotes[reclamo.estado]
+                valores.append(tiempo_resolucion)
+                marcas.append(reclamo.fecha_resolucion)
+        for estado, (valores, marcas) in lotes.items():
+            self.medianas[estado].insertar_muchos(valores, marcas)
+        if self.sketch_resueltos is not None:
+            self.sketch_resueltos.insertar_muchos(lotes["resuelto"][0])
+
+    def agregar_tiempo(self, reclamo):
+        """Agrega el tiempo de resolución del reclamo a la mediana de su estado, si corresponde."""
+        tiempo_resolucion = reclamo.calcular_tiempo_resolucion()
+        if reclamo.estado in ESTADOS_CON_MEDIANA and tiempo_resolucion is not None:
+            self.tiempos[reclamo.id] = (reclamo.estado, tiempo_resolucion, reclamo.fecha_resolucion)
+            self.medianas[reclamo.estado].insertar(tiempo_resolucion, reclamo.fecha_resolucion)
+
+    def quitar_tiempo(self, id_reclamo):
+        """Quita de su mediana el tiempo de resolución registrado para el reclamo, si lo hay."""
+        if id_reclamo in self.tiempos:
+            estado, dias, marca_tiempo = self.tiempos.pop(id_reclamo)
+            self.medianas[estado].eliminar(dias, marca_tiempo)
+
+    def registrar_resolucion(self, reclamo):
+        """Agrega al sketch de percentiles el tiempo de un reclamo que se acaba de resolver."""
+        tiempo_resolucion = reclamo.calcular_tiempo_resolucion()
+        if self.sketch_resueltos is not None and reclamo.estado == "resuelto" and tiempo_resolucion is not None:
+            self.sketch_resueltos.insertar(tiempo_resolucion)
+
+    def mediana(self, estado):
+        """Devuelve la mediana de los tiempos de resolución de los reclamos en `estado`."""
+        median_heap = self.medianas[estado]
+        median_heap.expirar()
+        return median_heap.obtener_mediana() if median_heap.size > 0 else None
+
+    def resumen(self) -> dict:
+        """Devuelve las estadísticas del grupo (los percentiles, solo si los estima)."""
+        stats = {"total": sum(self.estados.values())}
+        for estado, clave in CLAVES_ESTADO.items():
+            stats[clave] = self.estados[estado]
+        stats["mediana_resueltos"] = self.mediana("resuelto")
+        stats["mediana_en_proceso"] = self.mediana("en proceso")
+        stats["palabras_clave"] = self.palabras.most_common(CANTIDAD_PALABRAS_CLAVE)
+        stats["percentiles_resueltos"] = None
+        if self.sketch_resueltos is not None:
+            stats["percentiles_resueltos"] = calcular_percentiles(self.sketch_resueltos)
+        return stats
+
+
+class EstadisticasReclamos:
+    """
+    Estadísticas por departamento y globales de los reclamos, actualizadas incrementalmente.
+
+    Los departamentos se comparan sin distinguir mayúsculas/minúsculas, igual que
+    el filtro por departamento del repositorio. Las medianas de tiempo de resolución
+    se mantienen con `MedianHeapEliminable`, por lo que un reclamo que pasa de
+    "en proceso" a "resuelto" se mueve de una mediana a la otra en O(log n).
+
+    Cada departamento mantiene además un sketch de cuantiles con los tiempos de las
+    resoluciones: se agrega un valor cuando un reclamo pasa a "resuelto" (o ya lo está al
+    construir las estadísticas) y nunca se quita, ya que un sketch no admite eliminar
+    valores. Así la memoria y la lectura de los percentiles no dependen de la cantidad de
+    reclamos; a cambio, son aproximados sobre el historial de resoluciones: un reclamo
+    resuelto que luego se elimina, se reabre o se deriva sigue contando en el departamento
+    donde se resolvió. La vista global combina los sketches de los departamentos
+    (`SketchCuantiles.combinar`). Los percentiles no aplican la ventana de las medianas.
+
+    Atributos:
+        __departamentos (dict): {departamento normalizado: _Acumulador}.
+        __global (_Acumulador): Los contadores de todos los reclamos.
+        __lock (Lock): Protege las actualizaciones concurrentes.
+        __ventana (timedelta or None): Ventana de tiempo de las medianas.
+        __clase_median_heap (type): La implementación de `MedianHeapEliminable` de las medianas.
+        __precision_cuantiles (int): La precisión `k` de los sketches de percentiles.
+    """
+    def __init__(self, reclamos=(), ventana=None, clase_median_heap=MedianHeapEliminable,
+                 precision_cuantiles=PRECISION_POR_DEFECTO):
+        """
+        Construye las estadísticas iniciales.
+
+        Los reclamos existentes se agregan por lotes: las medianas de cada departamento se
+        construyen en O(n) en lugar de insertar los tiempos de a uno.
+
+        Args:
+            reclamos (iterable[Reclamo]): Los reclamos existentes en el sistema.
+            ventana (timedelta, opcional): Si se indica, las medianas solo consideran los
+                                           reclamos con fecha de resolución dentro de la ventana
+                                           (ej. `timedelta(days=30)`).
+            clase_median_heap (type): La implementación de `MedianHeapEliminable` a usar
+                                      (ej. `MedianHeapEliminableCompacto`).
+            precision_cuantiles (int): La precisión `k` de los sketches de percentiles
+                                       (ver `SketchCuantiles`).
+        """
+        self.__departamentos = {}
+        self.__ventana = ventana
+        self.__clase_median_heap = clase_median_heap
+        self.__precision_cuantiles = precision_cuantiles
+        # Los percentiles globales se obtienen combinando los sketches de los departamentos
+        self.__global = _Acumulador(ventana, clase_median_heap, precision_cuantiles=None)
+        self.__lock = Lock()
+        reclamos = list(reclamos)
+        por_departamento = {}
+        for reclamo in reclamos:
+            por_departamento.setdefault(self._clave(reclamo.departamento), []).append(reclamo)
+        for clave, reclamos_departamento in por_departamento.items():
+            self.__departamentos[clave] = _Acumulador(ventana, clase_median_heap, precision_cuantiles)
+            self.__departamentos[clave].sumar_muchos(reclamos_departamento)
+        self.__global.sumar_muchos(reclamos)
+
+    @staticmethod
+    def _clave(departamento):
+        """Normaliza el nombre de un departamento para usarlo como clave."""
+        return departamento.strip().lower()
+
+    def __acumuladores(self, departamento):
+        """Devuelve los acumuladores afectados por un reclamo del departamento dado."""
+        clave = self._clave(departamento)
+        if clave not in self.__departamentos:
+            self.__departamentos[clave] = _Acumulador(self.__ventana, self.__clase_median_heap,
+                                                      self.__precision_cuantiles)
+        return self.__departamentos[clave], self.__global
+
+    def registrar(self, reclamo):
+        """Agrega un reclamo nuevo a las estadísticas."""
+        with self.__lock:
+            for acumulador in self.__acumuladores(reclamo.departamento):
+                acumulador.sumar(reclamo)
+                acumulador.registrar_resolucion(reclamo)
+
+    def eliminar(self, reclamo):
+        """Quita de las estadísticas un reclamo eliminado."""
+        with self.__lock:
+            for acumulador in self.__acumuladores(reclamo.departamento):
+                acumulador.sumar(reclamo, -1)
+
+    def cambiar_estado(self, reclamo, estado_anterior):
+        """
+        Actualiza las estadísticas cuando un reclamo cambia de estado.
+
+        Args:
+            reclamo (Reclamo): El reclamo con su nuevo estado (y fecha de resolución).
+            estado_anterior (str): El estado que tenía el reclamo antes del cambio.
+        """
+        with self.__lock:
+            for acumulador in self.__acumuladores(reclamo.departamento):
+                acumulador.estados[estado_anterior] -= 1
+                acumulador.estados[reclamo.estado] += 1
+                acumulador.quitar_tiempo(reclamo.id)
+                acumulador.agregar_tiempo(reclamo)
+                if estado_anterior != "resuelto":
+                    acumulador.registrar_resolucion(reclamo)
+
+    def derivar(self, reclamo, departamento_anterior):
+        """
+        Mueve un reclamo de un departamento a otro. Los totales globales no cambian.
+
+        Args:
+            reclamo (Reclamo): El reclamo con su nuevo departamento.
+            departamento_anterior (str): El departamento del que proviene.
+        """
+        with self.__lock:
+            origen, _ = self.__acumuladores(departamento_anterior)
+            destino, _ = self.__acumuladores(reclamo.departamento)
+            origen.sumar(reclamo, -1)
+            destino.sumar(reclamo)
+
+    def obtener(self, departamento=None) -> dict:
+        """
+        Devuelve las estadísticas de un departamento, o las globales si no se indica uno.
+
+        Returns:
+            dict: total, cantidad por estado, medianas y percentiles de tiempo de resolución
+                  y las palabras clave más frecuentes.
+        """
+        with self.__lock:
+            if departamento:
+                acumulador = self.__departamentos.get(self._clave(departamento)) or _Acumulador()
+                return acumulador.resumen()
+            stats = self.__global.resumen()
+            total = SketchCuantiles(self.__precision_cuantiles)
+            for acumulador in self.__departamentos.values():
+                total.combinar(acumulador.sketch_resueltos)
+            stats["percentiles_resueltos"] = calcular_percentiles(total)
+            return stats
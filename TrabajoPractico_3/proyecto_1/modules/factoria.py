@@ -7,7 +7,9 @@ def crear_repositorio():
 
     Utiliza la función `crear_engine` del módulo `config` para obtener una sesión
     de SQLAlchemy, y luego crea instancias de `RepositorioReclamosSQLAlchemy`
-    y `RepositorioUsuariosSQLAlchemy`, pasándoles la sesión.
+    y `RepositorioUsuariosSQLAlchemy`, pasándoles la sesión. La sesión es un
+    `scoped_session`: ambos repositorios usan, en cada hilo, la misma sesión de
+    la petición en curso.
 
     Este enfoque centraliza la creación de repositorios y permite un fácil
     cambio de la implementación de la base de datos en el futuro.
@@ -17,6 +19,6 @@ def crear_repositorio():
                Cada elemento es una instancia de su respectivo repositorio concreto.
     """
     session= crear_engine()
-    repo_reclamos= RepositorioReclamosSQLAlchemy(session())
-    repo_usuarios= RepositorioUsuariosSQLAlchemy(session())
+    repo_reclamos= RepositorioReclamosSQLAlchemy(session)
+    repo_usuarios= RepositorioUsuariosSQLAlchemy(session)
     return repo_reclamos, repo_usuarios
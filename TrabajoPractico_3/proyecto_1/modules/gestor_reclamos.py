@@ -1,7 +1,17 @@
 # modules/gestor_reclamos.py
 from modules.dominio import Reclamo
-from modules.repositorio_abstracto import RepositorioAbstracto
-from datetime import datetime, timedelta
+from modules.repositorio_abstracto import RepositorioReclamosAbstracto
+from modules.cuantiles import PRECISION_POR_DEFECTO
+from modules.estadisticas import EstadisticasReclamos
+from modules.monticulo_binario import ColaPrioridadIndexada, MedianHeapEliminable
+from modules.indice_similitud import IndiceInvertidoTFIDF, CANTIDAD_SIMILARES, UMBRAL_SIMILITUD
+from modules.minhash import IndiceLSH, calcular_firma, firma_a_bytes, firma_desde_bytes, UMBRAL_DUPLICADO
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+
+TAMANO_PAGINA = 50
+TAMANO_PAGINA_MAXIMO = 200
+
 class GestorDeReclamos:
     """
     Clase que encapsula la lógica de negocio para la gestión de reclamos.
@@ -10,28 +20,93 @@ class GestorDeReclamos:
     de datos, aplicando reglas de negocio y coordinando operaciones.
 
     Atributos:
-        __repo (RepositorioAbstracto): Una instancia del repositorio de reclamos
+        __repo (RepositorioReclamosAbstracto): Una instancia del repositorio de reclamos
                                       para interactuar con la persistencia.
         __numero_reclamos (int): El número total de reclamos en el sistema.
                                  (Nota: este atributo podría no estar siempre actualizado
                                  si los reclamos se añaden/eliminan frecuentemente
                                  sin recalcularlo).
-        __clasificador (ClaimsClassifier, opcional): Una instancia del clasificador
-                                                    de texto para categorizar reclamos.
+        __clasificador (ModeloClasificador, opcional): El clasificador de texto para
+                                                      categorizar reclamos; su `predict`
+                                                      devuelve nombres de departamentos.
+        __estadisticas (EstadisticasReclamos): Estadísticas por departamento que se
+                                               actualizan con cada modificación de reclamos.
+        __ranking_pendientes (ColaPrioridadIndexada): Los IDs de los reclamos pendientes
+                                                      ordenados por cantidad de adherentes.
+        __indice_similares (IndiceInvertidoTFIDF): Las descripciones de los reclamos
+                                                   pendientes, para buscar similares.
+        __indice_duplicados (IndiceLSH): Las firmas MinHash de los reclamos pendientes,
+                                         para detectar reclamos casi duplicados.
+        __versiones (dict): Departamento (normalizado, None para el total) -> (versión,
+                            fecha de la última modificación), para invalidar cachés.
     """
-    def __init__(self, repo: RepositorioAbstracto, clasificador=None, label_encoder=None):
+    def __init__(self, repo: RepositorioReclamosAbstracto, clasificador=None, clase_median_heap=MedianHeapEliminable,
+                 precision_cuantiles=PRECISION_POR_DEFECTO):
         """
         Inicializa el GestorDeReclamos.
 
         Args:
-            repo (RepositorioAbstracto): La implementación del repositorio a utilizar.
-            clasificador (ClaimsClassifier, opcional): El clasificador de texto de reclamos.
+            repo (RepositorioReclamosAbstracto): La implementación del repositorio a utilizar.
+            clasificador (ModeloClasificador, opcional): El clasificador de texto de reclamos.
+            clase_median_heap (type): La implementación de `MedianHeapEliminable` de las medianas
+                                      de las estadísticas (ej. `MedianHeapEliminableCompacto`).
+            precision_cuantiles (int): La precisión `k` de los sketches de percentiles de las
+                                       estadísticas (ver `SketchCuantiles`).
         """
         self.__repo = repo
         # Se obtiene el número inicial de reclamos. Considerar si esto debe ser dinámico.
-        self.__numero_reclamos = len(self.__repo.obtener_todos_los_registros()) 
+        reclamos = self.__repo.obtener_todos_los_registros()
+        self.__numero_reclamos = len(reclamos)
+        # Las estadísticas se calculan una sola vez aquí y luego se mantienen al día
+        self.__estadisticas = EstadisticasReclamos(reclamos, clase_median_heap=clase_median_heap,
+                                                   precision_cuantiles=precision_cuantiles)
+        # Ranking de reclamos pendientes por adherentes, actualizado con cada adhesión
+        self.__ranking_pendientes = ColaPrioridadIndexada()
+        self.__lock_ranking = Lock()
+        ids_pendientes = [r.id for r in reclamos if r.estado == "pendiente"]
+        if ids_pendientes:
+            adherentes = self.__repo.contar_adherentes_multiples(ids_pendientes)
+            self.__ranking_pendientes.construir((i, adherentes[i]) for i in ids_pendientes)
+        # Índices de los reclamos pendientes, actualizados con cada alta, derivación, cambio de estado y baja
+        self.__indice_similares = IndiceInvertidoTFIDF()
+        self.__indice_duplicados = IndiceLSH()
+        self.__lock_similares = Lock()
+        for r in reclamos:
+            if r.estado == "pendiente":
+                self.__indice_similares.agregar(r.id, r.descripcion, r.departamento)
+                self.__indice_duplicados.agregar(r.id, self.__obtener_firma(r))
         self.__clasificador = clasificador
-        self.__label_encoder = label_encoder 
+        # Versión de los datos de cada departamento: aumenta con cada modificación de sus reclamos
+        self.__versiones = {}
+        self.__inicio = datetime.now(timezone.utc).replace(microsecond=0)
+        self.__lock_versiones = Lock()
+
+    def obtener_version_datos(self, departamento=None):
+        """
+        Obtiene la versión actual de los reclamos de un departamento.
+
+        La versión aumenta con cada alta, cambio de estado, derivación y baja realizada
+        a través del gestor, por lo que sirve de clave para cachear resultados derivados
+        de los reclamos (ej. reportes) y como validador HTTP (ETag/Last-Modified).
+
+        Args:
+            departamento (str, opcional): El departamento. None para todos los reclamos.
+
+        Returns:
+            tuple: (int, datetime) con la versión y la fecha (UTC, sin microsegundos) de la
+                   última modificación, o la de creación del gestor si no hubo ninguna.
+        """
+        clave = departamento.strip().lower() if departamento else None
+        with self.__lock_versiones:
+            return self.__versiones.get(clave, (0, self.__inicio))
+
+    def __registrar_cambio(self, *departamentos):
+        """Aumenta la versión de los datos de los departamentos indicados y la del total."""
+        ahora = datetime.now(timezone.utc).replace(microsecond=0)
+        with self.__lock_versiones:
+            for clave in {None, *(d.strip().lower() for d in departamentos if d)}:
+                version, _ = self.__versiones.get(clave, (0, None))
+                self.__versiones[clave] = (version + 1, ahora)
 
     @property
     def numero_reclamos(self):
@@ -63,8 +138,18 @@ class GestorDeReclamos:
         if not departamento or departamento.strip() == "":
             raise ValueError("El reclamo debe pertenecer a un departamento")
             
-        reclamo = Reclamo(None, descripcion, "pendiente", id_usuario, departamento, p_foto=p_foto)
+        firma = calcular_firma(descripcion)
+        reclamo = Reclamo(None, descripcion, "pendiente", id_usuario, departamento, p_foto=p_foto,
+                          p_minhash=firma_a_bytes(firma))
         self.__repo.guardar_registro(reclamo)
+        self.__estadisticas.registrar(reclamo)
+        self.__registrar_cambio(departamento)
+        if reclamo.id is not None:
+            with self.__lock_ranking:
+                self.__ranking_pendientes.insertar(reclamo.id, 0)
+            with self.__lock_similares:
+                self.__indice_similares.agregar(reclamo.id, descripcion, departamento)
+                self.__indice_duplicados.agregar(reclamo.id, firma)
 
 
     def listar_reclamos(self):
@@ -75,10 +160,7 @@ class GestorDeReclamos:
             list: Una lista de diccionarios, donde cada diccionario representa un reclamo
                   e incluye un campo 'adherentes' con la cantidad de usuarios adheridos.
         """
-        reclamos = self.__repo.obtener_registros_por_filtros() # Asume que sin filtros trae todo
-        for r in reclamos: 
-            r.adherentes = self._obtener_cantidad_adherentes(r.id)
-        return reclamos
+        return self.__repo.obtener_registros_con_adherentes() # Sin filtros trae todo
 
     # En modules/gestor_reclamos.py
 
@@ -93,11 +175,8 @@ class GestorDeReclamos:
         if estado:
             filtros["estado"] = estado
 
-        # El repositorio ya devuelve una lista de objetos Reclamo, simplemente la retornamos.
-        reclamos_objetos = self.__repo.obtener_registros_por_filtros(**filtros)
-        for r in reclamos_objetos:
-            r.adherentes = self._obtener_cantidad_adherentes(r.id)
-        return reclamos_objetos
+        # El repositorio devuelve los objetos Reclamo con los adherentes ya contados.
+        return self.__repo.obtener_registros_con_adherentes(**filtros)
 
     def listar_reclamos_para_usuarios(self):
         """
@@ -107,10 +186,52 @@ class GestorDeReclamos:
             list: Una lista de diccionarios de reclamos en estado "pendiente",
                   incluyendo la cantidad de adherentes.
         """
-        reclamos = self.__repo.obtener_registros_por_filtros(estado="pendiente")
-        for r in reclamos:
-            r.adherentes = self._obtener_cantidad_adherentes(r.id)
-        return reclamos
+        return self.__repo.obtener_registros_con_adherentes(estado="pendiente")
+
+    def listar_reclamos_paginados(self, cursor=None, limite=None, **filtros):
+        """
+        Lista una página de reclamos, del más nuevo al más antiguo, con su cantidad de adherentes.
+
+        Args:
+            cursor (str, opcional): El cursor de la página a obtener (None para la primera).
+            limite (int, opcional): El tamaño de página pedido. Se usa `TAMANO_PAGINA` si no
+                                    se especifica y se acota a `TAMANO_PAGINA_MAXIMO`.
+            **filtros: Filtros por atributo del reclamo (ej. `departamento`, `estado`, `id_usuario`).
+
+        Returns:
+            tuple: (list[Reclamo], str or None) con los reclamos de la página y el cursor
+                   de la página siguiente, o None si es la última.
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        limite = max(1, min(limite or TAMANO_PAGINA, TAMANO_PAGINA_MAXIMO))
+        if "departamento" in filtros:
+            filtros["departamento"] = filtros["departamento"].strip()
+        return self.__repo.obtener_pagina(limite, cursor, **filtros)
+
+    def buscar_reclamos(self, texto, cursor=None, limite=None, **filtros):
+        """
+        Busca reclamos por el texto de su descripción, del más al menos relevante.
+
+        Args:
+            texto (str): Las palabras a buscar.
+            cursor (str, opcional): El cursor de la página a obtener (None para la primera).
+            limite (int, opcional): El tamaño de página pedido. Se usa `TAMANO_PAGINA` si no
+                                    se especifica y se acota a `TAMANO_PAGINA_MAXIMO`.
+            **filtros: `departamento` y/o `estado`.
+
+        Returns:
+            tuple: (list[Reclamo], str or None) con los reclamos de la página y el cursor
+                   de la página siguiente, o None si es la última.
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        limite = max(1, min(limite or TAMANO_PAGINA, TAMANO_PAGINA_MAXIMO))
+        if filtros.get("departamento"):
+            filtros["departamento"] = filtros["departamento"].strip()
+        return self.__repo.buscar_texto(texto, limite=limite, cursor=cursor, **filtros)
 
     def actualizar_estado_reclamo(self, id_reclamo, nuevo_estado, dias_resolucion=None):
         """
@@ -131,6 +252,7 @@ class GestorDeReclamos:
         if not reclamo:
             raise ValueError("El reclamo no existe")
 
+        estado_anterior = reclamo.estado
         reclamo.estado = nuevo_estado # La validación del estado se hace en el setter de la clase Reclamo
         
         if nuevo_estado == "resuelto":
@@ -151,6 +273,20 @@ class GestorDeReclamos:
         # lo cual podría ser una consideración de diseño.
             
         self.__repo.modificar_registro(reclamo)
+        self.__estadisticas.cambiar_estado(reclamo, estado_anterior)
+        self.__registrar_cambio(reclamo.departamento)
+        with self.__lock_ranking:
+            if nuevo_estado != "pendiente" and id_reclamo in self.__ranking_pendientes:
+                self.__ranking_pendientes.eliminar(id_reclamo)
+            elif nuevo_estado == "pendiente" and id_reclamo not in self.__ranking_pendientes:
+                self.__ranking_pendientes.insertar(id_reclamo, self.__repo.contar_adherentes(id_reclamo))
+        with self.__lock_similares:
+            if nuevo_estado != "pendiente":
+                self.__indice_similares.eliminar(id_reclamo)
+                self.__indice_duplicados.eliminar(id_reclamo)
+            elif id_reclamo not in self.__indice_similares:
+                self.__indice_similares.agregar(id_reclamo, reclamo.descripcion, reclamo.departamento)
+                self.__indice_duplicados.agregar(id_reclamo, self.__obtener_firma(reclamo))
 
     def eliminar_reclamo(self, id_reclamo):
         """
@@ -162,8 +298,17 @@ class GestorDeReclamos:
         Raises:
             ValueError: Si el reclamo con el ID especificado no existe.
         """
-        if self.__repo.obtener_registro_por_filtro("id", id_reclamo):
+        reclamo = self.__repo.obtener_registro_por_filtro("id", id_reclamo)
+        if reclamo:
             self.__repo.eliminar_registro(id_reclamo)
+            self.__estadisticas.eliminar(reclamo)
+            self.__registrar_cambio(reclamo.departamento)
+            with self.__lock_ranking:
+                if id_reclamo in self.__ranking_pendientes:
+                    self.__ranking_pendientes.eliminar(id_reclamo)
+            with self.__lock_similares:
+                self.__indice_similares.eliminar(id_reclamo)
+                self.__indice_duplicados.eliminar(id_reclamo)
         else:
             raise ValueError("El reclamo no existe")
 
@@ -179,6 +324,32 @@ class GestorDeReclamos:
             ValueError: Si el usuario ya está adherido a ese reclamo.
         """
         self.__repo.adherir_usuario_a_reclamo(id_usuario, id_reclamo)
+        with self.__lock_ranking:
+            if id_reclamo in self.__ranking_pendientes:
+                adherentes = self.__ranking_pendientes.prioridad(id_reclamo)
+                self.__ranking_pendientes.actualizar_prioridad(id_reclamo, adherentes + 1)
+
+    def obtener_reclamos_mas_adheridos(self, cantidad=10):
+        """
+        Obtiene los reclamos pendientes con más adherentes, de mayor a menor.
+
+        El ranking se mantiene en una cola de prioridad indexada que se actualiza con
+        cada adhesión, alta, cambio de estado y baja, por lo que no se ordena la tabla
+        de reclamos en cada consulta.
+
+        Args:
+            cantidad (int): La cantidad máxima de reclamos a devolver.
+
+        Returns:
+            list[Reclamo]: Los reclamos, con el atributo `adherentes` cargado.
+        """
+        with self.__lock_ranking:
+            primeros = self.__ranking_pendientes.primeros(cantidad)
+        adherentes = dict(primeros)
+        reclamos = self.__repo.obtener_registros_por_ids([id_reclamo for id_reclamo, _ in primeros])
+        for reclamo in reclamos:
+            reclamo.adherentes = adherentes[reclamo.id]
+        return reclamos
 
     def _obtener_cantidad_adherentes(self, id_reclamo):
         """
@@ -231,31 +402,73 @@ class GestorDeReclamos:
         Raises:
             ValueError: Si el clasificador no ha sido configurado en el gestor.
         """
-        if not self.__clasificador or not self.__label_encoder:
+        if not self.__clasificador:
             raise ValueError("Clasificador no configurado")
-        # 1. El clasificador predice el NÚMERO
-        prediccion_numerica = self.__clasificador.predict([descripcion])
-        # 2. El LabelEncoder traduce el NÚMERO de vuelta al TEXTO
-        nombre_departamento = self.__label_encoder.inverse_transform(prediccion_numerica)
-        return nombre_departamento[0]
+        # Las clases viajan con el modelo: predict ya devuelve el nombre del departamento
+        return self.__clasificador.predict([descripcion])[0]
 
-    def buscar_similares(self, descripcion):
+    def buscar_similares(self, descripcion, cantidad=CANTIDAD_SIMILARES, umbral=UMBRAL_SIMILITUD):
         """
-        Busca reclamos similares de forma eficiente.
-        Un reclamo es "similar" si pertenece al mismo departamento que el clasificador
-        sugiere para la nueva descripción.
+        Busca los reclamos pendientes más parecidos a una descripción.
+
+        Se buscan, dentro del departamento que el clasificador sugiere para la
+        descripción, los reclamos pendientes con mayor similitud coseno TF-IDF
+        (ver `modules.indice_similitud`). Solo se consultan en el repositorio los
+        reclamos encontrados.
+
+        Args:
+            descripcion (str): El texto del nuevo reclamo.
+            cantidad (int): La cantidad máxima de reclamos a devolver.
+            umbral (float): La similitud mínima (entre 0 y 1).
+
+        Returns:
+            list[Reclamo]: Los reclamos similares, del más al menos parecido, con el
+                           atributo `similitud` cargado.
         """
-        # 1. Clasificamos la descripción UNA SOLA VEZ para obtener el departamento.
         departamento_sugerido = self.clasificar_descripcion(descripcion)
-        
-        # 2. Hacemos UNA SOLA CONSULTA a la base de datos pidiendo los reclamos de ese departamento.
-        #    Adicionalmente, solo buscamos entre los que están 'pendientes'.
-        reclamos_similares = self.__repo.obtener_registros_por_filtros(
-            departamento=departamento_sugerido,
-            estado="pendiente"
-        )
-        
-        return reclamos_similares
+        with self.__lock_similares:
+            encontrados = self.__indice_similares.buscar(descripcion, cantidad, umbral, departamento_sugerido)
+        similitudes = dict(encontrados)
+        reclamos = self.__repo.obtener_registros_por_ids([id_reclamo for id_reclamo, _ in encontrados])
+        for reclamo in reclamos:
+            reclamo.similitud = similitudes[reclamo.id]
+        return reclamos
+
+    def buscar_duplicado(self, descripcion, umbral=UMBRAL_DUPLICADO):
+        """
+        Busca un reclamo pendiente que sea casi un duplicado de la descripción.
+
+        Compara la firma MinHash de la descripción solo con los reclamos que el
+        índice LSH propone como candidatos (ver `modules.minhash`), sin recorrer
+        todos los reclamos.
+
+        Args:
+            descripcion (str): El texto del nuevo reclamo.
+            umbral (float): La similitud de Jaccard estimada mínima (entre 0 y 1).
+
+        Returns:
+            Reclamo or None: El reclamo más parecido, con el atributo `similitud`
+                             cargado, o None si no hay ninguno casi duplicado.
+        """
+        firma = calcular_firma(descripcion)
+        with self.__lock_similares:
+            duplicados = self.__indice_duplicados.buscar_duplicados(firma, umbral)
+        for id_reclamo, similitud in duplicados:
+            reclamo = self.__repo.obtener_registro_por_filtro("id", id_reclamo)
+            if reclamo:
+                reclamo.similitud = similitud
+                return reclamo
+        return None
+
+    @staticmethod
+    def __obtener_firma(reclamo):
+        """
+        Devuelve la firma MinHash guardada con el reclamo, o la calcula si no la tiene
+        (reclamos creados antes de que existiera la columna `minhash`).
+        """
+        if reclamo.minhash:
+            return firma_desde_bytes(reclamo.minhash)
+        return calcular_firma(reclamo.descripcion)
 
     def derivar_reclamo(self, id_reclamo, nuevo_departamento):
         """
@@ -269,8 +482,30 @@ class GestorDeReclamos:
         if not nuevo_departamento or nuevo_departamento == reclamo.departamento:
             raise ValueError("Debe seleccionar un departamento diferente para derivar.")
 
+        departamento_anterior = reclamo.departamento
         reclamo.departamento = nuevo_departamento
         self.__repo.modificar_registro(reclamo)
+        self.__estadisticas.derivar(reclamo, departamento_anterior)
+        self.__registrar_cambio(departamento_anterior, nuevo_departamento)
+        with self.__lock_similares:
+            self.__indice_similares.cambiar_departamento(id_reclamo, nuevo_departamento)
+
+    def obtener_estadisticas(self, departamento=None):
+        """
+        Obtiene las estadísticas de los reclamos de un departamento, o de todos si no se indica.
+
+        No consulta el repositorio: las estadísticas se mantienen actualizadas con cada
+        alta, cambio de estado, derivación y baja realizada a través del gestor.
+
+        Args:
+            departamento (str, opcional): El departamento. None para las estadísticas globales.
+
+        Returns:
+            dict: total, cantidad por estado (pendientes, en_proceso, resueltos, invalidos),
+                  medianas de tiempo de resolución, percentiles de los resueltos
+                  (percentiles_resueltos) y palabras clave más frecuentes.
+        """
+        return self.__estadisticas.obtener(departamento)
 
     def obtener_todos_los_reclamos(self):
         """
@@ -278,7 +513,4 @@ class GestorDeReclamos:
         Returns:
             list[Reclamo]: Una lista con todos los reclamos registrados.
         """
-        reclamos= self.__repo.obtener_todos_los_registros()
-        for r in reclamos:
-            r.adherentes =self._obtener_cantidad_adherentes(r.id)
-        return reclamos
+        return self.__repo.obtener_registros_con_adherentes()
@@ -2,6 +2,11 @@ from abc import ABC, abstractmethod
 
 class Graficador(ABC):
 
+    @property
+    def mimetype(self) -> str:
+        """El tipo MIME de las imágenes que genera el graficador."""
+        return 'image/png'
+
     @abstractmethod
     def crear_grafico_barras(self, datos: dict, titulo:str, etiqueta_x:str, etiqueta_y:str)-> bytes:
         """
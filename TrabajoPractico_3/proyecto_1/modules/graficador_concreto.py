@@ -1,41 +1,79 @@
 from modules.graficador_abstracto import Graficador
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
 from wordcloud import WordCloud
+from contextlib import contextmanager
 import io
+import math
+import threading
 
-# Desactiva el modo interactivo de Matplotlib para que funcione en un entorno de servidor
-plt.switch_backend('Agg')
+COLORES = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99']
+# Formatos de imagen soportados y su tipo MIME
+FORMATOS_IMAGEN = {'png': 'image/png', 'svg': 'image/svg+xml'}
+# Figuras libres que se conservan de cada tipo de gráfico (las demás se descartan)
+MAX_FIGURAS_LIBRES = 8
 
 class GraficadorMatplotlib(Graficador):
     """
     Implementación concreta de Graficador que utiliza Matplotlib y WordCloud para
     generar las visualizaciones.
+
+    No usa `pyplot` (su estado global no es seguro con un servidor de varios hilos):
+    dibuja con la API orientada a objetos (`Figure` sobre un lienzo Agg). Las figuras
+    de cada tipo de gráfico se guardan en un pool compartido por todos los hilos,
+    protegido por un lock: cada gráfico toma una figura libre (o crea una si no hay),
+    la usa sin que otro hilo la toque y la devuelve al terminar. Así se reutilizan
+    también con el servidor de desarrollo de Werkzeug, que atiende cada petición en
+    un hilo nuevo. La torta actualiza los ángulos y textos de sus porciones y la nube
+    reemplaza los datos de su imagen, en lugar de volver a construir figura y ejes.
     """
 
-    def _guardar_grafico_en_buffer(self) -> bytes:
-        """Función de ayuda para guardar la figura actual en un buffer de memoria."""
+    def __init__(self, formato: str = 'png'):
+        """
+        Args:
+            formato (str): 'png' (por defecto) o 'svg', más liviano para la torta y las barras.
+
+        Raises:
+            ValueError: Si el formato no es soportado.
+        """
+        if formato not in FORMATOS_IMAGEN:
+            raise ValueError(f"Formato de imagen '{formato}' no soportado. Use 'png' o 'svg'.")
+        self.formato = formato
+        # Figuras libres de cada tipo de gráfico: el estado que necesita cada uno para redibujarse
+        self.__figuras_libres = {'barras': [], 'torta': [], 'nube': []}
+        self.__lock = threading.Lock()
+
+    @property
+    def mimetype(self) -> str:
+        """El tipo MIME de las imágenes generadas ('image/png' o 'image/svg+xml')."""
+        return FORMATOS_IMAGEN[self.formato]
+
+    def _guardar_grafico_en_buffer(self, fig: Figure) -> bytes:
+        """Función de ayuda para guardar una figura en un buffer de memoria."""
         buf = io.BytesIO()
         # bbox_inches='tight' asegura que no se corten las etiquetas
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close()  # Es crucial cerrar la figura para liberar memoria
-        return buf.read()
+        fig.savefig(buf, format=self.formato, bbox_inches='tight')
+        return buf.getvalue()
 
     def crear_grafico_barras(self, datos: dict, titulo: str, etiqueta_x: str, etiqueta_y: str) -> bytes:
         labels = list(datos.keys())
         values = list(datos.values())
 
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.bar(labels, values, color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99'])
-        ax.set_ylabel(etiqueta_y)
-        ax.set_xlabel(etiqueta_x)
-        ax.set_title(titulo, fontsize=16)
-        
-        # Añadir los valores numéricos encima de cada barra
-        for i, v in enumerate(values):
-            ax.text(i, v + 0.1, str(v), ha='center', fontweight='bold')
-            
-        return self._guardar_grafico_en_buffer()
+        # La cantidad de barras varía: se reutiliza la figura pero se redibujan los ejes
+        with self.__figura('barras', lambda: self.__crear_figura((8, 5))) as (fig, ax):
+            ax.clear()
+            ax.bar(labels, values, color=COLORES)
+            ax.set_ylabel(etiqueta_y)
+            ax.set_xlabel(etiqueta_x)
+            ax.set_title(titulo, fontsize=16)
+
+            # Añadir los valores numéricos encima de cada barra
+            for i, v in enumerate(values):
+                ax.text(i, v + 0.1, str(v), ha='center', fontweight='bold')
+
+            return self._guardar_grafico_en_buffer(fig)
 
     def crear_grafico_torta(self, datos: dict, titulo: str) -> bytes:
         # Filtra datos con valor 0 para no mostrarlos en el gráfico
@@ -45,24 +83,109 @@ class GraficadorMatplotlib(Graficador):
         if not values_filtrados:
             return None # No se puede generar un gráfico sin datos
 
-        fig, ax = plt.subplots(figsize=(8, 8))
-        ax.pie(values_filtrados, labels=labels_filtrados, autopct='%1.1f%%', startangle=90,
-               colors=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99'])
-        ax.axis('equal')  # Asegura que el gráfico sea un círculo perfecto
-        ax.set_title(titulo, fontsize=16)
-        
-        return self._guardar_grafico_en_buffer()
+        with self.__figura('torta', self.__crear_torta) as (fig, ax, porciones):
+            self.__dibujar_torta(ax, porciones, labels_filtrados, values_filtrados)
+            ax.set_title(titulo, fontsize=16)
+            return self._guardar_grafico_en_buffer(fig)
+
+    def __dibujar_torta(self, ax, porciones: list, labels_filtrados: list, values_filtrados: list):
+        """Ajusta las porciones de una torta reutilizada a los nuevos datos."""
+        while len(porciones) < len(values_filtrados):
+            porciones.append(self.__crear_porcion(ax))
+
+        # Mismo dibujo que `ax.pie(..., autopct='%1.1f%%', startangle=90)`
+        total = sum(values_filtrados)
+        inicio = 90.0
+        for i, (wedge, etiqueta, porcentaje) in enumerate(porciones):
+            if i >= len(values_filtrados):
+                for artista in (wedge, etiqueta, porcentaje):
+                    artista.set_visible(False)
+                continue
+            fraccion = values_filtrados[i] / total
+            fin = inicio + 360.0 * fraccion
+            medio = math.radians((inicio + fin) / 2)
+            wedge.set_theta1(inicio)
+            wedge.set_theta2(fin)
+            wedge.set_facecolor(COLORES[i % len(COLORES)])
+            x_etiqueta = 1.1 * math.cos(medio)
+            etiqueta.set_position((x_etiqueta, 1.1 * math.sin(medio)))
+            etiqueta.set_horizontalalignment('left' if x_etiqueta > 0 else 'right')
+            etiqueta.set_text(labels_filtrados[i])
+            porcentaje.set_position((0.6 * math.cos(medio), 0.6 * math.sin(medio)))
+            porcentaje.set_text('%1.1f%%' % (100 * fraccion))
+            for artista in (wedge, etiqueta, porcentaje):
+                artista.set_visible(True)
+            inicio = fin
+        # Como en `ax.pie` seguido de `ax.axis('equal')`, los límites se ajustan a las porciones
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
 
     def crear_nube_palabras(self, palabras_frecuentes: list, titulo: str) -> bytes:
         if not palabras_frecuentes:
             return None
 
-        # El generador espera un diccionario de frecuencias
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(dict(palabras_frecuentes))
+        with self.__figura('nube', self.__crear_nube) as nube:
+            wordcloud, fig, ax, imagen = nube
+            # El generador espera un diccionario de frecuencias
+            pixeles = wordcloud.generate_from_frequencies(dict(palabras_frecuentes)).to_array()
+            if imagen is None:
+                # La imagen se crea con el primer gráfico y queda en la figura
+                nube[3] = ax.imshow(pixeles, interpolation='bilinear')
+            else:
+                imagen.set_data(pixeles)
+            ax.set_title(titulo, fontsize=16)
+
+            return self._guardar_grafico_en_buffer(fig)
+
+    @contextmanager
+    def __figura(self, tipo: str, crear):
+        """
+        Presta una figura libre del tipo pedido, o una nueva creada con `crear()`, y la
+        devuelve al pool al terminar (salvo que ya haya `MAX_FIGURAS_LIBRES` libres).
+        """
+        with self.__lock:
+            libres = self.__figuras_libres[tipo]
+            figura = libres.pop() if libres else None
+        if figura is None:
+            figura = crear()
+        try:
+            yield figura
+        finally:
+            with self.__lock:
+                if len(libres) < MAX_FIGURAS_LIBRES:
+                    libres.append(figura)
+
+    @classmethod
+    def __crear_torta(cls) -> tuple:
+        """Crea la figura de la torta, todavía sin porciones."""
+        fig, ax = cls.__crear_figura((8, 8))
+        # Mismos ejes que deja `Axes.pie`, con un círculo perfecto
+        ax.set(frame_on=False, xticks=[], yticks=[], xlim=(-1.25, 1.25), ylim=(-1.25, 1.25))
+        ax.axis('equal')
+        return fig, ax, []
+
+    @classmethod
+    def __crear_nube(cls) -> list:
+        """Crea el generador y la figura de la nube; la imagen se agrega con el primer gráfico."""
+        wordcloud = WordCloud(width=800, height=400, background_color='white')
+        fig, ax = cls.__crear_figura((10, 5))
+        ax.axis('off')
+        return [wordcloud, fig, ax, None]
 
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.title(titulo, fontsize=16)
+    @staticmethod
+    def __crear_figura(tamano: tuple) -> tuple:
+        """Crea una figura con un único eje, dibujada sobre un lienzo Agg propio."""
+        fig = Figure(figsize=tamano)
+        FigureCanvasAgg(fig)
+        return fig, fig.add_subplot()
 
-        return self._guardar_grafico_en_buffer()
\ No newline at end of file
+    @staticmethod
+    def __crear_porcion(ax) -> tuple:
+        """Agrega a la torta una porción vacía con su etiqueta y su porcentaje."""
+        wedge = Wedge((0, 0), 1, 90, 90, clip_on=False)
+        ax.add_patch(wedge)
+        etiqueta = ax.text(0, 0, '', clip_on=False, verticalalignment='center',
+                           size=matplotlib.rcParams['xtick.labelsize'])
+        porcentaje = ax.text(0, 0, '', clip_on=False, horizontalalignment='center',
+                             verticalalignment='center')
+        return wedge, etiqueta, porcentaje
@@ -0,0 +1,191 @@
+"""
+Búsqueda de reclamos similares con un índice invertido TF-IDF.
+
+Cada reclamo indexado se representa como un vector TF-IDF de las raíces de su
+descripción, obtenidas con el mismo preprocesamiento que `TextVectorizer`
+(`preprocesar_texto`). El índice invertido guarda, para cada raíz, los reclamos que
+la contienen y cuántas veces, separados por departamento.
+
+Una búsqueda solo recorre las listas de las raíces de la consulta dentro del
+departamento pedido, acumulando el producto escalar de cada candidato; los reclamos
+que no comparten ninguna raíz con la consulta nunca se visitan. Por eso el costo
+depende de cuántos reclamos comparten palabras con la consulta y no del total.
+
+El IDF se calcula con las frecuencias actuales en cada búsqueda (no se guarda en los
+vectores), así que agregar, quitar o mover un reclamo solo toca las listas de sus
+propias raíces.
+"""
+import heapq
+import math
+from collections import Counter
+from modules.recursos_nlp import STOP_WORDS_ES
+from modules.text_vectorizer import preprocesar_texto
+
+# Cantidad de reclamos similares que se devuelven por defecto
+CANTIDAD_SIMILARES = 10
+# Similitud coseno mínima para considerar similar a un reclamo
+UMBRAL_SIMILITUD = 0.2
+
+
+class IndiceInvertidoTFIDF:
+    """
+    Índice invertido de reclamos para buscar los más parecidos a un texto.
+
+    No es seguro para usar desde varios hilos a la vez: quien lo comparta debe
+    protegerlo con un lock (como hace `GestorDeReclamos`).
+
+    Atributos:
+        tokenizador (str): "punkt" o "regex" (ver `TextVectorizer`).
+        __documentos (dict[int, tuple]): ID -> (Counter de raíces, departamento normalizado).
+        __particiones (dict[str, dict[str, dict[int, int]]]): Departamento normalizado ->
+                                                              raíz -> {ID: apariciones}.
+        __frecuencias (Counter): Raíz -> cantidad de reclamos que la contienen.
+    """
+    def __init__(self, tokenizador="punkt"):
+        """
+        Args:
+            tokenizador (str): "punkt" (por defecto, como `TextVectorizer`) o "regex".
+        """
+        self.tokenizador = tokenizador
+        self.__documentos = {}
+        self.__particiones = {}
+        self.__frecuencias = Counter()
+
+    def __len__(self):
+        return len(self.__documentos)
+
+    def __contains__(self, id_reclamo):
+        return id_reclamo in self.__documentos
+
+    def agregar(self, id_reclamo, descripcion, departamento=None):
+        """
+        Indexa un reclamo. Si ya estaba indexado, se reemplaza.
+
+        Args:
+            id_reclamo (int): El ID del reclamo.
+            descripcion (str): El texto del reclamo.
+            departamento (str, opcional): El departamento del reclamo.
+        """
+        if id_reclamo in self.__documentos:
+            self.eliminar(id_reclamo)
+        departamento = self._clave(departamento)
+        terminos = self.__terminos(descripcion)
+        self.__documentos[id_reclamo] = (terminos, departamento)
+        self.__frecuencias.update(terminos.keys())
+        self.__indexar(id_reclamo, terminos, departamento)
+
+    def eliminar(self, id_reclamo):
+        """
+        Quita un reclamo del índice. No hace nada si no estaba indexado.
+
+        Args:
+            id_reclamo (int): El ID del reclamo.
+        """
+        if id_reclamo not in self.__documentos:
+            return
+        terminos, departamento = self.__documentos.pop(id_reclamo)
+        self.__desindexar(id_reclamo, terminos, departamento)
+        self.__frecuencias.subtract(terminos.keys())
+        for termino in terminos:
+            if self.__frecuencias[termino] <= 0:
+                del self.__frecuencias[termino]
+
+    def cambiar_departamento(self, id_reclamo, departamento):
+        """
+        Mueve un reclamo indexado a otro departamento (ej. al derivarlo).
+
+        Args:
+            id_reclamo (int): El ID del reclamo.
+            departamento (str): El nuevo departamento.
+        """
+        if id_reclamo not in self.__documentos:
+            return
+        departamento = self._clave(departamento)
+        terminos, anterior = self.__documentos[id_reclamo]
+        self.__desindexar(id_reclamo, terminos, anterior)
+        self.__documentos[id_reclamo] = (terminos, departamento)
+        self.__indexar(id_reclamo, terminos, departamento)
+
+    def buscar(self, texto, cantidad=CANTIDAD_SIMILARES, umbral=UMBRAL_SIMILITUD, departamento=None):
+        """
+        Busca los reclamos indexados más parecidos a un texto (similitud coseno TF-IDF).
+
+        Args:
+            texto (str): El texto a buscar.
+            cantidad (int): La cantidad máxima de resultados.
+            umbral (float): La similitud mínima (entre 0 y 1) de los resultados.
+            departamento (str, opcional): Si se indica, solo se buscan reclamos de ese
+                                          departamento (sin distinguir mayúsculas ni
+                                          espacios en los extremos). None busca en todos.
+
+        Returns:
+            list[tuple[int, float]]: (ID, similitud) de los reclamos encontrados, de mayor
+                                     a menor similitud.
+        """
+        consulta = self.__terminos(texto)
+        if departamento is None:
+            particiones = list(self.__particiones.values())
+        else:
+            clave = self._clave(departamento)
+            particiones = [self.__particiones[clave]] if clave in self.__particiones else []
+
+        pesos_consulta = {}
+        productos = Counter()
+        for termino, apariciones in consulta.items():
+            idf = self.__idf(termino)
+            if idf is None:
+                continue
+            peso = apariciones * idf
+            pesos_consulta[termino] = peso
+            for particion in particiones:
+                for id_reclamo, apariciones_doc in particion.get(termino, {}).items():
+                    productos[id_reclamo] += peso * apariciones_doc * idf
+        if not productos:
+            return []
+
+        norma_consulta = math.sqrt(sum(peso * peso for peso in pesos_consulta.values()))
+        resultados = []
+        for id_reclamo, producto in productos.items():
+            similitud = producto / (norma_consulta * self.__norma(id_reclamo))
+            if similitud >= umbral:
+                resultados.append((id_reclamo, min(similitud, 1.0)))
+        return heapq.nlargest(cantidad, resultados, key=lambda resultado: (resultado[1], -resultado[0]))
+
+    @staticmethod
+    def _clave(departamento):
+        """Normaliza el nombre de un departamento para usarlo como clave de partición."""
+        return departamento.strip().lower() if departamento is not None else None
+
+    def __terminos(self, texto):
+        """Devuelve las raíces de un texto con su cantidad de apariciones."""
+        return Counter(preprocesar_texto(texto or "", self.tokenizador, STOP_WORDS_ES).split())
+
+    def __idf(self, termino):
+        """IDF suavizado de una raíz, o None si ningún reclamo la contiene."""
+        frecuencia = self.__frecuencias.get(termino, 0)
+        if frecuencia == 0:
+            return None
+        return math.log((1 + len(self.__documentos)) / (1 + frecuencia)) + 1
+
+    def __norma(self, id_reclamo):
+        """Norma del vector TF-IDF de un reclamo, con los IDF actuales."""
+        terminos, _ = self.__documentos[id_reclamo]
+        return math.sqrt(sum((apariciones * self.__idf(termino)) ** 2
+                             for termino, apariciones in terminos.items()))
+
+    def __indexar(self, id_reclamo, terminos, departamento):
+        """Agrega el reclamo a las listas de sus raíces en la partición del departamento."""
+        particion = self.__particiones.setdefault(departamento, {})
+        for termino, apariciones in terminos.items():
+            particion.setdefault(termino, {})[id_reclamo] = apariciones
+
+    def __desindexar(self, id_reclamo, terminos, departamento):
+        """Quita el reclamo de las listas de sus raíces, borrando las que quedan vacías."""
+        particion = self.__particiones[departamento]
+        for termino in terminos:
+            lista = particion[termino]
+            del lista[id_reclamo]
+            if not lista:
+                del particion[termino]
+        if not particion:
+            del self.__particiones[departamento]
@@ -0,0 +1,109 @@
+"""
+Migraciones del esquema de la base de datos.
+
+`Base.metadata.create_all` solo crea las tablas que no existen: sobre una base
+de datos ya creada (como `data/base_datos.db`) no agrega las columnas ni los
+índices que se declaren después en `modules.modelos`. Este módulo se encarga de
+llevar una base existente al esquema actual de forma idempotente, por lo que
+puede ejecutarse en cada arranque de la aplicación.
+
+En SQLite también crea la búsqueda de texto completo: una tabla virtual FTS5
+(`TABLA_BUSQUEDA_RECLAMOS`) que indexa `reclamos.descripcion` sin duplicar el
+texto (content='reclamos') y los triggers que la mantienen sincronizada con cada
+INSERT, UPDATE de la descripción y DELETE sobre `reclamos`.
+
+Uso independiente (desde la raíz del proyecto):
+    python -m modules.migraciones
+"""
+from datetime import datetime
+from sqlalchemy import create_engine, inspect, text, update
+from sqlalchemy.schema import CreateIndex
+from modules.modelos import Base, Adherencia, ModeloReclamo, TABLA_BUSQUEDA_RECLAMOS
+
+# Fecha que reciben los reclamos sin fecha de creación: quedan al final de los listados
+FECHA_CREACION_DESCONOCIDA = datetime(1970, 1, 1)
+
+
+def migrar_esquema(engine):
+    """
+    Crea las tablas, columnas e índices faltantes en la base de datos.
+
+    Las columnas nuevas se agregan con `ALTER TABLE ... ADD COLUMN`, por lo que
+    deben admitir nulos (las filas existentes quedan con NULL).
+
+    Antes de crear el índice único de adherencias se eliminan las adhesiones
+    duplicadas (conservando la más antigua), ya que de lo contrario la
+    creación del índice fallaría en una base con datos previos.
+
+    Los reclamos sin `fecha_creacion` reciben `FECHA_CREACION_DESCONOCIDA`, ya que la
+    paginación por cursor los omitiría. En las bases nuevas la columna se crea NOT NULL;
+    SQLite no permite agregar la restricción a una tabla existente, por lo que en esas
+    bases la garantiza esta migración junto con el repositorio, que siempre asigna la fecha.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): El motor de la base de datos a migrar.
+    """
+    Base.metadata.create_all(engine)
+    with engine.begin() as conexion:
+        _agregar_columnas_faltantes(conexion)
+        # La paginación por cursor ordena por (fecha_creacion, id): no admite fechas nulas
+        conexion.execute(update(ModeloReclamo.__table__)
+                         .where(ModeloReclamo.fecha_creacion.is_(None))
+                         .values(fecha_creacion=FECHA_CREACION_DESCONOCIDA))
+        conexion.execute(text(
+            f"DELETE FROM {Adherencia.__tablename__} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {Adherencia.__tablename__} GROUP BY id_usuario, id_reclamo)"
+        ))
+        for tabla in Base.metadata.sorted_tables:
+            for indice in tabla.indexes:
+                conexion.execute(CreateIndex(indice, if_not_exists=True))
+        if conexion.dialect.name == "sqlite":
+            _crear_busqueda_texto(conexion)
+
+
+def _agregar_columnas_faltantes(conexion):
+    """Agrega a las tablas existentes las columnas declaradas en los modelos que les faltan."""
+    inspector = inspect(conexion)
+    for tabla in Base.metadata.sorted_tables:
+        existentes = {columna["name"] for columna in inspector.get_columns(tabla.name)}
+        for columna in tabla.columns:
+            if columna.name not in existentes:
+                tipo = columna.type.compile(dialect=conexion.dialect)
+                conexion.execute(text(f"ALTER TABLE {tabla.name} ADD COLUMN {columna.name} {tipo}"))
+
+
+def _crear_busqueda_texto(conexion):
+    """
+    Crea la tabla FTS5 de descripciones de reclamos y sus triggers de sincronización.
+
+    La primera vez, la tabla se llena con los reclamos existentes ('rebuild').
+    Las letras se comparan sin tildes ni mayúsculas ("baño" encuentra "BANO").
+    """
+    fts, reclamos = TABLA_BUSQUEDA_RECLAMOS, ModeloReclamo.__tablename__
+    existe = conexion.execute(text("SELECT 1 FROM sqlite_master WHERE name = :nombre"),
+                              {"nombre": fts}).first()
+    conexion.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(descripcion, content='{reclamos}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    ))
+    conexion.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {reclamos} BEGIN "
+        f"INSERT INTO {fts}(rowid, descripcion) VALUES (new.id, new.descripcion); END"
+    ))
+    conexion.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {reclamos} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, descripcion) VALUES ('delete', old.id, old.descripcion); END"
+    ))
+    conexion.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF descripcion ON {reclamos} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, descripcion) VALUES ('delete', old.id, old.descripcion); "
+        f"INSERT INTO {fts}(rowid, descripcion) VALUES (new.id, new.descripcion); END"
+    ))
+    if not existe:
+        conexion.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+if __name__ == "__main__":
+    from modules.config import URL_BD
+    migrar_esquema(create_engine(URL_BD))
+    print(f"Esquema migrado: {URL_BD}")
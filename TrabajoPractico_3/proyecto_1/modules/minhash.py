@@ -0,0 +1,194 @@
+"""
+Detección de reclamos casi duplicados con MinHash y LSH.
+
+Un reclamo se representa por el conjunto de raíces de su descripción (con el mismo
+preprocesamiento que `TextVectorizer`). La similitud de Jaccard entre dos conjuntos
+se estima con una firma MinHash: para cada una de `NUM_PERMUTACIONES` funciones de
+hash se guarda el mínimo hash de los elementos del conjunto, y la fracción de
+posiciones en que dos firmas coinciden estima su similitud de Jaccard.
+
+La firma se calcula una sola vez, al crear el reclamo, y se guarda con él
+(columna `minhash`, ver `firma_a_bytes`). Para no comparar cada reclamo nuevo con
+todos los existentes, `IndiceLSH` divide la firma en `bandas` de `filas` valores y
+agrupa los reclamos por el contenido de cada banda: solo son candidatos los
+reclamos que coinciden por completo en al menos una banda, lo que se consulta con
+un acceso a diccionario por banda (O(1) esperado). Con 32 bandas de 4 filas, dos
+reclamos con similitud 0.5 son candidatos con probabilidad ~0.87 y con similitud
+0.2, ~0.05.
+
+Las funciones de hash son deterministas (no dependen de `PYTHONHASHSEED`) para que
+las firmas guardadas en la base de datos sigan siendo válidas entre ejecuciones.
+"""
+import hashlib
+import random
+from array import array
+from modules.recursos_nlp import STOP_WORDS_ES
+from modules.text_vectorizer import preprocesar_texto
+
+NUM_PERMUTACIONES = 128
+BANDAS = 32
+# Similitud de Jaccard estimada mínima para considerar duplicado a un reclamo
+UMBRAL_DUPLICADO = 0.5
+
+_PRIMO = (1 << 61) - 1
+# Firma de un texto sin raíces (ej. solo stopwords): no se indexa ni se compara
+FIRMA_VACIA = ((1 << 64) - 1,) * NUM_PERMUTACIONES
+# Coeficientes fijos de las permutaciones h(x) = (a*x + b) mod p
+_aleatorio = random.Random(20240611)
+_COEFICIENTES = [(_aleatorio.randrange(1, _PRIMO), _aleatorio.randrange(0, _PRIMO))
+                 for _ in range(NUM_PERMUTACIONES)]
+
+
+def _hash_base(elemento):
+    """Hash de 64 bits de un elemento, estable entre procesos."""
+    return int.from_bytes(hashlib.blake2b(elemento.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def calcular_firma(texto, tokenizador="punkt"):
+    """
+    Calcula la firma MinHash de un texto.
+
+    Args:
+        texto (str): La descripción del reclamo.
+        tokenizador (str): "punkt" o "regex" (ver `TextVectorizer`).
+
+    Returns:
+        tuple[int]: La firma, con `NUM_PERMUTACIONES` valores (`FIRMA_VACIA` si el
+                    texto no tiene raíces).
+    """
+    elementos = {_hash_base(raiz) for raiz in preprocesar_texto(texto, tokenizador, STOP_WORDS_ES).split()}
+    if not elementos:
+        return FIRMA_VACIA
+    return tuple(min((a * x + b) % _PRIMO for x in elementos) for a, b in _COEFICIENTES)
+
+
+def similitud_estimada(firma_a, firma_b):
+    """
+    Estima la similitud de Jaccard de dos textos a partir de sus firmas.
+
+    Returns:
+        float: La fracción de posiciones en que coinciden las firmas (entre 0 y 1).
+    """
+    return sum(1 for a, b in zip(firma_a, firma_b) if a == b) / len(firma_a)
+
+
+def firma_a_bytes(firma):
+    """Serializa una firma para guardarla en la base de datos (8 bytes por valor)."""
+    return array('Q', firma).tobytes()
+
+
+def firma_desde_bytes(datos):
+    """
+    Recupera una firma serializada con `firma_a_bytes`.
+
+    Raises:
+        ValueError: Si los datos no corresponden a una firma de `NUM_PERMUTACIONES` valores.
+    """
+    valores = array('Q')
+    valores.frombytes(datos)
+    if len(valores) != NUM_PERMUTACIONES:
+        raise ValueError("La firma MinHash guardada no tiene la cantidad de valores esperada")
+    return tuple(valores)
+
+
+class IndiceLSH:
+    """
+    Índice LSH (locality-sensitive hashing) de firmas MinHash.
+
+    No es seguro para usar desde varios hilos a la vez: quien lo comparta debe
+    protegerlo con un lock (como hace `GestorDeReclamos`).
+
+    Atributos:
+        bandas (int): Cantidad de bandas en que se divide cada firma.
+        filas (int): Valores de la firma por banda.
+        __buckets (list[dict[tuple, set[int]]]): Por banda, contenido de la banda -> IDs.
+        __firmas (dict[int, tuple]): ID -> firma de cada reclamo indexado.
+    """
+    def __init__(self, bandas=BANDAS, num_permutaciones=NUM_PERMUTACIONES):
+        """
+        Args:
+            bandas (int): Cantidad de bandas. Debe dividir a `num_permutaciones`.
+            num_permutaciones (int): Largo de las firmas.
+
+        Raises:
+            ValueError: Si la cantidad de bandas no divide al largo de las firmas.
+        """
+        if bandas < 1 or num_permutaciones % bandas:
+            raise ValueError("La cantidad de bandas debe dividir al largo de las firmas")
+        self.bandas = bandas
+        self.filas = num_permutaciones // bandas
+        self.__buckets = [{} for _ in range(bandas)]
+        self.__firmas = {}
+
+    def __len__(self):
+        return len(self.__firmas)
+
+    def __contains__(self, id_reclamo):
+        return id_reclamo in self.__firmas
+
+    def agregar(self, id_reclamo, firma):
+        """
+        Indexa la firma de un reclamo. Si ya estaba indexado, se reemplaza.
+        Las firmas vacías (`FIRMA_VACIA`) no se indexan.
+
+        Args:
+            id_reclamo (int): El ID del reclamo.
+            firma (tuple[int]): Su firma MinHash.
+        """
+        if id_reclamo in self.__firmas:
+            self.eliminar(id_reclamo)
+        if firma == FIRMA_VACIA:
+            return
+        self.__firmas[id_reclamo] = firma
+        for buckets, banda in zip(self.__buckets, self.__bandas(firma)):
+            buckets.setdefault(banda, set()).add(id_reclamo)
+
+    def eliminar(self, id_reclamo):
+        """Quita un reclamo del índice. No hace nada si no estaba indexado."""
+        firma = self.__firmas.pop(id_reclamo, None)
+        if firma is None:
+            return
+        for buckets, banda in zip(self.__buckets, self.__bandas(firma)):
+            ids = buckets[banda]
+            ids.discard(id_reclamo)
+            if not ids:
+                del buckets[banda]
+
+    def candidatos(self, firma):
+        """
+        Devuelve los reclamos que coinciden con la firma en al menos una banda.
+
+        Returns:
+            set[int]: Los IDs candidatos.
+        """
+        encontrados = set()
+        if firma == FIRMA_VACIA:
+            return encontrados
+        for buckets, banda in zip(self.__buckets, self.__bandas(firma)):
+            encontrados.update(buckets.get(banda, ()))
+        return encontrados
+
+    def buscar_duplicados(self, firma, umbral=UMBRAL_DUPLICADO):
+        """
+        Busca los reclamos casi duplicados de una firma.
+
+        Los candidatos del LSH se confirman con la similitud estimada de sus firmas.
+
+        Args:
+            firma (tuple[int]): La firma del texto a buscar.
+            umbral (float): La similitud de Jaccard estimada mínima.
+
+        Returns:
+            list[tuple[int, float]]: (ID, similitud) de los duplicados, de mayor a menor
+                                     similitud (a igual similitud, el más antiguo primero).
+        """
+        resultados = []
+        for id_reclamo in self.candidatos(firma):
+            similitud = similitud_estimada(firma, self.__firmas[id_reclamo])
+            if similitud >= umbral:
+                resultados.append((id_reclamo, similitud))
+        return sorted(resultados, key=lambda resultado: (-resultado[1], resultado[0]))
+
+    def __bandas(self, firma):
+        """Divide una firma en sus bandas."""
+        return [tuple(firma[i:i + self.filas]) for i in range(0, self.bandas * self.filas, self.filas)]
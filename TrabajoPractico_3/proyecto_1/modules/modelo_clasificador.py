@@ -0,0 +1,232 @@
+"""
+Artefacto del modelo de clasificación de reclamos.
+
+El modelo entrenado se guarda en un único archivo versionado (`RUTA_MODELO`) que
+contiene todo lo necesario para clasificar sin volver a leer los datos de entrenamiento:
+
+- "version": la versión del formato del artefacto (`VERSION_FORMATO`).
+- "pipeline": el pipeline de scikit-learn (vectorizador, escalador y clasificador),
+  que predice el índice de la clase.
+- "clases": los nombres de los departamentos, en el orden de esos índices.
+- "metadatos": fecha de entrenamiento, versión de scikit-learn, cantidad de ejemplos, etc.
+
+El artefacto lo escribe `modules/create_save_clf.py`. La aplicación lo carga con
+`ModeloClasificador`, que recién lee el archivo la primera vez que se clasifica un
+reclamo, de modo que los workers web arrancan sin cargar el modelo.
+
+`ModeloClasificador` guarda además las últimas predicciones en una caché LRU acotada.
+La clave es el texto normalizado con el mismo preprocesamiento del vectorizador del
+modelo (minúsculas, sin stopwords ni puntuación, raíces) y con las raíces ordenadas:
+como el modelo solo ve la bolsa de palabras, dos reclamos con la misma clave producen
+el mismo vector y, por lo tanto, la misma predicción. Así, reclamos repetidos como
+"no anda el wifi" / "No anda el WiFi." no vuelven a pasar por el modelo.
+"""
+import pickle
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+import sklearn
+from modules.text_vectorizer import preprocesar_texto
+
+VERSION_FORMATO = 1
+RUTA_MODELO = './data/modelo_reclamos.pkl'
+# Cantidad de predicciones que recuerda cada ModeloClasificador (0 desactiva la caché)
+TAMANO_CACHE_POR_DEFECTO = 1024
+
+
+def guardar_modelo(ruta, pipeline, clases, **metadatos):
+    """
+    Guarda el modelo entrenado como artefacto versionado.
+
+    Args:
+        ruta (str): El archivo de destino.
+        pipeline: Un estimador de scikit-learn entrenado cuyo `predict` devuelve
+                  índices de `clases`.
+        clases (iterable[str]): Los nombres de las clases, en el orden de los índices.
+        **metadatos: Información adicional a guardar (ej. cantidad de ejemplos).
+    """
+    artefacto = {
+        "version": VERSION_FORMATO,
+        "pipeline": pipeline,
+        "clases": tuple(str(clase) for clase in clases),
+        "metadatos": {
+            "fecha_entrenamiento": datetime.now().isoformat(timespec='seconds'),
+            "version_sklearn": sklearn.__version__,
+            **metadatos,
+        },
+    }
+    with open(ruta, 'wb') as archivo:
+        pickle.dump(artefacto, archivo)
+
+
+def cargar_modelo(ruta):
+    """
+    Lee un artefacto guardado con `guardar_modelo`.
+
+    Args:
+        ruta (str): El archivo a leer.
+
+    Returns:
+        dict: El artefacto, con las claves "version", "pipeline", "clases" y "metadatos".
+
+    Raises:
+        ValueError: Si el archivo no es un artefacto del modelo o su versión no es soportada.
+    """
+    with open(ruta, 'rb') as archivo:
+        artefacto = pickle.load(archivo)
+    if not isinstance(artefacto, dict) or "version" not in artefacto:
+        raise ValueError(f"'{ruta}' no es un artefacto del modelo de reclamos")
+    if artefacto["version"] != VERSION_FORMATO:
+        raise ValueError(f"Versión de artefacto no soportada: {artefacto['version']} "
+                         f"(se esperaba {VERSION_FORMATO})")
+    return artefacto
+
+
+class ModeloClasificador:
+    """
+    Clasificador de reclamos que carga el artefacto del modelo de forma diferida.
+
+    El archivo se lee una única vez, en la primera llamada a `predict` (o al acceder
+    a `clases`/`metadatos`); las llamadas concurrentes esperan a esa única carga.
+    Las predicciones se guardan en una caché LRU que se vacía al cargar otro modelo.
+
+    Atributos:
+        ruta (str): El archivo del artefacto.
+        tamano_cache (int): Cantidad máxima de predicciones en la caché.
+        __artefacto (dict): El artefacto cargado, o None si todavía no se cargó.
+        __lock (Lock): Protege la carga del artefacto y la caché.
+        __cache (OrderedDict): Texto normalizado -> departamento, del menos al más usado.
+        __aciertos, __fallos (int): Contadores de consultas a la caché.
+    """
+    def __init__(self, ruta=RUTA_MODELO, tamano_cache=TAMANO_CACHE_POR_DEFECTO):
+        """
+        Args:
+            ruta (str): El archivo del artefacto. No se lee hasta que se necesita.
+            tamano_cache (int): Cantidad máxima de predicciones a recordar (0 la desactiva).
+
+        Raises:
+            ValueError: Si el tamaño de la caché es negativo.
+        """
+        if tamano_cache < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo")
+        self.ruta = ruta
+        self.tamano_cache = tamano_cache
+        self.__artefacto = None
+        self.__lock = Lock()
+        self.__cache = OrderedDict()
+        self.__aciertos = 0
+        self.__fallos = 0
+
+    @property
+    def cargado(self):
+        """Indica si el artefacto ya fue leído."""
+        return self.__artefacto is not None
+
+    @property
+    def clases(self):
+        """Los nombres de las clases que puede predecir el modelo."""
+        return self.__obtener_artefacto()["clases"]
+
+    @property
+    def metadatos(self):
+        """Los metadatos guardados junto con el modelo."""
+        return self.__obtener_artefacto()["metadatos"]
+
+    @property
+    def estadisticas_cache(self):
+        """
+        Devuelve el estado de la caché de predicciones.
+
+        Returns:
+            dict: "aciertos", "fallos", "tamano" (predicciones guardadas) y "capacidad".
+        """
+        with self.__lock:
+            return {"aciertos": self.__aciertos, "fallos": self.__fallos,
+                    "tamano": len(self.__cache), "capacidad": self.tamano_cache}
+
+    def recargar(self):
+        """Vuelve a leer el artefacto (ej. tras reentrenar el modelo) y vacía la caché."""
+        artefacto = cargar_modelo(self.ruta)
+        with self.__lock:
+            self.__artefacto = artefacto
+            self.__cache.clear()
+            self.__aciertos = 0
+            self.__fallos = 0
+
+    def predict(self, X):
+        """
+        Clasifica reclamos, usando la caché para los que ya se clasificaron.
+
+        Los reclamos que no están en la caché se clasifican juntos, en una sola
+        llamada al pipeline.
+
+        Args:
+            X (list[str]): Los textos de los reclamos.
+
+        Returns:
+            list[str]: El departamento predicho para cada reclamo.
+        """
+        artefacto = self.__obtener_artefacto()
+        textos = list(X)
+        if self.tamano_cache == 0:
+            return self.__predecir(artefacto, textos)
+
+        claves = [self.__normalizar(artefacto, texto) for texto in textos]
+        resultados = [None] * len(textos)
+        pendientes = {}  # clave -> posiciones de los textos a clasificar
+        with self.__lock:
+            for posicion, clave in enumerate(claves):
+                if clave in self.__cache:
+                    self.__cache.move_to_end(clave)
+                    resultados[posicion] = self.__cache[clave]
+                    self.__aciertos += 1
+                else:
+                    pendientes.setdefault(clave, []).append(posicion)
+                    self.__fallos += 1
+
+        if pendientes:
+            # Un solo texto por clave: todos los de la misma clave tienen la misma predicción
+            predicciones = self.__predecir(artefacto, [textos[posiciones[0]] for posiciones in pendientes.values()])
+            with self.__lock:
+                # Si mientras tanto se cargó otro modelo, no se guardan predicciones del anterior
+                guardar = self.__artefacto is artefacto
+                for (clave, posiciones), departamento in zip(pendientes.items(), predicciones):
+                    for posicion in posiciones:
+                        resultados[posicion] = departamento
+                    if guardar:
+                        self.__cache[clave] = departamento
+                        self.__cache.move_to_end(clave)
+                while len(self.__cache) > self.tamano_cache:
+                    self.__cache.popitem(last=False)
+        return resultados
+
+    def clasificar(self, X):
+        """Alias de `predict`, con la misma interfaz que `ClaimsClassifier.clasificar`."""
+        return self.predict(X)
+
+    @staticmethod
+    def __predecir(artefacto, textos):
+        """Clasifica los textos con el pipeline del artefacto y traduce los índices a clases."""
+        clases = artefacto["clases"]
+        return [clases[indice] for indice in artefacto["pipeline"].predict(textos)]
+
+    @staticmethod
+    def __normalizar(artefacto, texto):
+        """
+        Calcula la clave de caché de un texto: sus raíces ordenadas, con el mismo
+        preprocesamiento que el vectorizador del modelo. Si el pipeline no tiene un
+        paso "vectorizer", la clave es el texto sin espacios sobrantes.
+        """
+        vectorizador = getattr(artefacto["pipeline"], "named_steps", {}).get("vectorizer")
+        if vectorizador is None:
+            return " ".join(texto.split())
+        raices = preprocesar_texto(texto, vectorizador.tokenizador, vectorizador.stop_words).split()
+        return " ".join(sorted(raices))
+
+    def __obtener_artefacto(self):
+        """Carga el artefacto la primera vez que se lo necesita."""
+        if self.__artefacto is None:
+            with self.__lock:
+                if self.__artefacto is None:
+                    self.__artefacto = cargar_modelo(self.ruta)
+        return self.__artefacto
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table, Index, LargeBinary, func
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 Base=declarative_base()
 
+# Tabla virtual FTS5 con las descripciones de los reclamos (la crea `modules.migraciones`)
+TABLA_BUSQUEDA_RECLAMOS = 'reclamos_fts'
+
 class ModeloReclamo(Base):
     """
     Representa el modelo de la tabla 'reclamos' en la base de datos.
@@ -15,20 +18,33 @@ class ModeloReclamo(Base):
         descripcion (String): Texto del reclamo. No puede ser nulo.
         estado (String): Estado del reclamo (ej. "pendiente", "resuelto"). Valor por defecto "pendiente".
         departamento (String): Departamento asignado al reclamo. No puede ser nulo.
-        fecha_creacion (DateTime): Fecha y hora de creación. Valor por defecto la hora UTC actual.
+        fecha_creacion (DateTime): Fecha y hora de creación. Valor por defecto la hora UTC actual. No puede ser nulo.
         fecha_resolucion (DateTime): Fecha y hora de resolución. Puede ser nulo.
         id_usuario (Integer): Clave foránea que referencia el ID del usuario creador en la tabla 'usuarios'.
         foto (String): Ruta del archivo de la foto adjunta. Puede ser nulo.
+        minhash (LargeBinary): Firma MinHash de la descripción, para detectar reclamos
+            casi duplicados (ver `modules.minhash`). Puede ser nulo.
+
+    Índices:
+        ix_reclamos_departamento_estado: (lower(departamento), estado). Se indexa la expresión
+            en minúsculas porque es la que usa el repositorio al filtrar por departamento.
+        ix_reclamos_id_usuario: (id_usuario), para los reclamos de un usuario.
+        ix_reclamos_fecha_creacion: (fecha_creacion), para los listados ordenados por fecha.
     """
     __tablename__= 'reclamos'
+    __table_args__= (
+        Index('ix_reclamos_id_usuario', 'id_usuario'),
+        Index('ix_reclamos_fecha_creacion', 'fecha_creacion'),
+    )
     id= Column(Integer, primary_key=True)
     descripcion= Column(String(1000), nullable=False)
     estado= Column(String(50), default="pendiente") #El estado. Puede ser Pendiente, o Resuelto
     departamento= Column(String(100), nullable=False)
-    fecha_creacion= Column(DateTime, default=datetime.utcnow)
+    fecha_creacion= Column(DateTime, nullable=False, default=datetime.utcnow)
     fecha_resolucion= Column(DateTime, nullable=True)    
     id_usuario= Column(Integer, ForeignKey('usuarios.id')) #Reclamo ligado a usuario
     foto = Column(String(255), nullable=True)
+    minhash = Column(LargeBinary, nullable=True)
 
 
     def calcular_tiempo_resolucion(self):
@@ -46,6 +62,9 @@ class ModeloReclamo(Base):
         else:
             return None
 
+# Índice sobre una expresión: se declara fuera de la clase porque necesita las columnas ya definidas.
+Index('ix_reclamos_departamento_estado', func.lower(ModeloReclamo.departamento), ModeloReclamo.estado)
+
 class ModeloUsuario(Base):
     """
     Representa el modelo de la tabla 'usuarios' en la base de datos.
@@ -100,12 +119,17 @@ class Adherencia(Base):
         id (Integer): Clave primaria, autoincremental.
         id_usuario (Integer): Clave foránea que referencia el ID del usuario adherido.
         id_reclamo (Integer): Clave foránea que referencia el ID del reclamo al que se adhiere.
+
+    Índices:
+        ux_adherencias_usuario_reclamo: UNIQUE (id_usuario, id_reclamo). Un usuario solo
+            puede adherirse una vez a cada reclamo.
+        ix_adherencias_id_reclamo: (id_reclamo), para contar los adherentes de un reclamo.
     """
     __tablename__= 'adherencias'   
+    __table_args__= (
+        Index('ux_adherencias_usuario_reclamo', 'id_usuario', 'id_reclamo', unique=True),
+        Index('ix_adherencias_id_reclamo', 'id_reclamo'),
+    )
     id=Column(Integer, primary_key=True)
     id_usuario=Column(Integer, ForeignKey("usuarios.id"))
     id_reclamo=Column(Integer, ForeignKey("reclamos.id"))
-
-    
-
-
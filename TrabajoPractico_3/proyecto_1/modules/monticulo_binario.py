@@ -9,7 +9,15 @@ Contiene las siguientes clases:
 - `MonticuloBinarioMin`: Implementa un min-heap.
 - `MonticuloBinarioMax`: Implementa un max-heap.
 - `MedianHeap`: Utiliza ambos montículos para mantener y calcular la mediana.
+- `MedianHeapEliminable`: Variante de `MedianHeap` que además permite eliminar valores
+  y, opcionalmente, calcular la mediana sobre una ventana de tiempo.
+- `ColaPrioridadIndexada`: Cola de prioridad de máximos sobre claves (ej. IDs de reclamos)
+  que permite cambiar la prioridad de una clave en O(log n).
 """
+import random
+from collections import Counter
+from datetime import datetime
+
 class MonticuloBinarioMin:
     """
     Implementación de un montículo binario de mínimos (Min-Heap).
@@ -100,6 +108,27 @@ class MonticuloBinarioMin:
         self.tamanoActual = self.tamanoActual + 1
         self.infiltArriba(self.tamanoActual)
 
+    def construir_desde_lista(self, iterable):
+        """
+        Reemplaza el contenido del montículo por los elementos de `iterable` en O(n).
+
+        En lugar de insertar uno por uno (O(n log n)), copia los elementos y aplica
+        `infiltAbajo` desde el último nodo con hijos hasta la raíz (heapify ascendente).
+
+        Args:
+            iterable (iterable[numeric]): Los valores con los que construir el montículo.
+
+        Raises:
+            ValueError: Si alguno de los valores es None.
+        """
+        valores = list(iterable)
+        if any(v is None for v in valores):
+            raise ValueError("No se puede insertar un None en el monticulo")
+        self.listaMonticulo = [0] + valores
+        self.tamanoActual = len(valores)
+        for i in range(self.tamanoActual // 2, 0, -1):
+            self.infiltAbajo(i)
+
     def eliminarMin(self):
         """
         Elimina y retorna el elemento mínimo (la raíz) del montículo.
@@ -214,6 +243,27 @@ class MonticuloBinarioMax:
         self.tamanoActual = self.tamanoActual + 1
         self.infiltArribaMax(self.tamanoActual)
 
+    def construir_desde_lista(self, iterable):
+        """
+        Reemplaza el contenido del montículo por los elementos de `iterable` en O(n).
+
+        En lugar de insertar uno por uno (O(n log n)), copia los elementos y aplica
+        `infiltAbajo` desde el último nodo con hijos hasta la raíz (heapify ascendente).
+
+        Args:
+            iterable (iterable[numeric]): Los valores con los que construir el montículo.
+
+        Raises:
+            ValueError: Si alguno de los valores es None.
+        """
+        valores = list(iterable)
+        if any(v is None for v in valores):
+            raise ValueError("No se puede insertar un None en el monticulo")
+        self.listaMonticulo = [0] + valores
+        self.tamanoActual = len(valores)
+        for i in range(self.tamanoActual // 2, 0, -1):
+            self.infiltAbajo(i)
+
     def eliminarMax(self):
         """
         Elimina y retorna el elemento máximo (la raíz) del montículo.
@@ -243,6 +293,58 @@ class MonticuloBinarioMax:
         return self.listaMonticulo[1:]
 
 
+def _seleccionar(valores, k):
+    """
+    Devuelve el k-ésimo menor valor de la lista (k empieza en 1) en O(n) esperado.
+
+    Quickselect con pivote aleatorio y partición en tres (menores, iguales, mayores),
+    de modo que los valores repetidos no degradan el rendimiento.
+
+    Args:
+        valores (list[numeric]): Los valores (no se modifica).
+        k (int): La posición buscada, entre 1 y len(valores).
+
+    Returns:
+        numeric: El valor que ocuparía la posición k si la lista estuviera ordenada.
+    """
+    while True:
+        pivote = random.choice(valores)
+        menores = [v for v in valores if v < pivote]
+        if k <= len(menores):
+            valores = menores
+            continue
+        iguales = sum(1 for v in valores if v == pivote)
+        if k <= len(menores) + iguales:
+            return pivote
+        k -= len(menores) + iguales
+        valores = [v for v in valores if v > pivote]
+
+
+def _partir_mitades(valores):
+    """
+    Reparte los valores en la mitad inferior y la superior en O(n) esperado.
+
+    Busca por selección (`_seleccionar`) el valor que separa ambas mitades; las copias de
+    ese pivote completan la mitad inferior y el resto va a la superior.
+
+    Args:
+        valores (list[numeric]): Los valores (al menos uno).
+
+    Returns:
+        tuple: (inferior, superior), con len(inferior) == (len(valores) + 1) // 2 y
+               todos los valores de `inferior` menores o iguales a los de `superior`.
+    """
+    tam_inferior = (len(valores) + 1) // 2
+    pivote = _seleccionar(valores, tam_inferior)
+    inferior = [v for v in valores if v < pivote]
+    superior = [v for v in valores if v > pivote]
+    copias_pivote = len(valores) - len(inferior) - len(superior)
+    faltantes = tam_inferior - len(inferior)
+    inferior.extend([pivote] * faltantes)
+    superior.extend([pivote] * (copias_pivote - faltantes))
+    return inferior, superior
+
+
 class MedianHeap:
     """
     Estructura de datos para calcular la mediana de un flujo de números de forma eficiente.
@@ -310,6 +412,33 @@ class MedianHeap:
             self.mediana = self.monticulo_min.listaMonticulo[1]  # La raíz siempre debe ser el menor de los mayores
 
 
+    def insertar_muchos(self, iterable):
+        """
+        Inserta un lote de valores reconstruyendo ambos montículos en O(n).
+
+        Junta los valores actuales con los nuevos, los reparte en la mitad inferior y la
+        superior (`_partir_mitades`) y construye cada montículo con `construir_desde_lista`. Conviene frente a
+        `insertar` cuando el lote es grande respecto de lo que ya contiene la estructura.
+
+        Args:
+            iterable (iterable[numeric]): Los valores a insertar.
+
+        Raises:
+            ValueError: Si alguno de los valores es None.
+        """
+        nuevos = list(iterable)
+        if any(v is None for v in nuevos):
+            raise ValueError("No se puede insertar un None en el monticulo")
+        if not nuevos:
+            return
+        inferior, superior = _partir_mitades(self.monticulo_max.mostrar() + self.monticulo_min.mostrar() + nuevos)
+        self.monticulo_max.construir_desde_lista(inferior)
+        self.monticulo_min.construir_desde_lista(superior)
+        if self.monticulo_max.tamanoActual > self.monticulo_min.tamanoActual:
+            self.mediana = self.monticulo_max.listaMonticulo[1]
+        else:
+            self.mediana = (self.monticulo_max.listaMonticulo[1] + self.monticulo_min.listaMonticulo[1]) / 2
+
     def obtener_mediana(self):
         """
         Retorna la mediana actual de los números insertados en el heap.
@@ -328,6 +457,390 @@ class MedianHeap:
         """Devuelve el número total de elementos en el montículo."""
         return self.monticulo_max.tamanoActual + self.monticulo_min.tamanoActual
 
+class MedianHeapEliminable:
+    """
+    Mediana de un conjunto de números que admite inserciones y eliminaciones en O(log n).
+
+    Usa la misma idea que `MedianHeap` (un Max-Heap con la mitad inferior y un Min-Heap con
+    la mitad superior), con eliminación perezosa: un valor eliminado no se busca dentro del
+    montículo, sino que se anota como pendiente y se descarta recién cuando llega a la raíz.
+    Los tamaños que se usan para equilibrar los montículos son los de los valores vigentes.
+
+    Opcionalmente puede limitarse a una ventana de tiempo (ej. "mediana de los últimos 30 días"):
+    cada valor se inserta con una marca de tiempo y `expirar` descarta los que quedaron afuera.
+
+    Atributos:
+        monticulo_max (MonticuloBinarioMax): Mitad inferior (incluye valores pendientes de eliminar).
+        monticulo_min (MonticuloBinarioMin): Mitad superior (incluye valores pendientes de eliminar).
+        ventana (timedelta or None): El ancho de la ventana de tiempo, o None para no expirar valores.
+    """
+    def __init__(self, ventana=None):
+        """
+        Inicializa una instancia vacía.
+
+        Args:
+            ventana (timedelta, opcional): Si se indica, solo se consideran los valores cuya
+                                           marca de tiempo esté dentro de la ventana.
+        """
+        self.monticulo_max = MonticuloBinarioMax()  # Mitad inferior
+        self.monticulo_min = MonticuloBinarioMin()  # Mitad superior
+        self.ventana = ventana
+        self.__tam_max = 0  # Valores vigentes en monticulo_max
+        self.__tam_min = 0  # Valores vigentes en monticulo_min
+        self.__vigentes = Counter()    # Multiconjunto de valores vigentes
+        self.__pendientes = Counter()  # Valores eliminados que siguen dentro de algún montículo
+        # Para la ventana de tiempo: montículo de (marca_tiempo, valor) y entradas ya eliminadas
+        self.__marcas = MonticuloBinarioMin()
+        self.__marcas_eliminadas = Counter()
+        self.__limite = None
+
+    @property
+    def size(self):
+        """Devuelve la cantidad de valores vigentes."""
+        return self.__tam_max + self.__tam_min
+
+    def insertar(self, valor, marca_tiempo=None):
+        """
+        Inserta un valor.
+
+        Args:
+            valor (numeric): El número a insertar.
+            marca_tiempo (datetime, opcional): El instante asociado al valor. Solo se usa
+                                               si hay ventana; por defecto, el instante actual.
+
+        Raises:
+            ValueError: Si se intenta insertar un valor None.
+        """
+        if valor is None:
+            raise ValueError("No se puede insertar un None en el monticulo")
+        if self.ventana is not None:
+            marca_tiempo = marca_tiempo or datetime.now()
+            if self.__limite is not None and marca_tiempo < self.__limite:
+                return  # Ya quedó fuera de la ventana
+            self.__marcas.insertar((marca_tiempo, valor))
+
+        if self.__tam_max == 0 or valor <= self.monticulo_max.listaMonticulo[1]:
+            self.monticulo_max.insertar(valor)
+            self.__tam_max += 1
+        else:
+            self.monticulo_min.insertar(valor)
+            self.__tam_min += 1
+        self.__vigentes[valor] += 1
+        self.__rebalancear()
+
+    def insertar_muchos(self, valores, marcas_tiempo=None):
+        """
+        Inserta un lote de valores reconstruyendo ambos montículos en O(n).
+
+        Como `MedianHeap.insertar_muchos`, pero a partir de los valores vigentes: los
+        pendientes de eliminar se descartan al reconstruir. Conviene frente a `insertar`
+        al cargar la estructura con todos los valores existentes.
+
+        Args:
+            valores (iterable[numeric]): Los números a insertar.
+            marcas_tiempo (iterable[datetime], opcional): La marca de cada valor, en el mismo
+                                                          orden. Solo se usan si hay ventana;
+                                                          por defecto, el instante actual.
+
+        Raises:
+            ValueError: Si alguno de los valores es None.
+        """
+        nuevos = list(valores)
+        if any(v is None for v in nuevos):
+            raise ValueError("No se puede insertar un None en el monticulo")
+        if self.ventana is not None:
+            ahora = datetime.now()
+            marcas = [m or ahora for m in marcas_tiempo] if marcas_tiempo is not None else [ahora] * len(nuevos)
+            entradas = [(m, v) for m, v in zip(marcas, nuevos) if self.__limite is None or m >= self.__limite]
+            nuevos = [v for _, v in entradas]
+            self.__marcas.construir_desde_lista(self.__marcas.mostrar() + entradas)
+        if not nuevos:
+            return
+        self.__vigentes.update(nuevos)
+        self.__pendientes = Counter()
+        inferior, superior = _partir_mitades(list(self.__vigentes.elements()))
+        self.monticulo_max.construir_desde_lista(inferior)
+        self.monticulo_min.construir_desde_lista(superior)
+        self.__tam_max, self.__tam_min = len(inferior), len(superior)
+
+    def eliminar(self, valor, marca_tiempo=None):
+        """
+        Elimina una ocurrencia de un valor.
+
+        Args:
+            valor (numeric): El número a eliminar.
+            marca_tiempo (datetime, opcional): La marca con la que se insertó el valor (solo con ventana).
+                                               Si el valor ya expiró, la eliminación se ignora.
+
+        Raises:
+            ValueError: Si el valor no está en la estructura.
+        """
+        if self.ventana is not None and marca_tiempo is not None:
+            if self.__limite is not None and marca_tiempo < self.__limite:
+                return  # Ya fue descartado por la ventana
+            self.__marcas_eliminadas[(marca_tiempo, valor)] += 1
+        self.__quitar(valor)
+
+    def expirar(self, ahora=None):
+        """
+        Descarta los valores cuya marca de tiempo quedó fuera de la ventana.
+
+        Args:
+            ahora (datetime, opcional): El instante de referencia. Por defecto, el actual.
+        """
+        if self.ventana is None:
+            return
+        self.__limite = (ahora or datetime.now()) - self.ventana
+        while self.__marcas.tamanoActual > 0 and self.__marcas.listaMonticulo[1][0] < self.__limite:
+            entrada = self.__marcas.eliminarMin()
+            if self.__marcas_eliminadas[entrada] > 0:
+                self.__marcas_eliminadas[entrada] -= 1  # Ya se había eliminado explícitamente
+                if self.__marcas_eliminadas[entrada] == 0:
+                    del self.__marcas_eliminadas[entrada]
+            else:
+                self.__quitar(entrada[1])
+
+    def obtener_mediana(self):
+        """
+        Retorna la mediana de los valores vigentes.
+
+        Raises:
+            ValueError: Si no hay elementos.
+        """
+        if self.size == 0:
+            raise ValueError("No hay suficientes elementos para calcular la mediana")
+        if self.__tam_max > self.__tam_min:
+            return self.monticulo_max.listaMonticulo[1]
+        return (self.monticulo_max.listaMonticulo[1] + self.monticulo_min.listaMonticulo[1]) / 2
+
+    def __quitar(self, valor):
+        """Marca un valor como eliminado y lo descarta si está en la raíz de su montículo."""
+        if self.__vigentes[valor] == 0:
+            raise ValueError(f"El valor {valor} no está en el monticulo")
+        self.__vigentes[valor] -= 1
+        if self.__vigentes[valor] == 0:
+            del self.__vigentes[valor]
+        self.__pendientes[valor] += 1
+        # Todos los valores de monticulo_max son <= su raíz <= todos los de monticulo_min,
+        # así que comparar con la raíz alcanza para saber en qué mitad está el valor.
+        if valor <= self.monticulo_max.listaMonticulo[1]:
+            self.__tam_max -= 1
+            self.__podar(self.monticulo_max, self.monticulo_max.eliminarMax)
+        else:
+            self.__tam_min -= 1
+            self.__podar(self.monticulo_min, self.monticulo_min.eliminarMin)
+        self.__rebalancear()
+
+    def __podar(self, monticulo, eliminar_raiz):
+        """Descarta de la raíz del montículo los valores pendientes de eliminación."""
+        while monticulo.tamanoActual > 0 and self.__pendientes[monticulo.listaMonticulo[1]] > 0:
+            valor = eliminar_raiz()
+            self.__pendientes[valor] -= 1
+            if self.__pendientes[valor] == 0:
+                del self.__pendientes[valor]
+
+    def __rebalancear(self):
+        """Mantiene tam_max == tam_min o tam_max == tam_min + 1 (contando solo valores vigentes)."""
+        if self.__tam_max > self.__tam_min + 1:
+            self.monticulo_min.insertar(self.monticulo_max.eliminarMax())
+            self.__tam_max -= 1
+            self.__tam_min += 1
+            self.__podar(self.monticulo_max, self.monticulo_max.eliminarMax)
+        elif self.__tam_min > self.__tam_max:
+            self.monticulo_max.insertar(self.monticulo_min.eliminarMin())
+            self.__tam_min -= 1
+            self.__tam_max += 1
+            self.__podar(self.monticulo_min, self.monticulo_min.eliminarMin)
+
+class ColaPrioridadIndexada:
+    """
+    Cola de prioridad de máximos indexada por clave.
+
+    Guarda claves (ej. IDs de reclamos) ordenadas por una prioridad arbitraria
+    (ej. cantidad de adherentes). Además del montículo, mantiene la posición de cada
+    clave dentro de él, por lo que cambiar la prioridad o quitar una clave cuesta
+    O(log n) sin recorrer la estructura. A igual prioridad sale primero la clave
+    insertada antes.
+
+    Atributos:
+        __claves (list): El montículo de claves; el índice 0 se ignora.
+        __posiciones (dict): {clave: índice en __claves}.
+        __prioridades (dict): {clave: (prioridad, orden de inserción)}.
+    """
+    def __init__(self):
+        """Inicializa una cola vacía."""
+        self.__claves = [None]
+        self.__posiciones = {}
+        self.__prioridades = {}
+        self.__contador = 0
+
+    def __len__(self):
+        return len(self.__claves) - 1
+
+    def __contains__(self, clave):
+        return clave in self.__posiciones
+
+    def insertar(self, clave, prioridad):
+        """
+        Agrega una clave con su prioridad.
+
+        Raises:
+            ValueError: Si la prioridad es None o la clave ya está en la cola.
+        """
+        if prioridad is None:
+            raise ValueError("No se puede insertar una prioridad None en la cola")
+        if clave in self.__posiciones:
+            raise ValueError(f"La clave {clave} ya está en la cola")
+        self.__prioridades[clave] = (prioridad, self.__siguiente_orden())
+        self.__claves.append(clave)
+        self.__posiciones[clave] = len(self)
+        self.__infiltArriba(len(self))
+
+    def construir(self, pares):
+        """
+        Reemplaza el contenido de la cola por los pares (clave, prioridad) en O(n).
+
+        Raises:
+            ValueError: Si alguna prioridad es None o hay claves repetidas.
+        """
+        self.__claves = [None]
+        self.__posiciones = {}
+        self.__prioridades = {}
+        for clave, prioridad in pares:
+            if prioridad is None:
+                raise ValueError("No se puede insertar una prioridad None en la cola")
+            if clave in self.__posiciones:
+                raise ValueError(f"La clave {clave} ya está en la cola")
+            self.__prioridades[clave] = (prioridad, self.__siguiente_orden())
+            self.__claves.append(clave)
+            self.__posiciones[clave] = len(self)
+        for i in range(len(self) // 2, 0, -1):
+            self.__infiltAbajo(i)
+
+    def prioridad(self, clave):
+        """
+        Devuelve la prioridad actual de una clave.
+
+        Raises:
+            ValueError: Si la clave no está en la cola.
+        """
+        self.__validar(clave)
+        return self.__prioridades[clave][0]
+
+    def actualizar_prioridad(self, clave, nueva):
+        """
+        Cambia la prioridad de una clave y la reubica en el montículo en O(log n).
+
+        Raises:
+            ValueError: Si la clave no está en la cola o la prioridad es None.
+        """
+        self.__validar(clave)
+        if nueva is None:
+            raise ValueError("No se puede insertar una prioridad None en la cola")
+        _, orden = self.__prioridades[clave]
+        self.__prioridades[clave] = (nueva, orden)
+        self.__infiltArriba(self.__posiciones[clave])
+        self.__infiltAbajo(self.__posiciones[clave])
+
+    def eliminar(self, clave):
+        """
+        Quita una clave de la cola en O(log n).
+
+        Raises:
+            ValueError: Si la clave no está en la cola.
+        """
+        self.__validar(clave)
+        i = self.__posiciones[clave]
+        self.__intercambiar(i, len(self))
+        self.__claves.pop()
+        del self.__posiciones[clave]
+        del self.__prioridades[clave]
+        if i <= len(self):
+            # La última clave ocupa el lugar de la eliminada: puede tener que subir o bajar
+            movida = self.__claves[i]
+            self.__infiltArriba(i)
+            self.__infiltAbajo(self.__posiciones[movida])
+
+    def tope(self):
+        """
+        Devuelve la clave de mayor prioridad sin quitarla.
+
+        Returns:
+            tuple: (clave, prioridad).
+
+        Raises:
+            ValueError: Si la cola está vacía.
+        """
+        if len(self) == 0:
+            raise ValueError("La cola de prioridad está vacía")
+        clave = self.__claves[1]
+        return clave, self.__prioridades[clave][0]
+
+    def primeros(self, k):
+        """
+        Devuelve las k claves de mayor prioridad, de mayor a menor, sin modificar la cola.
+
+        Recorre el montículo desde la raíz con un montículo auxiliar de candidatos,
+        por lo que cuesta O(k log k) en lugar de ordenar toda la cola.
+
+        Args:
+            k (int): La cantidad de claves a devolver.
+
+        Returns:
+            list[tuple]: Pares (clave, prioridad).
+        """
+        resultado = []
+        candidatos = MonticuloBinarioMin()
+        if len(self) > 0:
+            candidatos.insertar(self.__orden_candidato(1))
+        while candidatos.tamanoActual > 0 and len(resultado) < k:
+            *_, i = candidatos.eliminarMin()
+            clave = self.__claves[i]
+            resultado.append((clave, self.__prioridades[clave][0]))
+            for hijo in (2 * i, 2 * i + 1):
+                if hijo <= len(self):
+                    candidatos.insertar(self.__orden_candidato(hijo))
+        return resultado
+
+    def __orden_candidato(self, i):
+        """Tupla para ordenar en un Min-Heap: mayor prioridad e inserción más antigua primero."""
+        prioridad, orden = self.__prioridades[self.__claves[i]]
+        return (-prioridad, orden, i)
+
+    def __siguiente_orden(self):
+        self.__contador += 1
+        return self.__contador
+
+    def __validar(self, clave):
+        if clave not in self.__posiciones:
+            raise ValueError(f"La clave {clave} no está en la cola")
+
+    def __antes(self, i, j):
+        """Indica si la clave en la posición i debe estar por encima de la de la posición j."""
+        prioridad_i, orden_i = self.__prioridades[self.__claves[i]]
+        prioridad_j, orden_j = self.__prioridades[self.__claves[j]]
+        return prioridad_i > prioridad_j or (prioridad_i == prioridad_j and orden_i < orden_j)
+
+    def __intercambiar(self, i, j):
+        self.__claves[i], self.__claves[j] = self.__claves[j], self.__claves[i]
+        self.__posiciones[self.__claves[i]] = i
+        self.__posiciones[self.__claves[j]] = j
+
+    def __infiltArriba(self, i):
+        while i // 2 > 0 and self.__antes(i, i // 2):
+            self.__intercambiar(i, i // 2)
+            i //= 2
+
+    def __infiltAbajo(self, i):
+        while i * 2 <= len(self):
+            hijo = i * 2
+            if hijo + 1 <= len(self) and self.__antes(hijo + 1, hijo):
+                hijo += 1
+            if not self.__antes(hijo, i):
+                break
+            self.__intercambiar(i, hijo)
+            i = hijo
+
 if __name__=="__main__":
     """
     Bloque de prueba para la clase MedianHeap.
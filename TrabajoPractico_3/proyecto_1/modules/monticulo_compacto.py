@@ -0,0 +1,286 @@
+"""
+Montículos binarios compactos respaldados por `array.array`.
+
+Variantes de `MonticuloBinarioMin`, `MonticuloBinarioMax`, `MedianHeap` y
+`MedianHeapEliminable` (ver `modules.monticulo_binario`) pensadas para flujos grandes de tiempos de resolución:
+
+- Los valores se guardan como `double` contiguos en un `array('d')` (8 bytes por valor)
+  en lugar de una lista de objetos `int`/`float` de Python (8 bytes del puntero más el objeto).
+  El arreglo crece de forma amortizada al agregar elementos.
+- Los desplazamientos usan un "hueco": el valor que se infiltra se guarda aparte y los
+  padres/hijos se corren una posición, con una sola escritura por nivel en lugar del
+  intercambio de tres asignaciones.
+
+Mantienen la interfaz pública de las clases originales (`listaMonticulo` con el índice 0
+como marcador, `tamanoActual`, `insertar`, `eliminarMin`/`eliminarMax`, `mostrar`,
+`construir_desde_lista`), por lo que pueden usarse en su lugar. Los valores se devuelven
+como `float`.
+"""
+import sys
+from array import array
+from modules.monticulo_binario import MedianHeap, MedianHeapEliminable
+
+# Código de tipo de `array` para los valores (double de 8 bytes)
+TIPO_VALOR = 'd'
+
+
+def _a_arreglo(iterable):
+    """Convierte los valores a un arreglo con el marcador en el índice 0."""
+    valores = list(iterable)
+    if any(v is None for v in valores):
+        raise ValueError("No se puede insertar un None en el monticulo")
+    arreglo = array(TIPO_VALOR, [0])
+    arreglo.extend(valores)
+    return arreglo
+
+
+class MonticuloCompactoMin:
+    """
+    Min-Heap con los valores almacenados en un `array('d')`.
+
+    Atributos:
+        listaMonticulo (array): Arreglo que representa el montículo, donde el índice 0 se ignora.
+                                El elemento en el índice 1 es la raíz.
+        tamanoActual (int): El número actual de elementos en el montículo.
+    """
+    def __init__(self):
+        """Inicializa un montículo compacto de mínimos vacío."""
+        self.listaMonticulo = array(TIPO_VALOR, [0])
+        self.tamanoActual = 0
+
+    def infiltArriba(self, i):
+        """
+        Sube el elemento del índice `i` corriendo hacia abajo los padres mayores que él.
+
+        Args:
+            i (int): El índice del elemento a "infiltrar" hacia arriba.
+        """
+        lista = self.listaMonticulo
+        valor = lista[i]
+        while i > 1 and valor < lista[i // 2]:
+            lista[i] = lista[i // 2]
+            i //= 2
+        lista[i] = valor
+
+    def infiltAbajo(self, i):
+        """
+        Baja el elemento del índice `i` corriendo hacia arriba el hijo menor mientras sea menor que él.
+
+        Args:
+            i (int): El índice del elemento a "infiltrar" hacia abajo.
+        """
+        lista = self.listaMonticulo
+        tamano = self.tamanoActual
+        valor = lista[i]
+        while i * 2 <= tamano:
+            hijo = i * 2
+            if hijo < tamano and lista[hijo + 1] < lista[hijo]:
+                hijo += 1
+            if lista[hijo] >= valor:
+                break
+            lista[i] = lista[hijo]
+            i = hijo
+        lista[i] = valor
+
+    def insertar(self, k):
+        """
+        Inserta un nuevo elemento en el montículo de mínimos.
+
+        Args:
+            k (numeric): El valor numérico a insertar.
+
+        Raises:
+            ValueError: Si se intenta insertar un valor None.
+        """
+        if k is None:
+            raise ValueError("No se puede insertar un None en el monticulo")
+        self.listaMonticulo.append(k)
+        self.tamanoActual += 1
+        self.infiltArriba(self.tamanoActual)
+
+    def construir_desde_lista(self, iterable):
+        """
+        Reemplaza el contenido del montículo por los elementos de `iterable` en O(n).
+
+        Args:
+            iterable (iterable[numeric]): Los valores con los que construir el montículo.
+
+        Raises:
+            ValueError: Si alguno de los valores es None.
+        """
+        self.listaMonticulo = _a_arreglo(iterable)
+        self.tamanoActual = len(self.listaMonticulo) - 1
+        for i in range(self.tamanoActual // 2, 0, -1):
+            self.infiltAbajo(i)
+
+    def eliminarMin(self):
+        """
+        Elimina y retorna el elemento mínimo (la raíz) del montículo.
+
+        Returns:
+            float: El valor mínimo que fue eliminado.
+        """
+        valorSacado = self.listaMonticulo[1]
+        ultimo = self.listaMonticulo.pop()
+        self.tamanoActual -= 1
+        if self.tamanoActual > 0:
+            self.listaMonticulo[1] = ultimo
+            self.infiltAbajo(1)
+        return valorSacado
+
+    def mostrar(self):
+        """
+        Retorna una lista con los elementos del montículo (excluyendo el marcador inicial).
+
+        Returns:
+            list: Lista de los elementos en el montículo.
+        """
+        return self.listaMonticulo[1:].tolist()
+
+    def memoria_bytes(self):
+        """Devuelve los bytes que ocupa el arreglo del montículo (incluida la capacidad reservada)."""
+        return sys.getsizeof(self.listaMonticulo)
+
+
+class MonticuloCompactoMax:
+    """
+    Max-Heap con los valores almacenados en un `array('d')`.
+
+    Atributos:
+        listaMonticulo (array): Arreglo que representa el montículo, donde el índice 0 se ignora.
+                                El elemento en el índice 1 es la raíz.
+        tamanoActual (int): El número actual de elementos en el montículo.
+    """
+    def __init__(self):
+        """Inicializa un montículo compacto de máximos vacío."""
+        self.listaMonticulo = array(TIPO_VALOR, [0])
+        self.tamanoActual = 0
+
+    def infiltArribaMax(self, i):
+        """
+        Sube el elemento del índice `i` corriendo hacia abajo los padres menores que él.
+
+        Args:
+            i (int): El índice del elemento a "infiltrar" hacia arriba.
+        """
+        lista = self.listaMonticulo
+        valor = lista[i]
+        while i > 1 and valor > lista[i // 2]:
+            lista[i] = lista[i // 2]
+            i //= 2
+        lista[i] = valor
+
+    def infiltAbajo(self, i):
+        """
+        Baja el elemento del índice `i` corriendo hacia arriba el hijo mayor mientras sea mayor que él.
+
+        Args:
+            i (int): El índice del elemento a "infiltrar" hacia abajo.
+        """
+        lista = self.listaMonticulo
+        tamano = self.tamanoActual
+        valor = lista[i]
+        while i * 2 <= tamano:
+            hijo = i * 2
+            if hijo < tamano and lista[hijo + 1] > lista[hijo]:
+                hijo += 1
+            if lista[hijo] <= valor:
+                break
+            lista[i] = lista[hijo]
+            i = hijo
+        lista[i] = valor
+
+    def insertar(self, k):
+        """
+        Inserta un nuevo elemento en el montículo de máximos.
+
+        Args:
+            k (numeric): El valor numérico a insertar.
+
+        Raises:
+            ValueError: Si se intenta insertar un valor None.
+        """
+        if k is None:
+            raise ValueError("No se puede insertar un None en el monticulo")
+        self.listaMonticulo.append(k)
+        self.tamanoActual += 1
+        self.infiltArribaMax(self.tamanoActual)
+
+    def construir_desde_lista(self, iterable):
+        """
+        Reemplaza el contenido del montículo por los elementos de `iterable` en O(n).
+
+        Args:
+            iterable (iterable[numeric]): Los valores con los que construir el montículo.
+
+        Raises:
+            ValueError: Si alguno de los valores es None.
+        """
+        self.listaMonticulo = _a_arreglo(iterable)
+        self.tamanoActual = len(self.listaMonticulo) - 1
+        for i in range(self.tamanoActual // 2, 0, -1):
+            self.infiltAbajo(i)
+
+    def eliminarMax(self):
+        """
+        Elimina y retorna el elemento máximo (la raíz) del montículo.
+
+        Returns:
+            float: El valor máximo que fue eliminado.
+        """
+        valorSacado = self.listaMonticulo[1]
+        ultimo = self.listaMonticulo.pop()
+        self.tamanoActual -= 1
+        if self.tamanoActual > 0:
+            self.listaMonticulo[1] = ultimo
+            self.infiltAbajo(1)
+        return valorSacado
+
+    def mostrar(self):
+        """
+        Retorna una lista con los elementos del montículo (excluyendo el marcador inicial).
+
+        Returns:
+            list: Lista de los elementos en el montículo.
+        """
+        return self.listaMonticulo[1:].tolist()
+
+    def memoria_bytes(self):
+        """Devuelve los bytes que ocupa el arreglo del montículo (incluida la capacidad reservada)."""
+        return sys.getsizeof(self.listaMonticulo)
+
+
+class MedianHeapCompacto(MedianHeap):
+    """
+    `MedianHeap` que usa `MonticuloCompactoMax` y `MonticuloCompactoMin` como mitades.
+
+    La lógica de inserción, rebalanceo y cálculo de la mediana es la de `MedianHeap`.
+    """
+    def __init__(self):
+        """Inicializa una instancia vacía con montículos compactos."""
+        super().__init__()
+        self.monticulo_max = MonticuloCompactoMax()  # Mitad inferior
+        self.monticulo_min = MonticuloCompactoMin()  # Mitad superior
+
+    def memoria_bytes(self):
+        """Devuelve los bytes que ocupan los arreglos de ambos montículos."""
+        return self.monticulo_max.memoria_bytes() + self.monticulo_min.memoria_bytes()
+
+
+class MedianHeapEliminableCompacto(MedianHeapEliminable):
+    """
+    `MedianHeapEliminable` que usa `MonticuloCompactoMax` y `MonticuloCompactoMin` como mitades.
+
+    Es la variante que usan las estadísticas de reclamos cuando `MONTICULO_COMPACTO` está
+    activo (ver `modules.estadisticas`). Las marcas de la ventana de tiempo siguen en un
+    montículo de listas, ya que son tuplas (marca, valor).
+    """
+    def __init__(self, ventana=None):
+        """Inicializa una instancia vacía con montículos compactos."""
+        super().__init__(ventana)
+        self.monticulo_max = MonticuloCompactoMax()  # Mitad inferior
+        self.monticulo_min = MonticuloCompactoMin()  # Mitad superior
+
+    def memoria_bytes(self):
+        """Devuelve los bytes que ocupan los arreglos de ambos montículos."""
+        return self.monticulo_max.memoria_bytes() + self.monticulo_min.memoria_bytes()
@@ -0,0 +1,98 @@
+"""
+Perfil de rendimiento de SQLite.
+
+Con la configuración por defecto (journal en modo rollback), cada `commit()` de un
+reclamo o de una adhesión toma un bloqueo exclusivo de la base y los lectores esperan
+a que termine. `configurar_sqlite` registra un listener del evento "connect" del
+motor que, en cada conexión nueva del pool, ejecuta:
+
+- `journal_mode=WAL`: las escrituras van a un archivo de log aparte (`*.db-wal`), así
+  que los lectores no se bloquean con un escritor y el escritor no espera a los lectores.
+- `synchronous=NORMAL`: en modo WAL solo se sincroniza el disco en los checkpoints.
+  Ante un corte de energía se pueden perder las últimas transacciones confirmadas,
+  pero la base no se corrompe.
+- `cache_size`: páginas en memoria por conexión (en KiB).
+- `mmap_size`: lectura de la base con memoria mapeada (en bytes).
+- `temp_store=MEMORY`: tablas e índices temporales (ORDER BY, GROUP BY) en memoria.
+- `busy_timeout`: milisegundos que una conexión reintenta antes de fallar con
+  "database is locked" cuando otra está escribiendo.
+
+El modo WAL queda guardado en el archivo de la base; los demás valores son por conexión.
+Se activa desde `config.crear_engine` con `SQLITE_OPTIMIZADO` (ver `modules.config`).
+Con el perfil desactivado, `restaurar_journal_por_defecto` vuelve la base al journal en
+modo rollback; si no, una base que alguna vez usó el perfil seguiría en modo WAL.
+
+Benchmark (desde la raíz del proyecto):
+    python -m apps.benchmark_sqlite
+"""
+from sqlalchemy import event
+
+CACHE_KB_POR_DEFECTO = 64 * 1024
+MMAP_BYTES_POR_DEFECTO = 256 * 2**20
+ESPERA_MS_POR_DEFECTO = 5000
+
+
+def configurar_sqlite(engine, cache_kb=CACHE_KB_POR_DEFECTO, mmap_bytes=MMAP_BYTES_POR_DEFECTO,
+                      espera_ms=ESPERA_MS_POR_DEFECTO):
+    """
+    Aplica el perfil de rendimiento a cada conexión nueva del motor.
+
+    No hace nada si el motor no es de SQLite. En una base en memoria el modo WAL no
+    aplica (SQLite lo ignora); los demás pragmas sí.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): El motor a configurar, antes de abrir conexiones.
+        cache_kb (int): Tamaño de la caché de páginas de cada conexión, en KiB.
+        mmap_bytes (int): Bytes de la base que se leen con memoria mapeada (0 lo desactiva).
+        espera_ms (int): Milisegundos que se espera a que se libere un bloqueo.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA cache_size=-{int(cache_kb)}",
+        f"PRAGMA mmap_size={int(mmap_bytes)}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={int(espera_ms)}",
+    )
+
+    @event.listens_for(engine, "connect")
+    def aplicar_pragmas(conexion_dbapi, registro_conexion):
+        cursor = conexion_dbapi.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def restaurar_journal_por_defecto(engine):
+    """
+    Vuelve el journal de la base al modo rollback por defecto (`journal_mode=DELETE`).
+
+    Debe llamarse al crear el motor, antes de que haya otras conexiones abiertas: SQLite
+    solo puede salir del modo WAL si ninguna otra conexión está usando la base. No hace
+    nada si el motor no es de SQLite.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): El motor cuya base se restaura.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.connect() as conexion:
+        conexion.exec_driver_sql("PRAGMA journal_mode=DELETE")
+
+
+def obtener_pragmas(conexion):
+    """
+    Lee los valores actuales de los pragmas del perfil.
+
+    Args:
+        conexion (sqlalchemy.engine.Connection): Una conexión del motor.
+
+    Returns:
+        dict: Nombre del pragma -> valor.
+    """
+    nombres = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+    return {nombre: conexion.exec_driver_sql(f"PRAGMA {nombre}").scalar() for nombre in nombres}
@@ -0,0 +1,53 @@
+"""
+Recursos de procesamiento de lenguaje natural incluidos en el proyecto.
+
+La aplicación no descarga nada de NLTK al arrancar (ni en ningún otro momento):
+
+- Las stopwords en español (la misma lista de `nltk.corpus.stopwords`) se leen
+  una única vez, al importar el módulo, desde `modules/recursos/stopwords_es.txt`
+  y quedan en el frozenset `STOP_WORDS_ES`, compartido por todo el proceso.
+- `tokenizar_punkt` reproduce `nltk.word_tokenize` (separación en oraciones con
+  Punkt y luego en palabras con el tokenizador Treebank mejorado de NLTK) usando
+  un `PunktSentenceTokenizer` con sus parámetros por defecto, que no necesita los
+  modelos `punkt`/`punkt_tab`.
+"""
+import os
+from nltk.tokenize.destructive import NLTKWordTokenizer
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+DIRECTORIO_RECURSOS = os.path.join(os.path.dirname(__file__), 'recursos')
+ARCHIVO_STOP_WORDS_ES = os.path.join(DIRECTORIO_RECURSOS, 'stopwords_es.txt')
+
+
+def cargar_stop_words(ruta=ARCHIVO_STOP_WORDS_ES) -> frozenset:
+    """
+    Lee una lista de stopwords (una palabra por línea, en UTF-8).
+
+    Args:
+        ruta (str): El archivo a leer. Por defecto, las stopwords en español del proyecto.
+
+    Returns:
+        frozenset[str]: Las palabras, sin espacios ni líneas vacías.
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        return frozenset(linea.strip() for linea in archivo if linea.strip())
+
+
+STOP_WORDS_ES = cargar_stop_words()
+
+_tokenizador_oraciones = PunktSentenceTokenizer()
+_tokenizador_palabras = NLTKWordTokenizer()
+
+
+def tokenizar_punkt(texto: str) -> list:
+    """
+    Separa un texto en tokens (palabras y signos de puntuación), como `nltk.word_tokenize`.
+
+    Args:
+        texto (str): El texto a tokenizar.
+
+    Returns:
+        list[str]: Los tokens, en orden.
+    """
+    return [token for oracion in _tokenizador_oraciones.tokenize(texto)
+            for token in _tokenizador_palabras.tokenize(oracion)]
@@ -9,12 +9,14 @@ class Reporte(ABC):
     """
 
     @abstractmethod
-    def generar(self, departamento: str) -> Union[str, bytes]:
+    def generar(self, departamento: str, informar_etapa=None) -> Union[str, bytes]:
         """
         Genera el reporte completo en su formato específico.
 
         Args:
             departamento (str): El departamento para el cual se genera el reporte.
+            informar_etapa (callable, opcional): Se llama con el nombre de cada etapa
+                                                 (ver `modules.reporte_base`) al comenzarla.
 
         Returns:
             Union[str, bytes]: El contenido del reporte, ya sea como una cadena
@@ -1,21 +1,23 @@
 from datetime import datetime
 from flask import render_template
-from modules.reporte_base import ReporteBase
+from modules.reporte_base import ReporteBase, ETAPA_DATOS, ETAPA_RENDERIZADO, ETAPA_PDF
 from xhtml2pdf import pisa
 from io import BytesIO
 class ReporteHTML(ReporteBase):
     """
     Estrategia concreta para generar el reporte en formato HTML.
     """
-    def generar(self, departamento: str) -> str:
+    def generar(self, departamento: str, informar_etapa=None) -> str:
         """
         Genera el reporte renderizando una plantilla de Flask.
 
         Returns:
             str: Una cadena de texto con el contenido HTML del reporte.
         """
+        self._informar(informar_etapa, ETAPA_DATOS)
         reclamos, stats = self._obtener_datos(departamento)
         
+        self._informar(informar_etapa, ETAPA_RENDERIZADO)
         html_renderizado = render_template(
             'reporte.html',
             lista_reclamos=reclamos,
@@ -31,15 +33,17 @@ class ReportePDF(ReporteBase):
     """
     Estrategia concreta para generar el reporte en formato PDF.
     """
-    def generar(self, departamento: str) -> bytes:
+    def generar(self, departamento: str, informar_etapa=None) -> bytes:
         """
         Genera el reporte, lo renderiza como HTML y lo convierte a PDF.
 
         Returns:
             bytes: El contenido del archivo PDF en bytes.
         """
+        self._informar(informar_etapa, ETAPA_DATOS)
         reclamos, stats = self._obtener_datos(departamento)
 
+        self._informar(informar_etapa, ETAPA_RENDERIZADO)
         html_renderizado = render_template(
             'reporte.html',
             lista_reclamos=reclamos,
@@ -49,6 +53,7 @@ class ReportePDF(ReporteBase):
             is_pdf=True  # Flag para la plantilla, por si necesita URLs absolutas para las imágenes
         )
 
+        self._informar(informar_etapa, ETAPA_PDF)
         pdf_buffer = BytesIO()
         pisa_status = pisa.CreatePDF(
             BytesIO(html_renderizado.encode('UTF-8')),
@@ -68,4 +68,120 @@ class RepositorioAbstracto(ABC):
         Args:
             id: El identificador del registro a eliminar.
         """
-        raise NotImplementedError("Debe implementar el método 'eliminar_registro'")
\ No newline at end of file
+        raise NotImplementedError("Debe implementar el método 'eliminar_registro'")
+
+class RepositorioReclamosAbstracto(RepositorioAbstracto):
+    """
+    Repositorio abstracto de reclamos.
+
+    Además de las operaciones de `RepositorioAbstracto`, declara las consultas
+    propias de los reclamos que usa `GestorDeReclamos` (adhesiones y conteos), de
+    modo que cualquier implementación deba proveerlas y el repositorio de usuarios
+    no esté obligado a implementarlas.
+    """
+    @abstractmethod
+    def adherir_usuario_a_reclamo(self, id_usuario, id_reclamo):
+        """
+        Registra la adhesión de un usuario a un reclamo.
+
+        Args:
+            id_usuario (int): El ID del usuario que se adhiere.
+            id_reclamo (int): El ID del reclamo.
+
+        Raises:
+            ValueError: Si el usuario ya está adherido a ese reclamo.
+        """
+        raise NotImplementedError("Debe implementar el método 'adherir_usuario_a_reclamo'")
+
+    @abstractmethod
+    def contar_adherentes(self, id_reclamo) -> int:
+        """
+        Cuenta los usuarios adheridos a un reclamo.
+
+        Args:
+            id_reclamo (int): El ID del reclamo.
+
+        Returns:
+            int: La cantidad de adherentes.
+        """
+        raise NotImplementedError("Debe implementar el método 'contar_adherentes'")
+
+    @abstractmethod
+    def contar_adherentes_multiples(self, ids_reclamos) -> dict:
+        """
+        Cuenta los adherentes de varios reclamos a la vez.
+
+        Args:
+            ids_reclamos (iterable[int]): Los IDs de los reclamos.
+
+        Returns:
+            dict[int, int]: {id_reclamo: cantidad}, con 0 para los reclamos sin adherentes.
+        """
+        raise NotImplementedError("Debe implementar el método 'contar_adherentes_multiples'")
+
+    @abstractmethod
+    def obtener_registros_con_adherentes(self, **filtros) -> list:
+        """
+        Obtiene los reclamos que coinciden con los filtros junto con su cantidad de adherentes.
+
+        Args:
+            **filtros: Atributo -> valor buscado (el departamento, sin distinguir mayúsculas).
+
+        Returns:
+            list[Reclamo]: Los reclamos, con el atributo `adherentes` cargado.
+        """
+        raise NotImplementedError("Debe implementar el método 'obtener_registros_con_adherentes'")
+
+    @abstractmethod
+    def obtener_pagina(self, limite, cursor=None, **filtros) -> tuple:
+        """
+        Obtiene una página de reclamos, del más nuevo al más antiguo, usando paginación por cursor.
+
+        Args:
+            limite (int): La cantidad máxima de reclamos de la página.
+            cursor (str, opcional): El cursor devuelto por la página anterior (None para la primera).
+            **filtros: Atributo -> valor buscado.
+
+        Returns:
+            tuple: (list[Reclamo], str or None). Los reclamos, con el atributo `adherentes`
+                   cargado, y el cursor de la página siguiente (None si no hay más).
+
+        Raises:
+            ValueError: Si el cursor no tiene un formato válido.
+        """
+        raise NotImplementedError("Debe implementar el método 'obtener_pagina'")
+
+    @abstractmethod
+    def obtener_registros_por_ids(self, ids_reclamos) -> list:
+        """
+        Obtiene varios reclamos por sus IDs, conservando el orden recibido.
+
+        Args:
+            ids_reclamos (iterable[int]): Los IDs de los reclamos.
+
+        Returns:
+            list[Reclamo]: Los reclamos encontrados, en el mismo orden que `ids_reclamos`.
+                           Los IDs inexistentes se omiten.
+        """
+        raise NotImplementedError("Debe implementar el método 'obtener_registros_por_ids'")
+
+    @abstractmethod
+    def buscar_texto(self, consulta, departamento=None, estado=None, limite=50, cursor=None) -> tuple:
+        """
+        Busca reclamos por el texto de su descripción, ordenados por relevancia.
+
+        Args:
+            consulta (str): El texto a buscar.
+            departamento (str, opcional): Filtra por departamento (sin distinguir mayúsculas).
+            estado (str, opcional): Filtra por estado.
+            limite (int): La cantidad máxima de reclamos de la página.
+            cursor (str, opcional): El cursor devuelto por la página anterior (None para la primera).
+
+        Returns:
+            tuple: (list[Reclamo], str or None). Los reclamos, con el atributo `adherentes`
+                   cargado, y el cursor de la página siguiente (None si no hay más).
+
+        Raises:
+            ValueError: Si el cursor no tiene un formato válido.
+        """
+        raise NotImplementedError("Debe implementar el método 'buscar_texto'")
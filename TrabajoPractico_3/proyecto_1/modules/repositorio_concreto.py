@@ -1,13 +1,18 @@
-from modules.repositorio_abstracto import RepositorioAbstracto
-from modules.modelos import ModeloReclamo, ModeloUsuario, Adherencia
+from modules.repositorio_abstracto import RepositorioAbstracto, RepositorioReclamosAbstracto
+from modules.modelos import ModeloReclamo, ModeloUsuario, Adherencia, TABLA_BUSQUEDA_RECLAMOS
 from modules.dominio import Reclamo, Usuario
 from datetime import datetime
-from sqlalchemy import func 
+import re
+from sqlalchemy import func, and_, or_, text
+from sqlalchemy.exc import IntegrityError
 
+TAMANO_LOTE_IN = 500
+_PATRON_PALABRAS = re.compile(r"\w+")
 
-class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
+
+class RepositorioReclamosSQLAlchemy(RepositorioReclamosAbstracto):
     """
-    Implementación concreta del RepositorioAbstracto para la entidad Reclamo,
+    Implementación concreta del RepositorioReclamosAbstracto para la entidad Reclamo,
     utilizando SQLAlchemy para la persistencia en una base de datos relacional.
 
     Esta clase maneja las operaciones de guardar, obtener, modificar y eliminar
@@ -23,7 +28,8 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         Inicializa el repositorio de reclamos con una sesión de SQLAlchemy.
 
         Args:
-            session (sqlalchemy.orm.session.Session): La sesión de base de datos de SQLAlchemy.
+            session (sqlalchemy.orm.session.Session): La sesión de base de datos de SQLAlchemy,
+                o un `scoped_session` que da a cada hilo su propia sesión (ver `config.crear_engine`).
         """
         self.__session= session
         ModeloReclamo.metadata.create_all(self.__session.bind)
@@ -33,7 +39,7 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         Guarda un nuevo objeto Reclamo en la base de datos.
 
         Convierte el objeto de dominio `Reclamo` a su modelo de SQLAlchemy (`ModeloReclamo`)
-        y lo añade a la sesión para su persistencia.
+        y lo añade a la sesión para su persistencia. Luego asigna al reclamo el ID generado.
 
         Args:
             reclamo (Reclamo): El objeto Reclamo a guardar.
@@ -47,6 +53,7 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         modelo_reclamo= self.__map_entidad_a_modelo(reclamo)
         self.__session.add(modelo_reclamo)
         self.__session.commit()
+        reclamo.id = modelo_reclamo.id
 
     def obtener_todos_los_registros(self):
         """
@@ -84,6 +91,7 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
             registro.departamento=reclamo_modificado.departamento
             registro.fecha_resolucion= reclamo_modificado.fecha_resolucion
             registro.foto=reclamo_modificado.foto
+            registro.minhash=reclamo_modificado.minhash
             self.__session.commit()
         else:
             raise ValueError("El reclamo no existe en la base de datos")
@@ -118,16 +126,211 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         Returns:
             list[Reclamo]: Una lista de objetos Reclamo que satisfacen todos los filtros.
         """
-        query = self.__session.query(ModeloReclamo)
+        query = self.__aplicar_filtros(self.__session.query(ModeloReclamo), filtros)
+        modelo_reclamos = query.all()
+        return [self.__map_modelo_a_entidad(reclamo) for reclamo in modelo_reclamos]
+
+    def obtener_registros_por_ids(self, ids_reclamos):
+        """
+        Obtiene varios reclamos por sus IDs, conservando el orden recibido.
+
+        Args:
+            ids_reclamos (iterable[int]): Los IDs de los reclamos.
+
+        Returns:
+            list[Reclamo]: Los reclamos encontrados, en el mismo orden que `ids_reclamos`.
+                           Los IDs inexistentes se omiten.
+        """
+        ids = list(ids_reclamos)
+        encontrados = {}
+        for inicio in range(0, len(ids), TAMANO_LOTE_IN):
+            lote = ids[inicio:inicio + TAMANO_LOTE_IN]
+            for modelo in self.__session.query(ModeloReclamo).filter(ModeloReclamo.id.in_(lote)):
+                encontrados[modelo.id] = self.__map_modelo_a_entidad(modelo)
+        return [encontrados[id_reclamo] for id_reclamo in ids if id_reclamo in encontrados]
+
+    def obtener_registros_con_adherentes(self, **filtros):
+        """
+        Obtiene los reclamos que coinciden con los filtros junto con su cantidad de adherentes.
+
+        Resuelve el conteo en una única consulta agregada (LEFT JOIN contra 'adherencias'
+        + GROUP BY), en lugar de una consulta COUNT por cada reclamo.
+
+        Args:
+            **filtros: Los mismos filtros que acepta `obtener_registros_por_filtros`.
+
+        Returns:
+            list[Reclamo]: Una lista de objetos Reclamo con el atributo `adherentes` cargado.
+        """
+        cantidad = func.count(Adherencia.id).label("adherentes")
+        query = self.__session.query(ModeloReclamo, cantidad)\
+            .outerjoin(Adherencia, Adherencia.id_reclamo == ModeloReclamo.id)\
+            .group_by(ModeloReclamo.id)
+        query = self.__aplicar_filtros(query, filtros)
+
+        reclamos = []
+        for modelo, adherentes in query.all():
+            reclamo = self.__map_modelo_a_entidad(modelo)
+            reclamo.adherentes = adherentes
+            reclamos.append(reclamo)
+        return reclamos
+
+    def obtener_pagina(self, limite, cursor=None, **filtros):
+        """
+        Obtiene una página de reclamos usando paginación por cursor (keyset).
+
+        Los reclamos se ordenan del más nuevo al más antiguo por (fecha_creacion, id).
+        En lugar de usar OFFSET, cada página continúa a partir de la clave del último
+        reclamo de la página anterior, por lo que el costo de la consulta no depende
+        de qué tan profunda sea la página ni del tamaño total de la tabla.
+
+        Args:
+            limite (int): La cantidad máxima de reclamos de la página.
+            cursor (str, opcional): El cursor devuelto por la página anterior.
+                                    Si es None, se devuelve la primera página.
+            **filtros: Los mismos filtros que acepta `obtener_registros_por_filtros`.
+
+        Returns:
+            tuple: (list[Reclamo], str or None). Los reclamos de la página, con el atributo
+                   `adherentes` cargado, y el cursor de la página siguiente
+                   (None si no hay más reclamos).
+
+        Raises:
+            ValueError: Si el cursor no tiene un formato válido.
+        """
+        query = self.__aplicar_filtros(self.__session.query(ModeloReclamo), filtros)
+        if cursor:
+            fecha, id_reclamo = self.__decodificar_cursor(cursor)
+            query = query.filter(or_(
+                ModeloReclamo.fecha_creacion < fecha,
+                and_(ModeloReclamo.fecha_creacion == fecha, ModeloReclamo.id < id_reclamo)
+            ))
+        # Se pide un registro de más para saber si existe una página siguiente
+        modelos = query.order_by(ModeloReclamo.fecha_creacion.desc(), ModeloReclamo.id.desc())\
+            .limit(limite + 1)\
+            .all()
+        hay_siguiente = len(modelos) > limite
+        modelos = modelos[:limite]
+
+        conteos = self.contar_adherentes_multiples(m.id for m in modelos)
+        reclamos = []
+        for modelo in modelos:
+            reclamo = self.__map_modelo_a_entidad(modelo)
+            reclamo.adherentes = conteos[modelo.id]
+            reclamos.append(reclamo)
+
+        siguiente_cursor = self.__codificar_cursor(modelos[-1]) if hay_siguiente else None
+        return reclamos, siguiente_cursor
+
+    def buscar_texto(self, consulta, departamento=None, estado=None, limite=50, cursor=None):
+        """
+        Busca reclamos por el texto de su descripción (búsqueda de texto completo FTS5).
+
+        Cada palabra de la consulta se busca como prefijo ("proyect" encuentra
+        "proyector") y deben aparecer todas. Los resultados se ordenan por relevancia
+        (BM25) y se paginan con un cursor que indica cuántos resultados ya se mostraron:
+        a diferencia de `obtener_pagina`, el orden por relevancia no permite continuar
+        a partir de una clave.
+
+        Requiere la tabla `TABLA_BUSQUEDA_RECLAMOS` (ver `modules.migraciones`).
+
+        Args:
+            consulta (str): El texto a buscar.
+            departamento (str, opcional): Filtra por departamento (sin distinguir mayúsculas).
+            estado (str, opcional): Filtra por estado.
+            limite (int): La cantidad máxima de reclamos de la página.
+            cursor (str, opcional): El cursor devuelto por la página anterior.
+
+        Returns:
+            tuple: (list[Reclamo], str or None). Los reclamos de la página, con el atributo
+                   `adherentes` cargado, y el cursor de la página siguiente
+                   (None si no hay más resultados).
+
+        Raises:
+            ValueError: Si el cursor no tiene un formato válido.
+        """
+        try:
+            desplazamiento = int(cursor) if cursor else 0
+        except ValueError:
+            raise ValueError("El cursor de paginación no es válido")
+        if desplazamiento < 0:
+            raise ValueError("El cursor de paginación no es válido")
+        palabras = _PATRON_PALABRAS.findall(consulta or "")
+        if not palabras:
+            return [], None
+
+        fts, reclamos = TABLA_BUSQUEDA_RECLAMOS, ModeloReclamo.__tablename__
+        condiciones = [f"{fts} MATCH :consulta"]
+        parametros = {"consulta": " ".join(f'"{palabra}"*' for palabra in palabras),
+                      "limite": limite + 1, "desplazamiento": desplazamiento}
+        if departamento:
+            condiciones.append(f"lower({reclamos}.departamento) = :departamento")
+            parametros["departamento"] = departamento.lower()
+        if estado:
+            condiciones.append(f"{reclamos}.estado = :estado")
+            parametros["estado"] = estado
+        # Se pide un registro de más para saber si existe una página siguiente
+        ids = self.__session.execute(text(
+            f"SELECT {reclamos}.id FROM {fts} JOIN {reclamos} ON {reclamos}.id = {fts}.rowid "
+            f"WHERE {' AND '.join(condiciones)} ORDER BY bm25({fts}), {reclamos}.id "
+            f"LIMIT :limite OFFSET :desplazamiento"
+        ), parametros).scalars().all()
+        hay_siguiente = len(ids) > limite
+        ids = ids[:limite]
+
+        reclamos_encontrados = self.obtener_registros_por_ids(ids)
+        conteos = self.contar_adherentes_multiples(ids)
+        for reclamo in reclamos_encontrados:
+            reclamo.adherentes = conteos[reclamo.id]
+        siguiente_cursor = str(desplazamiento + limite) if hay_siguiente else None
+        return reclamos_encontrados, siguiente_cursor
+
+    def __codificar_cursor(self, modelo: ModeloReclamo):
+        """
+        Genera el cursor de paginación a partir de la clave (fecha_creacion, id) de un reclamo.
+
+        Returns:
+            str: El cursor, con el formato '<fecha ISO>_<id>'.
+        """
+        return f"{modelo.fecha_creacion.isoformat()}_{modelo.id}"
+
+    def __decodificar_cursor(self, cursor):
+        """
+        Interpreta un cursor generado por `__codificar_cursor`.
+
+        Returns:
+            tuple: (datetime, int) con la clave del último reclamo de la página anterior.
+
+        Raises:
+            ValueError: Si el cursor no tiene un formato válido.
+        """
+        try:
+            fecha, id_reclamo = cursor.rsplit("_", 1)
+            return datetime.fromisoformat(fecha), int(id_reclamo)
+        except (AttributeError, ValueError):
+            raise ValueError("El cursor de paginación no es válido")
+
+    def __aplicar_filtros(self, query, filtros):
+        """
+        Aplica los filtros de búsqueda sobre una consulta de reclamos.
+
+        Para el filtro por 'departamento', la comparación se realiza de forma
+        insensible a mayúsculas/minúsculas.
+
+        Args:
+            query (sqlalchemy.orm.Query): La consulta base.
+            filtros (dict): Pares atributo/valor a filtrar.
+
+        Returns:
+            sqlalchemy.orm.Query: La consulta con los filtros aplicados.
+        """
         for clave, valor in filtros.items():
             if clave == 'departamento':
                 # El especialista sabe cómo manejar este caso particular
                 query = query.filter(func.lower(ModeloReclamo.departamento) == valor.lower())
             else:
                 query = query.filter(getattr(ModeloReclamo, clave) == valor)
-
-        modelo_reclamos = query.all()
-        return [self.__map_modelo_a_entidad(reclamo) for reclamo in modelo_reclamos]
+        return query
         
     def eliminar_registro(self, id):
         """
@@ -162,7 +365,8 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
             departamento=entidad.departamento,
             fecha_creacion=entidad.fecha_creacion or datetime.utcnow(),
             foto=entidad.foto,
-            fecha_resolucion=entidad.fecha_resolucion
+            fecha_resolucion=entidad.fecha_resolucion,
+            minhash=entidad.minhash
             )
     
     def __map_modelo_a_entidad(self, modelo: ModeloReclamo):
@@ -183,14 +387,17 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
             modelo.departamento,
             modelo.fecha_creacion,
             modelo.foto,
-            modelo.fecha_resolucion
+            modelo.fecha_resolucion,
+            modelo.minhash
         )
     
     def adherir_usuario_a_reclamo(self,id_usuario, id_reclamo):
         """
         Registra la adhesión de un usuario a un reclamo específico.
 
-        Crea un nuevo registro en la tabla 'adherencias'.
+        Crea un nuevo registro en la tabla 'adherencias'. La restricción UNIQUE
+        (id_usuario, id_reclamo) de la tabla es la que detecta las adhesiones
+        repetidas, por lo que no hace falta consultar antes de insertar.
 
         Args:
             id_usuario (int): El ID del usuario que se adhiere.
@@ -200,15 +407,13 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
             ValueError: Si el usuario ya está adherido a ese reclamo.
             Exception: Cualquier error que ocurra durante la transacción de la base de datos.
         """
-        #Verificamos si ya esta adherido
-        existe=self.__session.query(Adherencia).filter_by(id_usuario=id_usuario, id_reclamo=id_reclamo).first()
-
-        if existe:
-            raise ValueError("El usuario ya está adherido a este reclamo")
-        
         adherencia=Adherencia(id_usuario=id_usuario, id_reclamo=id_reclamo)
         self.__session.add(adherencia)
-        self.__session.commit()
+        try:
+            self.__session.commit()
+        except IntegrityError:
+            self.__session.rollback()
+            raise ValueError("El usuario ya está adherido a este reclamo")
 
     def contar_adherentes(self, id_reclamo):
         """
@@ -221,6 +426,30 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
             int: La cantidad de adherentes para el reclamo.
         """
         return self.__session.query(Adherencia).filter_by(id_reclamo=id_reclamo).count()
+
+    def contar_adherentes_multiples(self, ids_reclamos):
+        """
+        Cuenta los adherentes de varios reclamos con una sola consulta agregada.
+
+        Args:
+            ids_reclamos (iterable[int]): Los IDs de los reclamos.
+
+        Returns:
+            dict[int, int]: Un diccionario {id_reclamo: cantidad}. Los reclamos sin
+                            adherentes aparecen con cantidad 0.
+        """
+        ids = list(ids_reclamos)
+        conteos = dict.fromkeys(ids, 0)
+        # Se consulta por tandas para no superar el límite de parámetros de SQLite
+        for inicio in range(0, len(ids), TAMANO_LOTE_IN):
+            lote = ids[inicio:inicio + TAMANO_LOTE_IN]
+            filas = self.__session.query(Adherencia.id_reclamo, func.count(Adherencia.id))\
+                .filter(Adherencia.id_reclamo.in_(lote))\
+                .group_by(Adherencia.id_reclamo)\
+                .all()
+            for id_reclamo, cantidad in filas:
+                conteos[id_reclamo] = cantidad
+        return conteos
     
     def obtener_adherentes(self, id_reclamo):
         """
@@ -252,7 +481,8 @@ class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
         Inicializa el repositorio de usuarios con una sesión de SQLAlchemy.
 
         Args:
-            session (sqlalchemy.orm.session.Session): La sesión de base de datos de SQLAlchemy.
+            session (sqlalchemy.orm.session.Session): La sesión de base de datos de SQLAlchemy,
+                o un `scoped_session` que da a cada hilo su propia sesión (ver `config.crear_engine`).
         """
         self.__session = session
         ModeloUsuario.metadata.create_all(self.__session.bind)
@@ -1,14 +1,66 @@
-import nltk
-nltk.download("punkt")
-nltk.download('punkt_tab')
-nltk.download("stopwords")
 import numpy as np
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from scipy.sparse import csr_matrix
 from nltk.stem import SnowballStemmer
+import os
+import re
 import string
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from sklearn.base import BaseEstimator, TransformerMixin
+from modules.recursos_nlp import STOP_WORDS_ES, tokenizar_punkt
+
+# Cantidad máxima de palabras distintas cuya raíz se recuerda
+TAMANO_CACHE_RAICES = 50_000
+# Tokenizador alternativo a punkt: secuencias de letras/dígitos (la puntuación se descarta)
+_PATRON_TOKENS = re.compile(r"\w+")
+TOKENIZADORES = ("punkt", "regex")
+
+_stemmer_es = SnowballStemmer('spanish')
+
+
+@lru_cache(maxsize=TAMANO_CACHE_RAICES)
+def obtener_raiz(palabra):
+    """
+    Devuelve la raíz (stem) en español de una palabra, recordando las más usadas.
+
+    El vocabulario de los reclamos es muy repetitivo, por lo que la caché LRU, compartida
+    por todas las instancias de `TextVectorizer`, evita volver a aplicar el stemmer de
+    Snowball a las mismas palabras. `obtener_raiz.cache_info()` informa aciertos y fallos.
+    """
+    return _stemmer_es.stem(palabra)
+
+
+def preprocesar_texto(texto, tokenizador, stop_words):
+    """
+    Tokeniza un texto, lo pasa a minúsculas, quita stopwords y puntuación y aplica stemming.
+
+    Args:
+        texto (str): La cadena de texto de entrada.
+        tokenizador (str): "punkt" o "regex" (ver `TextVectorizer`).
+        stop_words (set): Las palabras a descartar.
+
+    Returns:
+        str: Las raíces de las palabras, separadas por espacios.
+    """
+    texto = texto.lower()
+    if tokenizador == "regex":
+        tokens = _PATRON_TOKENS.findall(texto)
+    else:
+        tokens = tokenizar_punkt(texto)
+    word_tokens = [obtener_raiz(token) for token in tokens\
+                        if token not in stop_words and token not in string.punctuation]
+    return ' '.join(word_tokens)
+
+
+def _contar_palabras(textos, tokenizador, stop_words):
+    """Cuenta las raíces de un grupo de textos. Se ejecuta en los procesos de `TextVectorizer.fit`."""
+    conteo = Counter()
+    for texto in textos:
+        for word in preprocesar_texto(texto, tokenizador, stop_words).split(" "):
+            conteo[word] += 1
+    return conteo
+
 
 class TextVectorizer(BaseEstimator, TransformerMixin):
     """
@@ -19,28 +71,52 @@ class TextVectorizer(BaseEstimator, TransformerMixin):
     cada texto como un vector de "bolsa de palabras" (bag-of-words) donde cada
     elemento del vector cuenta la frecuencia de las palabras del vocabulario.
 
+    Como cada reclamo usa solo unas pocas palabras del vocabulario, por defecto la
+    matriz resultante es dispersa (`scipy.sparse.csr_matrix`): solo se guardan las
+    frecuencias distintas de cero.
+
     Hereda de `BaseEstimator` y `TransformerMixin` de scikit-learn,
     lo que permite que se use dentro de pipelines de scikit-learn.
 
     Atributos:
         __word2idx (dict): Mapeo de palabras del vocabulario a sus índices numéricos.
-        stop_words (set): Conjunto de palabras vacías (stopwords) en español para filtrar.
-        spanish_stemmer (SnowballStemmer): Objeto para realizar stemming en español.
+        stop_words (frozenset): Conjunto de palabras vacías (stopwords) en español para filtrar
+                                (`modules.recursos_nlp.STOP_WORDS_ES`, compartido por todo el proceso).
         vocabulario_ (list): Lista de palabras únicas que forman el vocabulario aprendido.
+        salida_dispersa (bool): Si es True, `transform` devuelve una matriz dispersa CSR;
+                                si es False, un `numpy.ndarray` denso.
+        tokenizador (str): "punkt" para tokenizar como `nltk.word_tokenize` (ver
+                           `modules.recursos_nlp.tokenizar_punkt`), o "regex" para separar
+                           las palabras con una expresión regular precompilada (más rápido).
+        n_jobs (int or None): Cantidad de procesos para preprocesar los textos en `fit`
+                              (None o 1: sin paralelismo; -1: todos los núcleos).
     """
-    def __init__(self):
+    def __init__(self, salida_dispersa=True, tokenizador="punkt", n_jobs=None):
         """
         Inicializa el vectorizador de texto.
-        Configura las stopwords en español y el stemmer.
+        Configura las stopwords en español (el stemmer es compartido, ver `obtener_raiz`).
+
+        Args:
+            salida_dispersa (bool): Si `transform` devuelve una matriz dispersa (por defecto)
+                                    o densa.
+            tokenizador (str): "punkt" (por defecto) o "regex".
+            n_jobs (int, opcional): Procesos a usar en `fit`.
+
+        Raises:
+            ValueError: Si el tokenizador no es uno de `TOKENIZADORES`.
         """
+        if tokenizador not in TOKENIZADORES:
+            raise ValueError(f"Tokenizador '{tokenizador}' no soportado. Opciones: {', '.join(TOKENIZADORES)}")
+        self.salida_dispersa = salida_dispersa
+        self.tokenizador = tokenizador
+        self.n_jobs = n_jobs
         self.__word2idx = {}
-        self.stop_words = set(stopwords.words('spanish'))
-        self.spanish_stemmer = SnowballStemmer('spanish')
+        self.stop_words = STOP_WORDS_ES
 
     def __get_tokens(self, texto): 
         """
         Procesa una cadena de texto para tokenizarla, convertirla a minúsculas,
-        eliminar stopwords y aplicar stemming.
+        eliminar stopwords y aplicar stemming (a través de la caché `obtener_raiz`).
 
         Args:
             texto (str): La cadena de texto de entrada.
@@ -48,35 +124,42 @@ class TextVectorizer(BaseEstimator, TransformerMixin):
         Returns:
             str: La cadena de texto procesada, con tokens separados por espacios.
         """       
-        texto = texto.lower()
-        tokens = word_tokenize(texto)    
-        word_tokens = [self.spanish_stemmer.stem(token) for token in tokens\
-                            if token not in self.stop_words and token not in string.punctuation]
-        return ' '.join(word_tokens)
+        return preprocesar_texto(texto, self.tokenizador, self.stop_words)
 
-    # Text to Vector
-    def __text_to_vector(self, texto):
+    def __setstate__(self, state):
         """
-        Convierte una cadena de texto procesada en un vector numérico (bag-of-words).
+        Restaura un vectorizador serializado con pickle.
 
-        El vector resultante tiene la misma longitud que el vocabulario aprendido
-        y sus elementos representan la frecuencia de cada palabra del vocabulario
-        en el texto de entrada.
+        Los vectorizadores guardados antes de existir `salida_dispersa` se restauran con
+        salida densa, ya que su pipeline usa un `StandardScaler` que centra los datos
+        y no acepta matrices dispersas. Los anteriores a `tokenizador` usan punkt.
+        """
+        super().__setstate__(state)
+        if "salida_dispersa" not in self.__dict__:
+            self.salida_dispersa = False
+        if "tokenizador" not in self.__dict__:
+            self.tokenizador = "punkt"
+        if "n_jobs" not in self.__dict__:
+            self.n_jobs = None
+
+    # Text to Vector
+    def __text_to_indices(self, texto):
+        """
+        Convierte una cadena de texto en las frecuencias de sus palabras del vocabulario.
 
         Args:
-            texto (str): La cadena de texto ya preprocesada (tokenizada y stemmed).
+            texto (str): La cadena de texto original (se preprocesa aquí).
 
         Returns:
-            numpy.ndarray: Un array NumPy que representa el vector del texto.
+            Counter: {índice de la palabra en el vocabulario: frecuencia}. Las palabras
+                     que no están en el vocabulario se ignoran.
         """
-        word_vector = np.zeros(len(self.vocabulario_))
-        texto = self.__get_tokens(texto) #agrego esta linea
-        for word in texto.split(" "):
-            if self.__word2idx.get(word) is None:
-                continue
-            else:
-                word_vector[self.__word2idx.get(word)] += 1
-        return np.array(word_vector)
+        frecuencias = Counter()
+        for word in self.__get_tokens(texto).split(" "):
+            indice = self.__word2idx.get(word)
+            if indice is not None:
+                frecuencias[indice] += 1
+        return frecuencias
 
     def fit(self, X, y=None):
         """
@@ -85,6 +168,11 @@ class TextVectorizer(BaseEstimator, TransformerMixin):
         Itera sobre todos los reclamos, los preprocesa y construye un contador
         de frecuencias de palabras para identificar el vocabulario único.
 
+        Con `n_jobs` mayor que 1, los reclamos se dividen en tramos consecutivos que se
+        preprocesan en un pool de procesos. Los contadores de cada tramo se suman en
+        orden, por lo que el vocabulario (incluido el orden de las palabras con igual
+        frecuencia) es idéntico al que se obtiene sin paralelismo.
+
         Args:
             X (list[str]): Una lista de cadenas de texto (los reclamos).
             y (any, opcional): Ignorado, se mantiene para compatibilidad con la API de scikit-learn.
@@ -92,40 +180,65 @@ class TextVectorizer(BaseEstimator, TransformerMixin):
         Returns:
             self: La instancia del vectorizador entrenado.
         """
-        X_procesado = []
-        for reclamo in X:
-            X_procesado.append(self.__get_tokens(reclamo))
-
-        total_counts = Counter()
-        for reclamo in X_procesado:
-            for word in reclamo.split(" "):
-                total_counts[word] += 1
+        X = list(X)
+        procesos = self.__cantidad_procesos(len(X))
+        if procesos <= 1:
+            total_counts = _contar_palabras(X, self.tokenizador, self.stop_words)
+        else:
+            tamano_tramo = -(-len(X) // procesos)  # División redondeando hacia arriba
+            tramos = [X[i:i + tamano_tramo] for i in range(0, len(X), tamano_tramo)]
+            total_counts = Counter()
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                conteos = pool.map(_contar_palabras, tramos,
+                                   [self.tokenizador] * len(tramos), [self.stop_words] * len(tramos))
+                for conteo in conteos:  # `map` respeta el orden de los tramos
+                    total_counts.update(conteo)
+
         self.vocabulario_ = [elem[0] for elem in total_counts.most_common()]
-        for i, word in enumerate(self.vocabulario_):
-            self.__word2idx[word] = i 
+        self.__word2idx = {word: i for i, word in enumerate(self.vocabulario_)}
 
         return self
 
+    def __cantidad_procesos(self, cantidad_textos):
+        """Devuelve cuántos procesos usar en `fit` según `n_jobs` y la cantidad de textos."""
+        if not self.n_jobs or self.n_jobs == 1:
+            return 1
+        procesos = (os.cpu_count() or 1) if self.n_jobs < 0 else self.n_jobs
+        return max(1, min(procesos, cantidad_textos))
+
     def transform(self, X, y=None): 
         """
         Transforma una colección de documentos (reclamos) en una matriz de vectores numéricos.
 
         Cada fila de la matriz representa un reclamo, y cada columna representa
-        la frecuencia de una palabra del vocabulario en ese reclamo.
+        la frecuencia de una palabra del vocabulario en ese reclamo. La matriz CSR se
+        arma directamente a partir de los índices de las palabras de cada reclamo, sin
+        crear vectores densos intermedios.
 
         Args:
             X (list[str]): Una lista de cadenas de texto (los reclamos a transformar).
             y (any, opcional): Ignorado, se mantiene para compatibilidad con la API de scikit-learn.
 
         Returns:
-            numpy.ndarray: Una matriz donde cada fila es el vector del reclamo correspondiente.
-                           Los elementos son enteros que representan frecuencias.
+            scipy.sparse.csr_matrix or numpy.ndarray: Una matriz donde cada fila es el vector
+                del reclamo correspondiente (densa si `salida_dispersa` es False).
+                Los elementos son enteros que representan frecuencias.
         """       
-        word_vectors = np.zeros((len(X), len(self.vocabulario_)), dtype=np.int_)
-        for i, texto in enumerate(X):
-            word_vectors[i] = self.__text_to_vector(texto)
+        indptr = [0]
+        indices = []
+        datos = []
+        for texto in X:
+            frecuencias = self.__text_to_indices(texto)
+            indices.extend(frecuencias.keys())
+            datos.extend(frecuencias.values())
+            indptr.append(len(indices))
 
-        return word_vectors
+        word_vectors = csr_matrix(
+            (np.array(datos, dtype=np.int_), np.array(indices), np.array(indptr)),
+            shape=(len(indptr) - 1, len(self.vocabulario_))
+        )
+        word_vectors.sort_indices()
+        return word_vectors if self.salida_dispersa else word_vectors.toarray()
     
 if __name__ == "__main__":
     """
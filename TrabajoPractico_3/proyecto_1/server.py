@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request,flash, redirect, url_for, session, Response
+from flask import Flask, render_template, request,flash, redirect, url_for, session, Response, jsonify
 from flask_login import login_required, current_user
 from modules.config import app, login_manager
 from modules.factoria import crear_repositorio
@@ -8,31 +8,67 @@ from modules.gestor_usuarios import GestorDeUsuarios
 from modules.formularios import FormRegistro, FormLogin, FormReclamo
 from modules.graficador_concreto import GraficadorMatplotlib
 from modules.analitica import Analitica
+from modules.monticulo_binario import MedianHeapEliminable
+from modules.monticulo_compacto import MedianHeapEliminableCompacto
 from werkzeug.utils import secure_filename
-from modules.create_csv import crear_csv
-from sklearn.preprocessing import LabelEncoder
-import pickle
+from werkzeug.http import is_resource_modified
+from modules.modelo_clasificador import ModeloClasificador
+from modules.clasificacion_por_lotes import ServicioClasificacionPorLotes
+from modules.cola_reportes import ColaReportes, TERMINADO
 import os
 
-with open('./data/claims_clf.pkl', 'rb') as archivo:
-    clasificador = pickle.load(archivo)
-
-# 1. Cargamos los datos de entrenamiento para obtener las etiquetas originales
-datos_entrenamiento = crear_csv("./data/frases.json")
-etiquetas = datos_entrenamiento['etiqueta']
-
-# 2. Creamos y "entrenamos" un LabelEncoder. Ahora sabe que 0='Soporte Técnico', etc.
-label_encoder = LabelEncoder()
-label_encoder.fit(etiquetas)
+# El modelo (con los nombres de sus clases) se carga recién al clasificar el primer reclamo
+clasificador = ModeloClasificador(tamano_cache=app.config['TAMANO_CACHE_PREDICCIONES'])
+# Las clasificaciones concurrentes se agrupan en lotes de un solo `predict`
+if app.config['LATENCIA_LOTE_CLASIFICACION_MS'] > 0:
+    clasificador = ServicioClasificacionPorLotes(clasificador,
+                                                 app.config['LATENCIA_LOTE_CLASIFICACION_MS'] / 1000,
+                                                 app.config['TAMANO_LOTE_CLASIFICACION'])
 
 #Crear repositorios y gestores
 admin_list = [1]
 repo_reclamos, repo_usuarios = crear_repositorio()
 gestor_usuarios = GestorDeUsuarios(repo_usuarios)
-gestor_reclamos = GestorDeReclamos(repo_reclamos, clasificador, label_encoder)
+gestor_reclamos = GestorDeReclamos(repo_reclamos, clasificador,
+                                   MedianHeapEliminableCompacto if app.config['MONTICULO_COMPACTO'] else MedianHeapEliminable,
+                                   app.config['PRECISION_CUANTILES'])
 gestor_login = GestorDeLogin(gestor_usuarios, login_manager, admin_list)
-graficador = GraficadorMatplotlib()
-analitica_fachada = Analitica(gestor_reclamos, graficador)
+graficador = GraficadorMatplotlib(app.config['FORMATO_GRAFICOS'])
+analitica_fachada = Analitica(gestor_reclamos, graficador,
+                              app.config['CACHE_REPORTES_MB'] * 2**20,
+                              app.config['CACHE_GRAFICOS_MB'] * 2**20)
+
+def _generar_reporte_en_segundo_plano(departamento, formato, informar_etapa):
+    """Genera un reporte desde un hilo de la cola, fuera de una petición."""
+    # Las plantillas del reporte necesitan el contexto de la aplicación
+    with app.app_context():
+        return analitica_fachada.generar_reporte_formateado(departamento, formato, informar_etapa)
+
+cola_reportes = ColaReportes(_generar_reporte_en_segundo_plano,
+                             app.config['REPORTES_TRABAJADORES'],
+                             app.config['REPORTES_EN_ESPERA'],
+                             app.config['REPORTES_TTL_S'])
+
+def _obtener_pagina(**filtros):
+    """
+    Obtiene la página de reclamos indicada por los parámetros 'cursor' y 'limite' de la URL.
+
+    Si el cursor no es válido, se informa al usuario y se devuelve la primera página.
+
+    Args:
+        **filtros: Filtros a aplicar sobre los reclamos (ej. `departamento`, `estado`).
+
+    Returns:
+        tuple: (lista_reclamos, siguiente_cursor).
+    """
+    cursor = request.args.get('cursor') or None
+    limite = request.args.get('limite', type=int)
+    try:
+        return gestor_reclamos.listar_reclamos_paginados(cursor, limite, **filtros)
+    except ValueError as e:
+        flash(str(e), "error")
+        return gestor_reclamos.listar_reclamos_paginados(None, limite, **filtros)
+
 # Página de inicio
 @app.route('/')
 def inicio():
@@ -48,8 +84,8 @@ def inicio():
     """
     if current_user.is_authenticated:
         return redirect(url_for('menu_principal'))
-    lista_reclamos = gestor_reclamos.listar_reclamos_para_usuarios()
-    return render_template('inicio.html', lista_reclamos=lista_reclamos)
+    # La bienvenida no muestra reclamos: el listado está en /listar_reclamos
+    return render_template('inicio.html')
     
 
 @app.route('/register', methods=['GET', 'POST'])
@@ -119,12 +155,14 @@ def login():
 @login_required
 def menu_principal():
     """Menú principal que muestra las opciones principales al usuario.
-    Muestra el menú principal para los usuarios finales.
+    Muestra el menú principal para los usuarios finales, junto con los reclamos
+    pendientes con más adherentes.
     Requiere que el usuario esté autenticado (`@login_required`).
     Returns:
     render_template: La plantilla 'menu_principal.html'.
     """
-    return render_template("menu_principal.html")
+    reclamos_destacados = gestor_reclamos.obtener_reclamos_mas_adheridos(5)
+    return render_template("menu_principal.html", reclamos_destacados=reclamos_destacados)
 
 @app.route('/logout')
 @login_required
@@ -150,7 +188,7 @@ def dashboard():
 
     Requiere que el usuario esté autenticado y que tenga el rol de 'jefe' o 'secretario'.
     Si el usuario no tiene el rol adecuado, se deniega el acceso.
-    Muestra una lista de reclamos del departamento del usuario y estadísticas relevantes.
+    Muestra una lista paginada de reclamos del departamento del usuario y estadísticas relevantes.
 
     Returns:
         render_template: La plantilla 'dashboard.html' con los reclamos y estadísticas.
@@ -160,28 +198,32 @@ def dashboard():
         flash("Acceso denegado", "error")
         return redirect(url_for('inicio'))
     
+    cursor = request.args.get('cursor') or None
+    limite = request.args.get('limite', type=int)
     try:
         if current_user.es_secretario():
             # Para el secretario, no pasamos departamento para obtener todo
-            reclamos, stats = analitica_fachada.obtener_datos_dashboard()
+            reclamos, stats, siguiente_cursor = analitica_fachada.obtener_datos_dashboard(cursor=cursor, limite=limite)
             # Definimos un título para la vista global
             titulo_departamento = "Todos los Departamentos"
         else:
             # Para el jefe, pasamos su departamento para filtrar
             depto = current_user.departamento
-            reclamos, stats = analitica_fachada.obtener_datos_dashboard(departamento=depto)
+            reclamos, stats, siguiente_cursor = analitica_fachada.obtener_datos_dashboard(departamento=depto, cursor=cursor, limite=limite)
             titulo_departamento = depto
 
     except Exception as e:
         flash(f"Error cargando datos del dashboard: {str(e)}", "error")
         reclamos = []
         stats = {}
+        siguiente_cursor = None
         titulo_departamento = "Error"
 
     return render_template('dashboard.html', 
                            lista_reclamos=reclamos, 
                            stats=stats, 
-                           titulo_departamento=titulo_departamento)
+                           titulo_departamento=titulo_departamento,
+                           siguiente_cursor=siguiente_cursor)
     
 @app.route('/derivar/<int:id>', methods=['GET', 'POST'])
 @login_required
@@ -218,7 +260,7 @@ def derivar_reclamo(id):
 @login_required
 def listar_reclamos():
     """
-    Lista todos los reclamos disponibles o filtra por departamento.
+    Lista los reclamos disponibles (paginados) o filtra por departamento.
 
     Permite a los usuarios generales ver reclamos pendientes (con opción de filtrar
     por departamento). Los usuarios con rol de personal (jefe/secretario/técnico)
@@ -227,6 +269,7 @@ def listar_reclamos():
     Args:
         departamento (str, opcional): El departamento por el cual filtrar los reclamos.
                                        Se obtiene de los parámetros de la URL.
+        cursor (str, opcional): El cursor de la página a mostrar.
 
     Returns:
         render_template: La plantilla 'listar_reclamos.html' con la lista de reclamos
@@ -242,31 +285,82 @@ def listar_reclamos():
         # Si es secretario, muestra todos los reclamos de todos los departamentos
         # (usando el filtro si se aplica uno)
         if departamento_filtro:
-            lista_reclamos = gestor_reclamos.listar_reclamos_por_departamento(departamento_filtro)
+            lista_reclamos, siguiente_cursor = _obtener_pagina(departamento=departamento_filtro)
         else:
-            lista_reclamos = gestor_reclamos.obtener_todos_los_reclamos()
+            lista_reclamos, siguiente_cursor = _obtener_pagina()
 
     elif current_user.is_authenticated and current_user.es_jefe():
         # Si es jefe, muestra solo los reclamos de su propio departamento, sin filtro
-        lista_reclamos = gestor_reclamos.listar_reclamos_por_departamento(current_user.departamento)
+        lista_reclamos, siguiente_cursor = _obtener_pagina(departamento=current_user.departamento)
         # Ocultamos el filtro para el jefe, ya que no aplica
         departamentos = [] 
         
     else:
         # Lógica para usuarios finales: solo ven reclamos pendientes
         if departamento_filtro:
-            lista_reclamos = gestor_reclamos.listar_reclamos_por_departamento(departamento_filtro, estado="pendiente")
+            lista_reclamos, siguiente_cursor = _obtener_pagina(departamento=departamento_filtro, estado="pendiente")
         else:
-            lista_reclamos = gestor_reclamos.listar_reclamos_para_usuarios()
+            lista_reclamos, siguiente_cursor = _obtener_pagina(estado="pendiente")
     # --- FIN DE LA LÓGICA CORREGIDA ---
 
     # El template debe estar preparado para recibir objetos Reclamo
     return render_template('listar_reclamos.html', 
                            lista_reclamos=lista_reclamos, 
                            departamentos=departamentos, 
-                           departamento_filtro=departamento_filtro)
+                           departamento_filtro=departamento_filtro,
+                           siguiente_cursor=siguiente_cursor)
     
 
+@app.route('/buscar_reclamos', methods=['GET'])
+@login_required
+def buscar_reclamos():
+    """
+    Busca reclamos por las palabras de su descripción, ordenados por relevancia.
+
+    Aplica las mismas restricciones que `listar_reclamos`: el secretario busca en
+    todos los reclamos, el jefe solo en los de su departamento y los usuarios
+    finales solo en los pendientes (con filtro opcional por departamento).
+
+    Args:
+        q (str): Las palabras a buscar. Se obtiene de los parámetros de la URL.
+        departamento (str, opcional): El departamento por el cual filtrar.
+        cursor (str, opcional): El cursor de la página a mostrar.
+
+    Returns:
+        render_template: La plantilla 'listar_reclamos.html' con los resultados.
+    """
+    busqueda = request.args.get('q', '').strip()
+    departamento_filtro = request.args.get('departamento')
+    departamentos = gestor_reclamos.obtener_departamentos()
+
+    filtros = {}
+    if current_user.es_secretario():
+        if departamento_filtro:
+            filtros["departamento"] = departamento_filtro
+    elif current_user.es_jefe():
+        filtros["departamento"] = current_user.departamento
+        departamentos = []
+    else:
+        filtros["estado"] = "pendiente"
+        if departamento_filtro:
+            filtros["departamento"] = departamento_filtro
+
+    cursor = request.args.get('cursor') or None
+    limite = request.args.get('limite', type=int)
+    try:
+        lista_reclamos, siguiente_cursor = gestor_reclamos.buscar_reclamos(busqueda, cursor, limite, **filtros)
+    except ValueError as e:
+        flash(str(e), "error")
+        lista_reclamos, siguiente_cursor = gestor_reclamos.buscar_reclamos(busqueda, None, limite, **filtros)
+
+    return render_template('listar_reclamos.html',
+                           lista_reclamos=lista_reclamos,
+                           departamentos=departamentos,
+                           departamento_filtro=departamento_filtro,
+                           siguiente_cursor=siguiente_cursor,
+                           busqueda=busqueda)
+
+
 @app.route("/agregar_reclamo", methods=["GET", "POST"])
 @login_required
 def agregar_reclamo():
@@ -275,9 +369,9 @@ def agregar_reclamo():
 
         - **GET**: Muestra el formulario para crear el reclamo, precargando los
         departamentos disponibles.
-        - **POST**: Procesa los datos del formulario. Si se detectan reclamos
-        similares basados en la descripción, ofrece la opción de adherirse
-        a uno existente. Si no hay similares o el usuario elige crear uno nuevo,
+        - **POST**: Procesa los datos del formulario. Si la descripción es casi un
+        duplicado de un reclamo pendiente, o se detectan reclamos similares,
+        ofrece la opción de adherirse a uno existente. Si no hay similares o el usuario elige crear uno nuevo,
         el reclamo se guarda en la base de datos. También maneja la subida de fotos
         adjuntas al reclamo.
 
@@ -316,12 +410,16 @@ def agregar_reclamo():
         # 1. Clasificamos para obtener el departamento sugerido
         departamento_sugerido = gestor_reclamos.clasificar_descripcion(descripcion)
         
-        # 2. Buscamos similares en ese departamento
+        # 2. Buscamos un reclamo casi duplicado (en cualquier departamento) y similares en ese departamento
+        duplicado = gestor_reclamos.buscar_duplicado(descripcion)
         reclamos_similares = gestor_reclamos.buscar_similares(descripcion)
+        if duplicado:
+            reclamos_similares = [r for r in reclamos_similares if r.id != duplicado.id]
         
-        if reclamos_similares:
+        if duplicado or reclamos_similares:
             # 3a. Si hay similares, mostramos la página de selección
             return render_template("reclamos_similares.html",
+                                   duplicado=duplicado,
                                    similares=reclamos_similares,
                                    descripcion=descripcion,
                                    departamento_sugerido=departamento_sugerido,
@@ -367,16 +465,15 @@ def mis_reclamos():
     """Ver reclamos del propio usuario
     Muestra la lista de reclamos creados por el usuario actual.
 
-    Filtra todos los reclamos para mostrar solo aquellos cuyo `id_usuario`
+    Pide al repositorio (paginados) solo aquellos reclamos cuyo `id_usuario`
     coincide con el ID del usuario autenticado.
 
     Returns:
         render_template: La plantilla 'mis_reclamos.html' con la lista de reclamos del usuario.
     """
     usuario_id=int(current_user.id)
-    todos=gestor_reclamos.obtener_todos_los_reclamos()
-    propios= [r for r in todos if r.id_usuario ==usuario_id]
-    return render_template("mis_reclamos.html", lista_reclamos=propios)
+    propios, siguiente_cursor = _obtener_pagina(id_usuario=usuario_id)
+    return render_template("mis_reclamos.html", lista_reclamos=propios, siguiente_cursor=siguiente_cursor)
     
 @app.route("/edit", methods=['GET', 'POST'])
 @login_required
@@ -439,11 +536,11 @@ def analitica():
         flash("Acceso no permitido")
         return redirect(url_for('inicio'))
     if current_user.es_secretario():
-        _, stats = analitica_fachada.obtener_datos_dashboard()
+        stats = analitica_fachada.obtener_estadisticas()
         depto = "Todos los Departamentos"
     else:
         depto=current_user.departamento
-        _, stats = analitica_fachada.obtener_datos_dashboard(departamento=depto)
+        stats = analitica_fachada.obtener_estadisticas(departamento=depto)
     return render_template("analitica.html", stats=stats, departamento=depto)
     
 
@@ -454,11 +551,21 @@ def grafico(tipo_grafico, departamento):
         return "Acceso denegado", 403
     
     try:
-        # La fachada nos da la imagen del gráfico que pidamos
-        img_bytes = analitica_fachada.obtener_imagen_grafico(tipo_grafico, departamento)
-        if img_bytes is None:
-            return "No hay datos para mostrar el gráfico.", 404
-        return Response(img_bytes, mimetype='image/png')
+        # Si el navegador ya tiene la imagen de esta versión de los datos, no se dibuja de nuevo
+        etag, ultima_modificacion = analitica_fachada.obtener_validadores_grafico(tipo_grafico, departamento)
+        if not is_resource_modified(request.environ, etag=etag, last_modified=ultima_modificacion):
+            respuesta = Response(status=304)
+        else:
+            # La fachada nos da la imagen del gráfico que pidamos
+            img_bytes = analitica_fachada.obtener_imagen_grafico(tipo_grafico, departamento)
+            if img_bytes is None:
+                return "No hay datos para mostrar el gráfico.", 404
+            respuesta = Response(img_bytes, mimetype=graficador.mimetype)
+        respuesta.set_etag(etag)
+        respuesta.last_modified = ultima_modificacion
+        respuesta.cache_control.private = True
+        respuesta.cache_control.no_cache = True
+        return respuesta
     except ValueError as e:
         return str(e), 400 # Error si el tipo de gráfico no es válido
     except Exception as e:
@@ -484,6 +591,10 @@ def generar_reporte():
     """
     Genera un reporte. Si es secretario, usa el depto. de la URL.
     Si es jefe, usa su propio depto.
+
+    Con 'async=1' el reporte no se genera durante la petición: se encola (ver
+    `modules.cola_reportes`) y se responde 202 con el ID del trabajo y las URLs para
+    consultar su estado y descargarlo.
     """
     if not(current_user.es_jefe() or current_user.es_secretario()):
         flash("Acceso denegado.", "error")
@@ -503,9 +614,23 @@ def generar_reporte():
         # Para el jefe de departamento, usamos el suyo
         departamento = current_user.departamento
     
+    if request.args.get('async') == '1':
+        return _encolar_reporte(departamento, formato)
+
     try:
-        output, mimetype, headers = analitica_fachada.generar_reporte_formateado(departamento, formato)
-        return Response(output, mimetype=mimetype, headers=headers)
+        # Si el navegador ya tiene el reporte de esta versión de los datos, no se genera de nuevo
+        etag, ultima_modificacion = analitica_fachada.obtener_validadores_reporte(departamento, formato)
+        if not is_resource_modified(request.environ, etag=etag, last_modified=ultima_modificacion):
+            respuesta = Response(status=304)
+        else:
+            output, mimetype, headers = analitica_fachada.generar_reporte_formateado(departamento, formato)
+            respuesta = Response(output, mimetype=mimetype, headers=headers)
+        respuesta.set_etag(etag)
+        respuesta.last_modified = ultima_modificacion
+        # El reporte es privado del usuario y se revalida en cada descarga
+        respuesta.cache_control.private = True
+        respuesta.cache_control.no_cache = True
+        return respuesta
     except ValueError as e:
         flash(str(e), "error")
         return redirect(url_for('dashboard'))
@@ -513,6 +638,83 @@ def generar_reporte():
         flash(f"Error al generar el reporte: {e}", "error")
         return redirect(url_for('dashboard'))
     
+def _encolar_reporte(departamento, formato):
+    """Encola la generación de un reporte y responde con los datos del trabajo."""
+    try:
+        analitica_fachada.obtener_validadores_reporte(departamento, formato)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    version, _ = gestor_reclamos.obtener_version_datos(departamento)
+    try:
+        trabajo = cola_reportes.encolar(departamento, formato, version)
+    except ValueError as e:
+        # La cola de espera está llena
+        return jsonify(error=str(e)), 503
+    return jsonify(_datos_trabajo(trabajo)), 202
+
+def _datos_trabajo(trabajo):
+    """Representa un trabajo de reporte para las respuestas JSON."""
+    datos = {
+        "id": trabajo.id,
+        "estado": trabajo.estado,
+        "departamento": trabajo.departamento,
+        "formato": trabajo.formato,
+        "posicion": cola_reportes.posicion(trabajo),
+        "url_estado": url_for('estado_reporte', id_trabajo=trabajo.id),
+    }
+    if trabajo.etapa:
+        datos["etapa"] = trabajo.etapa
+    if trabajo.estado == TERMINADO:
+        datos["url_descarga"] = url_for('descargar_reporte', id_trabajo=trabajo.id)
+    if trabajo.error:
+        datos["error"] = trabajo.error
+    return datos
+
+def _obtener_trabajo_permitido(id_trabajo):
+    """
+    Busca un trabajo de reporte que el usuario actual pueda ver: el secretario ve
+    todos y el jefe solo los de su departamento.
+
+    Returns:
+        TrabajoReporte: El trabajo, o None si no existe, venció o no le corresponde.
+    """
+    trabajo = cola_reportes.obtener(id_trabajo)
+    if trabajo is None:
+        return None
+    if current_user.es_secretario():
+        return trabajo
+    if current_user.es_jefe() and \
+            trabajo.departamento.strip().lower() == (current_user.departamento or "").strip().lower():
+        return trabajo
+    return None
+
+@app.route('/reportes/<id_trabajo>')
+@login_required
+def estado_reporte(id_trabajo):
+    """Informa el estado de un reporte pedido con 'async=1'."""
+    if not(current_user.es_jefe() or current_user.es_secretario()):
+        return jsonify(error="Acceso denegado."), 403
+    trabajo = _obtener_trabajo_permitido(id_trabajo)
+    if trabajo is None:
+        return jsonify(error="El reporte no existe o ya venció."), 404
+    return jsonify(_datos_trabajo(trabajo))
+
+@app.route('/reportes/<id_trabajo>/descarga')
+@login_required
+def descargar_reporte(id_trabajo):
+    """Entrega un reporte generado en segundo plano."""
+    if not(current_user.es_jefe() or current_user.es_secretario()):
+        return jsonify(error="Acceso denegado."), 403
+    trabajo = _obtener_trabajo_permitido(id_trabajo)
+    if trabajo is None:
+        return jsonify(error="El reporte no existe o ya venció."), 404
+    if trabajo.estado != TERMINADO:
+        return jsonify(_datos_trabajo(trabajo)), 409
+    output, mimetype, headers = trabajo.resultado
+    respuesta = Response(output, mimetype=mimetype, headers=headers)
+    respuesta.cache_control.private = True
+    return respuesta
+
 @app.route('/seleccionar_reporte')
 @login_required
 def seleccionar_reporte():
@@ -0,0 +1,21 @@
+# tests/__init__.py
+"""
+Las pruebas no deben modificar los archivos del proyecto: al importar `server`, la
+aplicación migra el esquema y aplica el perfil de SQLite sobre `data/base_datos.db` y
+guarda las sesiones en `flask_session_cache`. Antes de que se importe cualquier módulo de
+prueba, `URL_BD` se apunta a una copia temporal de la base y `SESSION_FILE_DIR` a un
+directorio temporal, que se borran al terminar.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+_directorio = tempfile.mkdtemp(prefix='reclamos_tests_')
+atexit.register(shutil.rmtree, _directorio, ignore_errors=True)
+
+if 'URL_BD' not in os.environ:
+    _copia = os.path.join(_directorio, 'base_datos.db')
+    shutil.copyfile(os.path.join(os.path.dirname(__file__), '..', 'data', 'base_datos.db'), _copia)
+    os.environ['URL_BD'] = f"sqlite:///{_copia}"
+os.environ.setdefault('SESSION_FILE_DIR', os.path.join(_directorio, 'sesiones'))
@@ -1,6 +1,16 @@
 # tests/test_algoritmos.py
+import random
+import statistics
 import unittest
-from modules.monticulo_binario import MedianHeap
+from datetime import datetime, timedelta
+from modules.monticulo_binario import (MedianHeap, MedianHeapEliminable, MonticuloBinarioMin, MonticuloBinarioMax,
+                                       ColaPrioridadIndexada)
+from modules.cuantiles import SketchCuantiles
+from modules.monticulo_compacto import (MonticuloCompactoMin, MonticuloCompactoMax, MedianHeapCompacto,
+                                        MedianHeapEliminableCompacto)
+from modules.indice_similitud import IndiceInvertidoTFIDF
+from modules.minhash import (IndiceLSH, calcular_firma, similitud_estimada, firma_a_bytes, firma_desde_bytes,
+                             FIRMA_VACIA)
 
 class TestAlgoritmos(unittest.TestCase):
 
@@ -47,6 +57,269 @@ class TestAlgoritmos(unittest.TestCase):
         self.assertEqual(mh.obtener_mediana(), 3.5)
         mh.insertar(7)
         self.assertEqual(mh.obtener_mediana(), 5)
-        
+
+    def test_mediana_eliminable_coincide_con_lista_ordenada(self):
+        """Inserciones y eliminaciones al azar (con repetidos) contra el cálculo directo."""
+        rnd = random.Random(42)
+        mh = MedianHeapEliminable()
+        valores = []
+        for _ in range(500):
+            if valores and rnd.random() < 0.4:
+                valor = rnd.choice(valores)
+                valores.remove(valor)
+                mh.eliminar(valor)
+            else:
+                valor = rnd.randint(0, 20)
+                valores.append(valor)
+                mh.insertar(valor)
+            self.assertEqual(mh.size, len(valores))
+            if valores:
+                self.assertEqual(mh.obtener_mediana(), statistics.median(valores))
+
+    def test_mediana_eliminable_eliminar_inexistente_falla(self):
+        mh = MedianHeapEliminable()
+        mh.insertar(3)
+        with self.assertRaisesRegex(ValueError, "no está en el monticulo"):
+            mh.eliminar(4)
+        mh.eliminar(3)
+        with self.assertRaisesRegex(ValueError, "No hay suficientes elementos"):
+            mh.obtener_mediana()
+
+    def test_mediana_eliminable_ventana_de_tiempo(self):
+        ahora = datetime(2025, 6, 30)
+        mh = MedianHeapEliminable(ventana=timedelta(days=30))
+        mh.insertar(100, ahora - timedelta(days=60))
+        mh.insertar(1, ahora - timedelta(days=10))
+        mh.insertar(3, ahora - timedelta(days=5))
+        mh.insertar(50, ahora - timedelta(days=40))
+        self.assertEqual(mh.obtener_mediana(), 26.5)
+        mh.expirar(ahora)
+        self.assertEqual(mh.size, 2)
+        self.assertEqual(mh.obtener_mediana(), 2.0)
+        # Un valor eliminado explícitamente no se vuelve a descontar al expirar
+        mh.eliminar(1, ahora - timedelta(days=10))
+        mh.expirar(ahora + timedelta(days=26))
+        self.assertEqual(mh.size, 0)
+
+    def test_construir_desde_lista_cumple_propiedad_de_monticulo(self):
+        valores = [random.Random(1).randint(0, 50) for _ in range(101)]
+        minimo = MonticuloBinarioMin()
+        minimo.construir_desde_lista(valores)
+        maximo = MonticuloBinarioMax()
+        maximo.construir_desde_lista(valores)
+        self.assertEqual([minimo.eliminarMin() for _ in valores], sorted(valores))
+        self.assertEqual([maximo.eliminarMax() for _ in valores], sorted(valores, reverse=True))
+
+    def test_construir_desde_lista_con_none_falla(self):
+        with self.assertRaises(ValueError):
+            MonticuloBinarioMin().construir_desde_lista([1, None])
+
+    def test_insertar_muchos_equivale_a_insertar_uno_por_uno(self):
+        rnd = random.Random(7)
+        for cantidad in (1, 2, 5, 100):
+            valores = [rnd.randint(0, 10) for _ in range(cantidad)]
+            mh = MedianHeap()
+            mh.insertar_muchos(valores)
+            self.assertEqual(mh.size, cantidad)
+            self.assertEqual(mh.obtener_mediana(), statistics.median(valores))
+            # Las inserciones posteriores siguen funcionando sobre los montículos construidos
+            mh.insertar(3)
+            mh.insertar_muchos([9, 0])
+            self.assertEqual(mh.obtener_mediana(), statistics.median(valores + [3, 9, 0]))
+
+    def test_median_heap_eliminable_insertar_muchos(self):
+        rnd = random.Random(13)
+        valores = [rnd.randint(0, 30) for _ in range(101)]
+        mh = MedianHeapEliminable()
+        mh.insertar(7)
+        mh.eliminar(7)  # Queda pendiente de eliminar y se descarta al reconstruir
+        mh.insertar_muchos(valores)
+        self.assertEqual(mh.size, len(valores))
+        self.assertEqual(mh.obtener_mediana(), statistics.median(valores))
+        for v in valores[:50]:
+            mh.eliminar(v)
+        mh.insertar(4)
+        self.assertEqual(mh.obtener_mediana(), statistics.median(valores[50:] + [4]))
+        # Con ventana, los valores que ya quedaron afuera se descartan al expirar
+        ahora = datetime(2024, 6, 1)
+        mh = MedianHeapEliminable(timedelta(days=30))
+        mh.insertar_muchos([100, 1, 3], [ahora - timedelta(days=60), ahora - timedelta(days=10), ahora])
+        self.assertEqual(mh.obtener_mediana(), 3)
+        mh.expirar(ahora)
+        self.assertEqual(mh.obtener_mediana(), 2.0)
+
+    def test_monticulos_compactos_ordenan_igual_que_los_de_listas(self):
+        valores = [random.Random(3).randint(0, 50) for _ in range(200)]
+        minimo, maximo = MonticuloCompactoMin(), MonticuloCompactoMax()
+        for v in valores:
+            minimo.insertar(v)
+            maximo.insertar(v)
+        self.assertEqual([minimo.eliminarMin() for _ in valores], sorted(valores))
+        self.assertEqual([maximo.eliminarMax() for _ in valores], sorted(valores, reverse=True))
+        minimo.construir_desde_lista(valores)
+        self.assertEqual(minimo.listaMonticulo[1], min(valores))
+        self.assertEqual(minimo.tamanoActual, len(valores))
+
+    def test_median_heap_compacto(self):
+        rnd = random.Random(5)
+        valores = [rnd.randint(0, 100) for _ in range(99)]
+        mh = MedianHeapCompacto()
+        for v in valores:
+            mh.insertar(v)
+        self.assertEqual(mh.obtener_mediana(), statistics.median(valores))
+        mh.insertar_muchos([1, 2, 3])
+        self.assertEqual(mh.obtener_mediana(), statistics.median(valores + [1, 2, 3]))
+        self.assertGreater(mh.memoria_bytes(), 8 * len(valores))
+
+    def test_median_heap_eliminable_compacto(self):
+        rnd = random.Random(6)
+        valores = [rnd.randint(0, 100) for _ in range(99)]
+        mh = MedianHeapEliminableCompacto()
+        mh.insertar_muchos(valores[:50])
+        for v in valores[50:]:
+            mh.insertar(v)
+        self.assertEqual(mh.obtener_mediana(), statistics.median(valores))
+        for v in valores[:30]:
+            mh.eliminar(v)
+        self.assertEqual(mh.obtener_mediana(), statistics.median(valores[30:]))
+        self.assertGreater(mh.memoria_bytes(), 8 * len(valores[30:]))
+
+    def test_cola_prioridad_indexada_coincide_con_ordenamiento(self):
+        """Operaciones al azar contra un diccionario ordenado en cada paso."""
+        rnd = random.Random(11)
+        cola = ColaPrioridadIndexada()
+        esperado = {}  # clave -> (prioridad, orden de inserción)
+        for paso in range(400):
+            operacion = rnd.random()
+            if esperado and operacion < 0.3:
+                clave = rnd.choice(list(esperado))
+                nueva = rnd.randint(0, 10)
+                cola.actualizar_prioridad(clave, nueva)
+                esperado[clave] = (nueva, esperado[clave][1])
+            elif esperado and operacion < 0.45:
+                clave = rnd.choice(list(esperado))
+                cola.eliminar(clave)
+                del esperado[clave]
+            else:
+                cola.insertar(paso, rnd.randint(0, 10))
+                esperado[paso] = (cola.prioridad(paso), paso)
+            ordenado = sorted(esperado, key=lambda c: (-esperado[c][0], esperado[c][1]))
+            self.assertEqual(len(cola), len(esperado))
+            self.assertEqual([c for c, _ in cola.primeros(5)], ordenado[:5])
+
+    def test_cola_prioridad_indexada_construir_y_errores(self):
+        cola = ColaPrioridadIndexada()
+        cola.construir([(1, 2), (2, 7), (3, 7), (4, 0)])
+        self.assertEqual(cola.tope(), (2, 7))
+        self.assertEqual(cola.primeros(10), [(2, 7), (3, 7), (1, 2), (4, 0)])
+        cola.actualizar_prioridad(4, 9)
+        self.assertEqual(cola.tope(), (4, 9))
+        with self.assertRaisesRegex(ValueError, "ya está en la cola"):
+            cola.insertar(1, 5)
+        with self.assertRaisesRegex(ValueError, "no está en la cola"):
+            cola.actualizar_prioridad(99, 1)
+        with self.assertRaisesRegex(ValueError, "está vacía"):
+            ColaPrioridadIndexada().tope()
+
+    def test_sketch_cuantiles_exacto_con_pocos_valores(self):
+        sketch = SketchCuantiles(k=50)
+        sketch.insertar_muchos([5, 1, 4, 2, 3])
+        self.assertEqual(sketch.cuantiles([0, 0.5, 1]), [1, 3, 5])
+        with self.assertRaisesRegex(ValueError, "entre 0 y 1"):
+            sketch.cuantil(1.5)
+        with self.assertRaisesRegex(ValueError, "No hay suficientes elementos"):
+            SketchCuantiles().cuantil(0.5)
+
+    def test_sketch_cuantiles_memoria_acotada_y_combinable(self):
+        rnd = random.Random(9)
+        valores = [rnd.randint(0, 365) for _ in range(20000)]
+        por_departamento = [SketchCuantiles(k=200, semilla=i) for i in range(4)]
+        for i, valor in enumerate(valores):
+            por_departamento[i % 4].insertar(valor)
+        total = SketchCuantiles(k=200, semilla=99)
+        for sketch in por_departamento:
+            total.combinar(sketch)
+
+        self.assertEqual(total.size, len(valores))
+        self.assertLess(total.elementos_retenidos, 3 * 200)
+        ordenados = sorted(valores)
+        for q in (0.5, 0.75, 0.9, 0.99):
+            estimado = total.cuantil(q)
+            # El rango del valor estimado queda cerca del rango pedido
+            rango_min = ordenados.index(estimado) / len(valores)
+            rango_max = (len(ordenados) - ordenados[::-1].index(estimado)) / len(valores)
+            self.assertTrue(rango_min - 0.03 <= q <= rango_max + 0.03, (q, estimado))
+
+    def _indice_de_prueba(self):
+        indice = IndiceInvertidoTFIDF()
+        indice.agregar(1, "No anda el wifi en el aula 3", "soporte informático")
+        indice.agregar(2, "El wifi de la biblioteca no funciona", "soporte informático")
+        indice.agregar(3, "El proyector del aula 3 no enciende", "soporte informático")
+        indice.agregar(4, "El baño de la planta baja está inundado", "maestranza")
+        return indice
+
+    def test_indice_similitud_ordena_por_similitud_coseno(self):
+        indice = self._indice_de_prueba()
+        resultados = indice.buscar("no anda el wifi del aula 3", umbral=0.05)
+        self.assertEqual([id_reclamo for id_reclamo, _ in resultados], [1, 3, 2])
+        self.assertAlmostEqual(resultados[0][1], 1.0)
+        self.assertTrue(all(0 < similitud <= 1 for _, similitud in resultados))
+        # El umbral y la cantidad acotan los resultados
+        self.assertEqual([i for i, _ in indice.buscar("no anda el wifi del aula 3", cantidad=1)], [1])
+        self.assertEqual(indice.buscar("mesa rota", umbral=0.05), [])
+
+    def test_indice_similitud_filtra_por_departamento(self):
+        indice = self._indice_de_prueba()
+        self.assertEqual(indice.buscar("wifi del aula 3", departamento="maestranza"), [])
+        self.assertEqual([i for i, _ in indice.buscar("baño inundado", departamento="maestranza")], [4])
+        self.assertEqual(indice.buscar("baño inundado", departamento="otro"), [])
+
+    def test_indice_similitud_se_actualiza_al_derivar_y_eliminar(self):
+        indice = self._indice_de_prueba()
+        indice.cambiar_departamento(1, "maestranza")
+        self.assertEqual([i for i, _ in indice.buscar("wifi", departamento="soporte informático")], [2])
+        self.assertEqual([i for i, _ in indice.buscar("wifi", departamento="maestranza")], [1])
+        indice.eliminar(2)
+        indice.eliminar(99)
+        self.assertNotIn(2, indice)
+        self.assertEqual(len(indice), 3)
+        self.assertEqual([i for i, _ in indice.buscar("wifi biblioteca")], [1])
+
+    def test_indice_similitud_no_distingue_mayusculas_en_el_departamento(self):
+        indice = IndiceInvertidoTFIDF()
+        indice.agregar(1, "El wifi de la biblioteca no funciona", "Secretaría Técnica")
+        indice.agregar(2, "No anda el wifi del aula 3", "soporte")
+        self.assertEqual([i for i, _ in indice.buscar("wifi", departamento="secretaría técnica ")], [1])
+        indice.cambiar_departamento(2, " SECRETARÍA técnica")
+        self.assertEqual(sorted(i for i, _ in indice.buscar("wifi", departamento="Secretaría Técnica")), [1, 2])
+        self.assertEqual(indice.buscar("wifi", departamento="soporte"), [])
+
+    def test_minhash_estima_la_similitud_de_jaccard(self):
+        palabras = [f"palabra{i}" for i in range(40)]
+        # Jaccard = 30 / 50 = 0.6
+        firma_a = calcular_firma(" ".join(palabras[:40]), tokenizador="regex")
+        firma_b = calcular_firma(" ".join(palabras[10:40] + [f"otra{i}" for i in range(10)]), tokenizador="regex")
+        self.assertAlmostEqual(similitud_estimada(firma_a, firma_b), 0.6, delta=0.15)
+        self.assertEqual(similitud_estimada(firma_a, firma_a), 1.0)
+        self.assertEqual(firma_desde_bytes(firma_a_bytes(firma_a)), firma_a)
+        self.assertEqual(calcular_firma("el de la", tokenizador="regex"), FIRMA_VACIA)
+        with self.assertRaises(ValueError):
+            firma_desde_bytes(b"\x00" * 8)
+
+    def test_lsh_encuentra_casi_duplicados_sin_comparar_con_todos(self):
+        indice = IndiceLSH()
+        for i in range(500):
+            indice.agregar(i, calcular_firma(f"reclamo{i} aula{i} tema{i} edificio{i}", tokenizador="regex"))
+        indice.agregar(1000, calcular_firma("No anda el wifi de la biblioteca central", tokenizador="regex"))
+        indice.agregar(1001, calcular_firma("", tokenizador="regex"))
+        firma = calcular_firma("no anda el wifi en la biblioteca central!!", tokenizador="regex")
+        self.assertEqual([i for i, _ in indice.buscar_duplicados(firma)], [1000])
+        self.assertLess(len(indice.candidatos(firma)), 5)
+        self.assertNotIn(1001, indice)
+        self.assertEqual(indice.candidatos(FIRMA_VACIA), set())
+        indice.eliminar(1000)
+        self.assertEqual(indice.buscar_duplicados(firma), [])
+        self.assertEqual(len(indice), 500)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -3,8 +3,18 @@ import unittest
 from unittest.mock import MagicMock, patch
 from modules.gestor_usuarios import GestorDeUsuarios
 from modules.gestor_reclamos import GestorDeReclamos
+from modules.analitica import Analitica
+from modules.cache_versionada import CacheVersionada
+from modules.reporte_base import ETAPA_DATOS, ETAPA_RENDERIZADO
+from modules.graficador_concreto import GraficadorMatplotlib
+from modules.cola_reportes import ColaReportes, TERMINADO, EN_COLA, ERROR
 from modules.dominio import Usuario, Reclamo
-from datetime import datetime
+from modules.monticulo_compacto import MedianHeapEliminableCompacto
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+import time
+from matplotlib.figure import Figure
 
 class TestGestores(unittest.TestCase):
 
@@ -37,20 +47,30 @@ class TestGestores(unittest.TestCase):
         # Arrange: Simulamos que el repo devuelve reclamos con distintos estados
         reclamo_pendiente = MagicMock(spec=Reclamo)
         reclamo_pendiente.to_dict.return_value = {'id': 1, 'estado': 'pendiente'}
-        self.mock_repo_reclamos.obtener_registros_por_filtros.return_value = [reclamo_pendiente]
+        self.mock_repo_reclamos.obtener_registros_con_adherentes.return_value = [reclamo_pendiente]
         
         # Act
         resultado = self.gestor_reclamos.listar_reclamos_para_usuarios()
 
         # Assert
         # Verificamos que se llamó al repo pidiendo explícitamente solo los pendientes
-        self.mock_repo_reclamos.obtener_registros_por_filtros.assert_called_with(estado="pendiente")
+        self.mock_repo_reclamos.obtener_registros_con_adherentes.assert_called_with(estado="pendiente")
         self.assertEqual(len(resultado), 1)
 
     def test_listar_reclamos_por_depto_y_estado(self):
-        self.mock_repo_reclamos.obtener_registros_por_filtros.return_value = []
+        self.mock_repo_reclamos.obtener_registros_con_adherentes.return_value = []
         self.gestor_reclamos.listar_reclamos_por_departamento("Soporte", "resuelto")
-        self.mock_repo_reclamos.obtener_registros_por_filtros.assert_called_with(departamento="Soporte", estado="resuelto")
+        self.mock_repo_reclamos.obtener_registros_con_adherentes.assert_called_with(departamento="Soporte", estado="resuelto")
+
+    def test_listar_reclamos_no_cuenta_adherentes_por_reclamo(self):
+        self.mock_repo_reclamos.obtener_registros_con_adherentes.return_value = [MagicMock(spec=Reclamo)] * 3
+        self.gestor_reclamos.obtener_todos_los_reclamos()
+        self.mock_repo_reclamos.contar_adherentes.assert_not_called()
+
+    def test_listar_reclamos_paginados_acota_el_limite(self):
+        self.mock_repo_reclamos.obtener_pagina.return_value = ([], None)
+        self.gestor_reclamos.listar_reclamos_paginados(None, 10_000, departamento=" Soporte ")
+        self.mock_repo_reclamos.obtener_pagina.assert_called_with(200, None, departamento="Soporte")
 
     def test_eliminar_reclamo_no_existente_falla(self):
         self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = None
@@ -61,10 +81,322 @@ class TestGestores(unittest.TestCase):
         self.gestor_reclamos.adherir_a_reclamo(1, 2)
         self.mock_repo_reclamos.adherir_usuario_a_reclamo.assert_called_once_with(1, 2)
 
+    def test_estadisticas_se_actualizan_con_cada_cambio(self):
+        reclamo = Reclamo(1, "Proyector roto en el aula", "pendiente", 1, "Soporte")
+        self.mock_repo_reclamos.obtener_todos_los_registros.return_value = [reclamo]
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = reclamo
+        self.mock_repo_reclamos.contar_adherentes_multiples.return_value = {1: 0}
+        gestor = GestorDeReclamos(self.mock_repo_reclamos, self.mock_clasificador)
+        self.assertEqual(gestor.obtener_estadisticas("soporte")["pendientes"], 1)
+
+        gestor.agregar_nuevo_reclamo("Proyector sin cable", 2, "Soporte")
+        stats = gestor.obtener_estadisticas("Soporte")
+        self.assertEqual((stats["total"], stats["pendientes"]), (2, 2))
+        self.assertEqual(stats["palabras_clave"][0], ("proyector", 2))
+
+        gestor.actualizar_estado_reclamo(1, "en proceso", 5)
+        stats = gestor.obtener_estadisticas("Soporte")
+        self.assertEqual((stats["pendientes"], stats["en_proceso"]), (1, 1))
+        self.assertEqual(stats["mediana_en_proceso"], 5)
+
+        gestor.derivar_reclamo(1, "Maestranza")
+        self.assertEqual(gestor.obtener_estadisticas("Soporte")["total"], 1)
+        self.assertEqual(gestor.obtener_estadisticas("Maestranza")["en_proceso"], 1)
+        self.assertEqual(gestor.obtener_estadisticas()["total"], 2)
+
+        gestor.eliminar_reclamo(1)
+        self.assertEqual(gestor.obtener_estadisticas("Maestranza")["total"], 0)
+        self.assertEqual(gestor.obtener_estadisticas()["total"], 1)
+
+    def test_estadisticas_con_monticulos_compactos(self):
+        creacion = datetime(2025, 1, 1)
+        reclamos = [Reclamo(i, "Reclamo", "resuelto", 1, "Soporte", p_fecha_creacion=creacion,
+                            p_fecha_resolucion=creacion + timedelta(days=i)) for i in (1, 2, 6)]
+        self.mock_repo_reclamos.obtener_todos_los_registros.return_value = reclamos
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = reclamos[2]
+        gestor = GestorDeReclamos(self.mock_repo_reclamos, self.mock_clasificador, MedianHeapEliminableCompacto)
+        self.assertEqual(gestor.obtener_estadisticas("Soporte")["mediana_resueltos"], 2)
+        gestor.eliminar_reclamo(3)
+        self.assertEqual(gestor.obtener_estadisticas()["mediana_resueltos"], 1.5)
+
+    def test_ranking_de_pendientes_se_actualiza_con_cada_adhesion(self):
+        reclamos = [Reclamo(i, f"Reclamo {i}", "pendiente", 1, "Soporte") for i in (1, 2, 3)]
+        self.mock_repo_reclamos.obtener_todos_los_registros.return_value = reclamos
+        self.mock_repo_reclamos.contar_adherentes_multiples.return_value = {1: 1, 2: 3, 3: 0}
+        self.mock_repo_reclamos.obtener_registros_por_ids.side_effect = \
+            lambda ids: [next(r for r in reclamos if r.id == i) for i in ids]
+        gestor = GestorDeReclamos(self.mock_repo_reclamos, self.mock_clasificador)
+        self.assertEqual([r.id for r in gestor.obtener_reclamos_mas_adheridos(2)], [2, 1])
+
+        gestor.adherir_a_reclamo(5, 3)
+        gestor.adherir_a_reclamo(6, 3)
+        gestor.adherir_a_reclamo(7, 3)
+        gestor.adherir_a_reclamo(8, 3)
+        primeros = gestor.obtener_reclamos_mas_adheridos(2)
+        self.assertEqual([(r.id, r.adherentes) for r in primeros], [(3, 4), (2, 3)])
+
+        # Un reclamo que deja de estar pendiente sale del ranking
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = reclamos[2]
+        gestor.actualizar_estado_reclamo(3, "resuelto")
+        self.assertEqual([r.id for r in gestor.obtener_reclamos_mas_adheridos(5)], [2, 1])
+
+    def test_estadisticas_incluyen_percentiles_por_departamento_y_globales(self):
+        creacion = datetime(2025, 1, 1)
+        reclamos = [Reclamo(i, "Reclamo", "resuelto", 1, depto, p_fecha_creacion=creacion,
+                            p_fecha_resolucion=creacion + timedelta(days=i))
+                    for i, depto in enumerate(["Soporte", "Maestranza"] * 50, start=1)]
+        self.mock_repo_reclamos.obtener_todos_los_registros.return_value = reclamos
+        gestor = GestorDeReclamos(self.mock_repo_reclamos, self.mock_clasificador)
+        stats = gestor.obtener_estadisticas()
+        self.assertEqual(stats["percentiles_resueltos"], {"p75": 75, "p90": 90, "p99": 99})
+        self.assertNotIn("percentiles_en_proceso", stats)
+        self.assertEqual(gestor.obtener_estadisticas("soporte")["percentiles_resueltos"]["p99"], 99)
+
+        # Los percentiles resumen el historial de resoluciones: una baja o una derivación no los cambia
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = reclamos[98]
+        gestor.eliminar_reclamo(99)
+        self.assertEqual(gestor.obtener_estadisticas("Soporte")["percentiles_resueltos"]["p99"], 99)
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = reclamos[0]
+        gestor.derivar_reclamo(1, "Maestranza")
+        self.assertEqual(gestor.obtener_estadisticas()["percentiles_resueltos"]["p75"], 75)
+
+        # Un reclamo cuenta una vez al resolverse, no al pasar a "en proceso"
+        reclamo = Reclamo(101, "Reclamo", "pendiente", 1, "Intendencia", p_fecha_creacion=creacion)
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = reclamo
+        gestor.actualizar_estado_reclamo(101, "en proceso", dias_resolucion=3)
+        self.assertIsNone(gestor.obtener_estadisticas("Intendencia")["percentiles_resueltos"])
+        gestor.actualizar_estado_reclamo(101, "resuelto")
+        gestor.actualizar_estado_reclamo(101, "resuelto")
+        dias = reclamo.calcular_tiempo_resolucion()
+        self.assertEqual(gestor.obtener_estadisticas("Intendencia")["percentiles_resueltos"],
+                         {"p75": dias, "p90": dias, "p99": dias})
+
+    def test_clasificar_descripcion_usa_las_clases_del_modelo(self):
+        self.mock_clasificador.predict.return_value = ["maestranza"]
+        self.assertEqual(self.gestor_reclamos.clasificar_descripcion("Baño inundado"), "maestranza")
+        self.mock_clasificador.predict.assert_called_once_with(["Baño inundado"])
+
+    def test_buscar_similares_devuelve_los_pendientes_mas_parecidos(self):
+        self.mock_repo_reclamos.obtener_todos_los_registros.return_value = [
+            Reclamo(1, "No anda el wifi del aula 3", "pendiente", 1, "soporte informático"),
+            Reclamo(2, "El proyector del aula 3 no enciende", "pendiente", 1, "soporte informático"),
+            Reclamo(3, "No anda el wifi del laboratorio", "resuelto", 1, "soporte informático"),
+        ]
+        self.mock_repo_reclamos.contar_adherentes_multiples.return_value = {1: 0, 2: 0}
+        self.mock_repo_reclamos.obtener_registros_por_ids.side_effect = lambda ids: [
+            Reclamo(i, "Reclamo", "pendiente", 1, "soporte informático") for i in ids]
+        self.mock_clasificador.predict.return_value = ["soporte informático"]
+        gestor = GestorDeReclamos(self.mock_repo_reclamos, self.mock_clasificador)
+
+        similares = gestor.buscar_similares("El wifi no anda")
+        self.assertEqual([r.id for r in similares], [1])
+        self.assertGreater(similares[0].similitud, 0.5)
+        # Al resolverse deja de ser un reclamo similar
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = \
+            Reclamo(1, "No anda el wifi del aula 3", "pendiente", 1, "soporte informático")
+        gestor.actualizar_estado_reclamo(1, "inválido")
+        self.assertEqual(gestor.buscar_similares("El wifi no anda"), [])
+
+    def test_reclamo_nuevo_guarda_su_firma_y_se_detecta_como_duplicado(self):
+        guardados = []
+        def guardar(reclamo):
+            reclamo.id = 7
+            guardados.append(reclamo)
+        self.mock_repo_reclamos.guardar_registro.side_effect = guardar
+        self.gestor_reclamos.agregar_nuevo_reclamo("No anda el wifi de la biblioteca", 1, "soporte informático")
+        self.assertIsNotNone(guardados[0].minhash)
+
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = guardados[0]
+        duplicado = self.gestor_reclamos.buscar_duplicado("no anda el WiFi en la biblioteca")
+        self.assertEqual(duplicado.id, 7)
+        self.assertGreaterEqual(duplicado.similitud, 0.5)
+        self.assertIsNone(self.gestor_reclamos.buscar_duplicado("El baño está inundado"))
+
+    def test_version_de_datos_aumenta_con_cada_modificacion_del_departamento(self):
+        version_soporte, _ = self.gestor_reclamos.obtener_version_datos("Soporte")
+        self.gestor_reclamos.agregar_nuevo_reclamo("Proyector roto", 1, "soporte ")
+        self.assertEqual(self.gestor_reclamos.obtener_version_datos("Soporte")[0], version_soporte + 1)
+        self.assertEqual(self.gestor_reclamos.obtener_version_datos("Maestranza")[0], 0)
+        self.assertEqual(self.gestor_reclamos.obtener_version_datos()[0], 1)
+
+        self.mock_repo_reclamos.obtener_registro_por_filtro.return_value = \
+            Reclamo(1, "Proyector roto", "pendiente", 1, "Soporte")
+        self.gestor_reclamos.derivar_reclamo(1, "Maestranza")
+        self.assertEqual(self.gestor_reclamos.obtener_version_datos("soporte")[0], 2)
+        self.assertEqual(self.gestor_reclamos.obtener_version_datos("Maestranza")[0], 1)
+
     def test_clasificar_descripcion_sin_clasificador_falla(self):
         gestor_sin_clf = GestorDeReclamos(self.mock_repo_reclamos, None)
         with self.assertRaisesRegex(ValueError, "Clasificador no configurado"):
             gestor_sin_clf.clasificar_descripcion("test")
-            
+
+class TestAnalitica(unittest.TestCase):
+
+    def setUp(self):
+        self.gestor = GestorDeReclamos(MagicMock(), MagicMock())
+
+    def test_reporte_en_cache_hasta_que_cambian_los_datos(self):
+        analitica = Analitica(self.gestor, MagicMock())
+        with patch('modules.analitica.ReporteHTML.generar', return_value="<html>reporte</html>") as mock_generar:
+            primero = analitica.generar_reporte_formateado("Soporte", "html")
+            self.assertEqual(analitica.generar_reporte_formateado("soporte", "html"), primero)
+            mock_generar.assert_called_once()
+            etag, _ = analitica.obtener_validadores_reporte("Soporte", "html")
+
+            self.gestor.agregar_nuevo_reclamo("Proyector roto", 1, "Soporte")
+            analitica.generar_reporte_formateado("Soporte", "html")
+            self.assertEqual(mock_generar.call_count, 2)
+            self.assertNotEqual(analitica.obtener_validadores_reporte("Soporte", "html")[0], etag)
+        with self.assertRaisesRegex(ValueError, "no soportado"):
+            analitica.obtener_validadores_reporte("Soporte", "docx")
+
+    def test_grafico_en_cache_hasta_que_cambian_los_datos(self):
+        graficador = MagicMock()
+        graficador.crear_grafico_torta.return_value = b"png"
+        graficador.crear_nube_palabras.return_value = None
+        analitica = Analitica(self.gestor, graficador)
+        self.assertEqual(analitica.obtener_imagen_grafico("torta", "Soporte"), b"png")
+        self.assertEqual(analitica.obtener_imagen_grafico("torta", "soporte "), b"png")
+        graficador.crear_grafico_torta.assert_called_once()
+        # La falta de datos también queda en caché
+        self.assertIsNone(analitica.obtener_imagen_grafico("nube", "Soporte"))
+        self.assertIsNone(analitica.obtener_imagen_grafico("nube", "Soporte"))
+        graficador.crear_nube_palabras.assert_called_once()
+        etag, _ = analitica.obtener_validadores_grafico("torta", "Soporte")
+
+        self.gestor.agregar_nuevo_reclamo("Proyector roto", 1, "Soporte")
+        analitica.obtener_imagen_grafico("torta", "Soporte")
+        self.assertEqual(graficador.crear_grafico_torta.call_count, 2)
+        self.assertNotEqual(analitica.obtener_validadores_grafico("torta", "Soporte")[0], etag)
+        with self.assertRaisesRegex(ValueError, "no válido"):
+            analitica.obtener_validadores_grafico("barras", "Soporte")
+
+    def test_etag_distingue_departamentos_con_la_misma_version(self):
+        analitica = Analitica(self.gestor, MagicMock())
+        maestranza, _ = analitica.obtener_validadores_reporte("Maestranza", "pdf")
+        soporte, _ = analitica.obtener_validadores_reporte("Soporte informático", "pdf")
+        self.assertNotEqual(maestranza, soporte)
+        self.assertEqual(analitica.obtener_validadores_reporte(" soporte INFORMÁTICO", "pdf")[0], soporte)
+        self.assertTrue(soporte.isascii())
+        self.assertNotEqual(analitica.obtener_validadores_grafico("torta", "Maestranza")[0],
+                            analitica.obtener_validadores_grafico("torta", "Soporte informático")[0])
+
+    def test_reporte_informa_sus_etapas(self):
+        analitica = Analitica(self.gestor, MagicMock())
+        etapas = []
+        with patch('modules.reporte_concreto.render_template', return_value="<html></html>"):
+            analitica.generar_reporte_formateado("Soporte", "html", etapas.append)
+            self.assertEqual(etapas, [ETAPA_DATOS, ETAPA_RENDERIZADO])
+            # Un reporte en caché no pasa por ninguna etapa
+            analitica.generar_reporte_formateado("Soporte", "html", etapas.append)
+            self.assertEqual(len(etapas), 2)
+
+class TestCacheVersionada(unittest.TestCase):
+
+    def test_cache_versionada_acotada_en_bytes(self):
+        cache = CacheVersionada(capacidad_bytes=10)
+        cache.guardar("a", 1, "A", 6)
+        cache.guardar("b", 1, "B", 4)
+        self.assertEqual(cache.obtener("a", 1), "A")
+        self.assertIsNone(cache.obtener("a", 2))
+        cache.guardar("c", 1, "C", 3)  # Se descarta "b", el usado hace más tiempo
+        self.assertIsNone(cache.obtener("b", 1))
+        cache.guardar("d", 1, "D", 11)  # Más grande que la capacidad: no se guarda
+        self.assertEqual(cache.estadisticas, {"aciertos": 1, "fallos": 2, "entradas": 2, "bytes": 9})
+
+class TestColaReportes(unittest.TestCase):
+
+    def test_deduplica_pedidos_identicos_e_informa_la_etapa(self):
+        liberar = Event()
+        generados = []
+        def generar(departamento, formato, informar_etapa):
+            informar_etapa("renderizando")
+            liberar.wait(5)
+            generados.append((departamento, formato))
+            return ("<html></html>", "text/html", {})
+        cola = ColaReportes(generar, max_trabajadores=1, max_en_espera=1)
+        self.addCleanup(cola.cerrar)
+        self.addCleanup(liberar.set)
+        primero = cola.encolar("Soporte", "html", 3)
+        self.assertIs(cola.encolar("soporte ", "html", 3), primero)
+        for _ in range(100):
+            if primero.etapa is not None:
+                break
+            time.sleep(0.01)
+        self.assertEqual(primero.etapa, "renderizando")
+        en_espera = cola.encolar("Soporte", "pdf", 3)
+        self.assertEqual(en_espera.estado, EN_COLA)
+        self.assertIsNone(en_espera.etapa)
+        self.assertEqual(cola.posicion(en_espera), 0)
+        with self.assertRaisesRegex(ValueError, "demasiados reportes"):
+            cola.encolar("Maestranza", "html", 0)
+        liberar.set()
+        cola.cerrar()
+        self.assertEqual(primero.estado, TERMINADO)
+        self.assertIsNone(primero.etapa)
+        self.assertEqual(primero.resultado[1], "text/html")
+        self.assertEqual(sorted(generados), [("Soporte", "html"), ("Soporte", "pdf")])
+
+    def test_descarta_trabajos_vencidos_y_reintenta_errores(self):
+        def generar(departamento, formato, informar_etapa):
+            raise RuntimeError("sin datos")
+        cola = ColaReportes(generar, ttl=0)
+        fallido = cola.encolar("Soporte", "html", 1)
+        cola.cerrar()
+        self.assertEqual(fallido.estado, ERROR)
+        self.assertEqual(fallido.error, "sin datos")
+        with patch('modules.cola_reportes.time.monotonic', return_value=fallido.finalizado + 1):
+            self.assertIsNone(cola.obtener(fallido.id))
+        self.assertIsNot(cola.encolar("Soporte", "html", 1), fallido)
+        cola.cerrar()
+        with self.assertRaises(ValueError):
+            ColaReportes(generar, max_trabajadores=0)
+
+class TestGraficadorMatplotlib(unittest.TestCase):
+
+    def setUp(self):
+        self.datos_a = {'Pendientes': 3, 'En proceso': 0, 'Resueltos': 5, 'Inválidos': 1}
+        self.datos_b = {'Pendientes': 1, 'En proceso': 2, 'Resueltos': 3, 'Inválidos': 4}
+
+    def test_reutiliza_figuras_entre_hilos(self):
+        graficador = GraficadorMatplotlib()
+        imagen_a = graficador.crear_grafico_torta(self.datos_a, 'Reclamos - Soporte')
+        self.assertTrue(imagen_a.startswith(b'\x89PNG'))
+        # Reutilizar la figura con otros datos no deja restos del gráfico anterior
+        graficador.crear_grafico_torta(self.datos_b, 'Reclamos - Maestranza')
+        self.assertEqual(graficador.crear_grafico_torta(self.datos_a, 'Reclamos - Soporte'), imagen_a)
+        self.assertIsNone(graficador.crear_grafico_torta({'Pendientes': 0}, 'Vacío'))
+
+        def dibujar(i):
+            if i % 2:
+                return graficador.crear_grafico_torta(self.datos_a, 'Reclamos - Soporte')
+            return graficador.crear_grafico_torta(self.datos_b, 'Reclamos - Maestranza')
+        with ThreadPoolExecutor(max_workers=8) as ejecutor:
+            imagenes = list(ejecutor.map(dibujar, range(32)))
+        self.assertTrue(all(imagen == imagen_a for imagen in imagenes[1::2]))
+        self.assertEqual(len(set(imagenes[0::2])), 1)
+
+    def test_reutiliza_figuras_con_un_hilo_nuevo_por_peticion(self):
+        graficador = GraficadorMatplotlib()
+        with patch('modules.graficador_concreto.Figure', wraps=Figure) as mock_figura:
+            # Como el servidor de Werkzeug, que atiende cada petición en un hilo nuevo
+            for datos in (self.datos_a, self.datos_b, self.datos_a):
+                hilo = Thread(target=graficador.crear_grafico_torta, args=(datos, 'Reclamos'))
+                hilo.start()
+                hilo.join()
+            hilo = Thread(target=graficador.crear_nube_palabras, args=([('proyector', 3)], 'Nube'))
+            hilo.start()
+            hilo.join()
+            graficador.crear_nube_palabras([('aula', 2)], 'Nube')
+        self.assertEqual(mock_figura.call_count, 2)
+
+    def test_svg(self):
+        graficador = GraficadorMatplotlib('svg')
+        self.assertEqual(graficador.mimetype, 'image/svg+xml')
+        imagen = graficador.crear_grafico_barras({'a': 1, 'b': 2}, 'Barras', 'x', 'y')
+        self.assertIn(b'<svg', imagen)
+        with self.assertRaisesRegex(ValueError, "no soportado"):
+            GraficadorMatplotlib('gif')
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
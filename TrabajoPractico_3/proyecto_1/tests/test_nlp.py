@@ -0,0 +1,210 @@
+# tests/test_nlp.py
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from scipy.sparse import issparse
+from modules.recursos_nlp import STOP_WORDS_ES, tokenizar_punkt
+from concurrent.futures import ThreadPoolExecutor
+from modules.classifier import ClaimsClassifier
+from modules.clasificacion_por_lotes import ServicioClasificacionPorLotes
+from modules.modelo_clasificador import ModeloClasificador, guardar_modelo, cargar_modelo, VERSION_FORMATO
+from modules.text_vectorizer import TextVectorizer, obtener_raiz
+
+RECLAMOS = [
+    "El proyector del aula 2 no funciona",
+    "No funciona la impresora, ni el proyector",
+    "El baño de la planta baja está inundado",
+]
+
+class TestTextVectorizer(unittest.TestCase):
+
+    def test_transform_devuelve_matriz_dispersa_igual_a_la_densa(self):
+        dispersa = TextVectorizer().fit(RECLAMOS).transform(RECLAMOS)
+        densa = TextVectorizer(salida_dispersa=False).fit(RECLAMOS).transform(RECLAMOS)
+        self.assertTrue(issparse(dispersa))
+        self.assertEqual(dispersa.format, "csr")
+        self.assertFalse(issparse(densa))
+        self.assertEqual(dispersa.shape, densa.shape)
+        self.assertTrue((dispersa.toarray() == densa).all())
+
+    def test_clasificador_se_entrena_con_la_matriz_dispersa(self):
+        clf = ClaimsClassifier().fit(RECLAMOS * 4, ["soporte", "soporte", "maestranza"] * 4)
+        # Un StandardScaler que centra los datos rechazaría la matriz dispersa
+        self.assertFalse(clf.clf_.named_steps["scaler"].with_mean)
+        self.assertTrue(issparse(clf.clf_.named_steps["vectorizer"].transform(RECLAMOS)))
+        self.assertEqual(list(clf.predict(RECLAMOS)), ["soporte", "soporte", "maestranza"])
+
+    def test_tokenizador_regex_descarta_puntuacion_y_stopwords(self):
+        vectorizador = TextVectorizer(tokenizador="regex").fit(RECLAMOS)
+        self.assertIn(obtener_raiz("proyector"), vectorizador.vocabulario_)
+        self.assertNotIn("el", vectorizador.vocabulario_)
+        self.assertNotIn(",", vectorizador.vocabulario_)
+        # Las palabras que no están en el vocabulario se ignoran
+        self.assertEqual(vectorizador.transform(["palabrasdesconocidas"]).nnz, 0)
+
+    def test_fit_en_paralelo_da_el_mismo_vocabulario(self):
+        # Muchas palabras con la misma frecuencia: el orden depende de la primera aparición
+        corpus = [f"reclamo{i} aula{i % 7} {RECLAMOS[i % 3]}" for i in range(60)]
+        serial = TextVectorizer(tokenizador="regex").fit(corpus)
+        paralelo = TextVectorizer(tokenizador="regex", n_jobs=3).fit(corpus)
+        self.assertEqual(paralelo.vocabulario_, serial.vocabulario_)
+        self.assertEqual((paralelo.transform(corpus) != serial.transform(corpus)).nnz, 0)
+
+    def test_tokenizador_invalido_falla(self):
+        with self.assertRaisesRegex(ValueError, "no soportado"):
+            TextVectorizer(tokenizador="espacios")
+
+    def test_cache_de_raices_compartida_entre_instancias(self):
+        TextVectorizer(tokenizador="regex").fit(RECLAMOS)
+        aciertos = obtener_raiz.cache_info().hits
+        TextVectorizer(tokenizador="regex").fit(RECLAMOS)
+        self.assertGreater(obtener_raiz.cache_info().hits, aciertos)
+
+    def test_vectorizador_serializado_conserva_configuracion(self):
+        vectorizador = TextVectorizer(tokenizador="regex").fit(RECLAMOS)
+        restaurado = pickle.loads(pickle.dumps(vectorizador))
+        self.assertEqual((restaurado.tokenizador, restaurado.salida_dispersa), ("regex", True))
+        self.assertTrue((restaurado.transform(RECLAMOS) != vectorizador.transform(RECLAMOS)).nnz == 0)
+
+    def test_vectorizador_serializado_antes_de_las_opciones_usa_los_valores_anteriores(self):
+        vectorizador = TextVectorizer(tokenizador="regex").fit(RECLAMOS)
+        del vectorizador.__dict__["salida_dispersa"], vectorizador.__dict__["tokenizador"]
+        restaurado = pickle.loads(pickle.dumps(vectorizador))
+        self.assertEqual((restaurado.tokenizador, restaurado.salida_dispersa), ("punkt", False))
+
+# Se ejecuta en un proceso nuevo: sin datos de NLTK disponibles y con las descargas prohibidas
+ARRANQUE_EN_FRIO = """
+import time
+inicio = time.perf_counter()
+import nltk
+nltk.data.path[:] = []
+def descarga_prohibida(*args, **kwargs):
+    raise AssertionError("Se intentó descargar un recurso de NLTK")
+nltk.download = descarga_prohibida
+from modules.text_vectorizer import TextVectorizer
+from modules.estadisticas import extraer_palabras_clave
+TextVectorizer().fit_transform(["El proyector del aula 2 no funciona.", "Baño inundado"])
+extraer_palabras_clave("El proyector del aula no funciona")
+print(time.perf_counter() - inicio)
+"""
+
+class TestRecursosNLP(unittest.TestCase):
+
+    def test_stop_words_incluidas_en_el_proyecto(self):
+        self.assertIsInstance(STOP_WORDS_ES, frozenset)
+        self.assertIn("el", STOP_WORDS_ES)
+        self.assertIn("está", STOP_WORDS_ES)
+        self.assertIs(TextVectorizer().stop_words, STOP_WORDS_ES)
+
+    def test_tokenizar_punkt_separa_oraciones_y_puntuacion(self):
+        self.assertEqual(tokenizar_punkt("La red no anda. El aula 3, tampoco."),
+                         ["La", "red", "no", "anda", ".", "El", "aula", "3", ",", "tampoco", "."])
+
+    def test_arranque_en_frio_sin_red_ni_datos_de_nltk(self):
+        raiz_proyecto = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        resultado = subprocess.run([sys.executable, "-c", ARRANQUE_EN_FRIO], cwd=raiz_proyecto,
+                                   capture_output=True, text=True, timeout=60)
+        self.assertEqual(resultado.returncode, 0, resultado.stderr)
+        segundos = float(resultado.stdout.strip().splitlines()[-1])
+        self.assertLess(segundos, 10)
+
+class TestModeloClasificador(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "modelo.pkl")
+
+    def test_artefacto_se_carga_al_clasificar_y_devuelve_departamentos(self):
+        clf = ClaimsClassifier(tokenizador="regex").fit(RECLAMOS * 4, ["soporte", "soporte", "maestranza"] * 4)
+        guardar_modelo(self.ruta, clf.clf_, clf.encoder_.classes_, cantidad_ejemplos=12)
+        modelo = ModeloClasificador(self.ruta)
+        self.assertFalse(modelo.cargado)
+        self.assertEqual(modelo.predict(RECLAMOS), list(clf.predict(RECLAMOS)))
+        self.assertTrue(modelo.cargado)
+        self.assertEqual(modelo.clases, ("maestranza", "soporte"))
+        self.assertEqual(modelo.metadatos["cantidad_ejemplos"], 12)
+
+    def test_reclamos_repetidos_no_vuelven_a_clasificarse(self):
+        clf = ClaimsClassifier(tokenizador="regex").fit(RECLAMOS * 4, ["soporte", "soporte", "maestranza"] * 4)
+        guardar_modelo(self.ruta, clf.clf_, clf.encoder_.classes_)
+        modelo = ModeloClasificador(self.ruta, tamano_cache=2)
+        primera = modelo.predict(["no anda el wifi"])
+        with patch.object(clf.clf_.__class__, "predict", side_effect=AssertionError("no debía clasificar")):
+            self.assertEqual(modelo.predict(["No anda el WiFi.", "el wifi no anda"]), primera * 2)
+        self.assertEqual(modelo.estadisticas_cache, {"aciertos": 2, "fallos": 1, "tamano": 1, "capacidad": 2})
+        modelo.predict(RECLAMOS)
+        self.assertEqual(modelo.estadisticas_cache["tamano"], 2)
+
+    def test_recargar_el_modelo_vacia_la_cache(self):
+        clf = ClaimsClassifier(tokenizador="regex").fit(RECLAMOS * 4, ["soporte", "soporte", "maestranza"] * 4)
+        guardar_modelo(self.ruta, clf.clf_, clf.encoder_.classes_)
+        modelo = ModeloClasificador(self.ruta)
+        modelo.predict(RECLAMOS)
+        guardar_modelo(self.ruta, clf.clf_, ["a", "b"])
+        modelo.recargar()
+        self.assertEqual(modelo.estadisticas_cache["tamano"], 0)
+        self.assertEqual(set(modelo.predict(RECLAMOS)), {"a", "b"})
+
+    def test_version_de_artefacto_no_soportada_falla(self):
+        with open(self.ruta, "wb") as archivo:
+            pickle.dump({"version": VERSION_FORMATO + 1}, archivo)
+        with self.assertRaisesRegex(ValueError, "no soportada"):
+            ModeloClasificador(self.ruta).predict(RECLAMOS)
+
+    def test_artefacto_incluido_en_el_proyecto(self):
+        raiz_proyecto = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        modelo = ModeloClasificador(os.path.join(raiz_proyecto, "data", "modelo_reclamos.pkl"))
+        self.assertEqual(modelo.predict(["La impresora de la biblioteca no imprime"]),
+                         ["soporte informático"])
+        # El artefacto usa el camino disperso: sin matriz densa ni centrado
+        pipeline = cargar_modelo(os.path.join(raiz_proyecto, "data", "modelo_reclamos.pkl"))["pipeline"]
+        self.assertTrue(pipeline.named_steps["vectorizer"].salida_dispersa)
+        self.assertFalse(pipeline.named_steps["scaler"].with_mean)
+
+class ClasificadorDePrueba:
+    """Devuelve el texto en mayúsculas y registra el tamaño de cada llamada."""
+    def __init__(self):
+        self.llamadas = []
+
+    def predict(self, X):
+        if "falla" in X:
+            raise RuntimeError("error del modelo")
+        self.llamadas.append(len(X))
+        return [texto.upper() for texto in X]
+
+class TestServicioClasificacionPorLotes(unittest.TestCase):
+
+    def test_peticiones_concurrentes_se_agrupan_en_lotes(self):
+        clasificador = ClasificadorDePrueba()
+        servicio = ServicioClasificacionPorLotes(clasificador, latencia_maxima=0.2, tamano_lote=4)
+        textos = [f"reclamo {i}" for i in range(8)]
+        with ThreadPoolExecutor(8) as hilos:
+            resultados = list(hilos.map(lambda texto: servicio.predict([texto]), textos))
+        self.assertEqual(resultados, [[texto.upper()] for texto in textos])
+        self.assertEqual(clasificador.llamadas, [4, 4])
+        self.assertEqual(servicio.estadisticas, {"lotes": 2, "reclamos": 8, "tamano_promedio": 4.0,
+                                                 "tamanos": {4: 2}})
+
+    def test_lote_incompleto_se_clasifica_al_vencer_la_latencia(self):
+        clasificador = ClasificadorDePrueba()
+        servicio = ServicioClasificacionPorLotes(clasificador, latencia_maxima=0.01, tamano_lote=100)
+        self.assertEqual(servicio.predict(["a", "b"]), ["A", "B"])
+        self.assertEqual(clasificador.llamadas, [2])
+
+    def test_error_del_clasificador_llega_a_cada_llamador(self):
+        servicio = ServicioClasificacionPorLotes(ClasificadorDePrueba(), latencia_maxima=0)
+        with self.assertRaisesRegex(RuntimeError, "error del modelo"):
+            servicio.predict(["falla"])
+        self.assertEqual(servicio.predict(["ok"]), ["OK"])
+
+    def test_parametros_invalidos_fallan(self):
+        with self.assertRaises(ValueError):
+            ServicioClasificacionPorLotes(ClasificadorDePrueba(), tamano_lote=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,256 @@
+# tests/test_repositorios.py
+import unittest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from modules.modelos import Base
+from modules.migraciones import migrar_esquema
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.dominio import Reclamo
+from datetime import datetime, timedelta
+
+class TestRepositorioReclamos(unittest.TestCase):
+
+    def setUp(self):
+        """Crea una base de datos SQLite en memoria para cada prueba."""
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        self.repo = RepositorioReclamosSQLAlchemy(sessionmaker(bind=engine)())
+        for descripcion, departamento in [("Proyector roto", "Soporte"),
+                                          ("Baño inundado", "Maestranza"),
+                                          ("Sin internet", "Soporte")]:
+            self.repo.guardar_registro(Reclamo(None, descripcion, "pendiente", 1, departamento))
+        self.repo.adherir_usuario_a_reclamo(2, 1)
+        self.repo.adherir_usuario_a_reclamo(3, 1)
+        self.repo.adherir_usuario_a_reclamo(2, 3)
+
+    def test_obtener_registros_con_adherentes(self):
+        reclamos = self.repo.obtener_registros_con_adherentes()
+        conteos = {r.id: r.adherentes for r in reclamos}
+        self.assertEqual(conteos, {1: 2, 2: 0, 3: 1})
+
+    def test_obtener_registros_con_adherentes_filtrados(self):
+        reclamos = self.repo.obtener_registros_con_adherentes(departamento="soporte")
+        self.assertEqual(sorted(r.id for r in reclamos), [1, 3])
+
+    def test_contar_adherentes_multiples(self):
+        self.assertEqual(self.repo.contar_adherentes_multiples([1, 2, 3]), {1: 2, 2: 0, 3: 1})
+        self.assertEqual(self.repo.contar_adherentes_multiples([]), {})
+
+    def test_guardar_y_modificar_firma_minhash(self):
+        reclamo = Reclamo(None, "Aula sin luz", "pendiente", 1, "Maestranza", p_minhash=b"\x01" * 16)
+        self.repo.guardar_registro(reclamo)
+        self.assertEqual(self.repo.obtener_registro_por_filtro("id", reclamo.id).minhash, b"\x01" * 16)
+        reclamo.minhash = b"\x02" * 16
+        self.repo.modificar_registro(reclamo)
+        self.assertEqual(self.repo.obtener_registro_por_filtro("id", reclamo.id).minhash, b"\x02" * 16)
+        self.assertIsNone(self.repo.obtener_registro_por_filtro("id", 1).minhash)
+
+    def test_guardar_registro_asigna_id_y_obtener_por_ids(self):
+        reclamo = Reclamo(None, "Aula sin luz", "pendiente", 1, "Maestranza")
+        self.repo.guardar_registro(reclamo)
+        self.assertEqual(reclamo.id, 4)
+        reclamos = self.repo.obtener_registros_por_ids([4, 99, 1])
+        self.assertEqual([r.id for r in reclamos], [4, 1])
+
+    def test_adherir_dos_veces_falla(self):
+        with self.assertRaisesRegex(ValueError, "El usuario ya está adherido a este reclamo"):
+            self.repo.adherir_usuario_a_reclamo(2, 1)
+        # La sesión sigue siendo utilizable después del rollback
+        self.assertEqual(self.repo.contar_adherentes(1), 2)
+
+    def test_obtener_pagina_recorre_todos_los_reclamos(self):
+        # Dos reclamos con la misma fecha: el id desempata el orden
+        fecha = datetime(2025, 1, 1)
+        for i in range(4):
+            self.repo.guardar_registro(Reclamo(None, f"Reclamo {i}", "pendiente", 1, "Soporte",
+                                               p_fecha_creacion=fecha + timedelta(days=min(i, 2))))
+        ids, cursor = [], None
+        while True:
+            pagina, cursor = self.repo.obtener_pagina(2, cursor, departamento="Soporte")
+            ids.extend(r.id for r in pagina)
+            if cursor is None:
+                break
+        # Del más nuevo al más antiguo; los reclamos 1 y 3 se crearon "ahora"
+        self.assertEqual(ids, [3, 1, 7, 6, 5, 4])
+
+    def test_obtener_pagina_incluye_adherentes(self):
+        pagina, cursor = self.repo.obtener_pagina(10)
+        self.assertIsNone(cursor)
+        self.assertEqual({r.id: r.adherentes for r in pagina}, {1: 2, 2: 0, 3: 1})
+
+    def test_obtener_pagina_cursor_invalido_falla(self):
+        with self.assertRaisesRegex(ValueError, "El cursor de paginación no es válido"):
+            self.repo.obtener_pagina(10, "no-es-un-cursor")
+
+class TestBusquedaTexto(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        migrar_esquema(engine)
+        self.repo = RepositorioReclamosSQLAlchemy(sessionmaker(bind=engine)())
+        for descripcion, departamento, estado in [("El proyector del aula 3 no enciende", "Soporte", "pendiente"),
+                                                  ("Baño inundado en la planta baja", "Maestranza", "pendiente"),
+                                                  ("Proyector sin cable HDMI", "Soporte", "resuelto"),
+                                                  ("Proyector del aula 3 y del aula 5 rotos, aula 3 sin luz", "Soporte", "pendiente")]:
+            self.repo.guardar_registro(Reclamo(None, descripcion, estado, 1, departamento))
+
+    def test_buscar_texto_por_prefijo_sin_tildes_y_ordenado_por_relevancia(self):
+        reclamos, cursor = self.repo.buscar_texto("proyect")
+        self.assertEqual(sorted(r.id for r in reclamos), [1, 3, 4])
+        self.assertIsNone(cursor)
+        self.assertEqual([r.id for r in self.repo.buscar_texto("BANO")[0]], [2])
+        # Todas las palabras deben aparecer; "aula 3" aparece dos veces en el reclamo 4
+        self.assertEqual([r.id for r in self.repo.buscar_texto("aula 3")[0]], [4, 1])
+        self.assertEqual(self.repo.buscar_texto("proyector\" (*")[0][0].adherentes, 0)
+        self.assertEqual(self.repo.buscar_texto("  ¿? "), ([], None))
+
+    def test_buscar_texto_con_filtros_y_paginado(self):
+        reclamos, _ = self.repo.buscar_texto("proyector", departamento="soporte", estado="pendiente")
+        self.assertEqual(sorted(r.id for r in reclamos), [1, 4])
+        primera, cursor = self.repo.buscar_texto("proyector", limite=2)
+        segunda, fin = self.repo.buscar_texto("proyector", limite=2, cursor=cursor)
+        self.assertEqual(len(primera), 2)
+        self.assertEqual(sorted(r.id for r in primera + segunda), [1, 3, 4])
+        self.assertIsNone(fin)
+        with self.assertRaisesRegex(ValueError, "cursor"):
+            self.repo.buscar_texto("proyector", cursor="x")
+
+    def test_indice_se_sincroniza_al_modificar_y_eliminar(self):
+        reclamo = self.repo.obtener_registro_por_filtro("id", 2)
+        reclamo.descripcion = "Pérdida de agua en el baño"
+        self.repo.modificar_registro(reclamo)
+        self.assertEqual(self.repo.buscar_texto("inundado")[0], [])
+        self.assertEqual([r.id for r in self.repo.buscar_texto("perdida agua")[0]], [2])
+        self.repo.eliminar_registro(2)
+        self.assertEqual(self.repo.buscar_texto("agua")[0], [])
+
+class TestSesionesConcurrentes(unittest.TestCase):
+
+    def test_cada_hilo_usa_su_propia_sesion_y_la_devuelve_al_pool(self):
+        import os
+        import tempfile
+        from concurrent.futures import ThreadPoolExecutor
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        engine = create_engine(f"sqlite:///{os.path.join(directorio.name, 'reclamos.db')}",
+                               pool_size=4, max_overflow=4)
+        self.addCleanup(engine.dispose)
+        migrar_esquema(engine)
+        Session = scoped_session(sessionmaker(bind=engine))
+        repo = RepositorioReclamosSQLAlchemy(Session)
+
+        def atender_peticion(i):
+            sesion = Session()
+            try:
+                reclamo = Reclamo(None, f"Reclamo {i}", "pendiente", i, "Soporte")
+                repo.guardar_registro(reclamo)
+                return id(sesion), repo.obtener_registro_por_filtro("id", reclamo.id).descripcion
+            finally:
+                Session.remove()
+
+        with ThreadPoolExecutor(max_workers=8) as ejecutor:
+            resultados = list(ejecutor.map(atender_peticion, range(64)))
+        self.assertEqual([descripcion for _, descripcion in resultados], [f"Reclamo {i}" for i in range(64)])
+        self.assertEqual(len(repo.obtener_todos_los_registros()), 64)
+        Session.remove()
+        self.assertEqual(engine.pool.checkedout(), 0)
+
+class TestPerfilSQLite(unittest.TestCase):
+
+    def test_pragmas_en_cada_conexion_y_lectores_no_bloqueados(self):
+        import os
+        import tempfile
+        from modules.perfil_sqlite import configurar_sqlite, obtener_pragmas
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        engine = create_engine(f"sqlite:///{os.path.join(directorio.name, 'reclamos.db')}")
+        self.addCleanup(engine.dispose)
+        configurar_sqlite(engine, cache_kb=2048, mmap_bytes=2**20, espera_ms=100)
+        migrar_esquema(engine)
+        repo = RepositorioReclamosSQLAlchemy(sessionmaker(bind=engine)())
+        repo.guardar_registro(Reclamo(None, "Proyector roto", "pendiente", 1, "Soporte"))
+
+        with engine.connect() as escritor, engine.connect() as lector:
+            self.assertEqual(obtener_pragmas(lector), {"journal_mode": "wal", "synchronous": 1, "cache_size": -2048,
+                                                       "mmap_size": 2**20, "temp_store": 2, "busy_timeout": 100})
+            # Con WAL, una escritura sin confirmar no impide leer el último estado confirmado
+            escritor.execute(text("INSERT INTO reclamos (descripcion, estado, id_usuario, departamento, fecha_creacion) "
+                                  "VALUES ('Aula sin luz', 'pendiente', 1, 'Maestranza', CURRENT_TIMESTAMP)"))
+            self.assertEqual(lector.execute(text("SELECT COUNT(*) FROM reclamos")).scalar(), 1)
+            escritor.commit()
+            self.assertEqual(lector.execute(text("SELECT COUNT(*) FROM reclamos")).scalar(), 2)
+
+    def test_restaurar_journal_por_defecto_sale_del_modo_wal(self):
+        import os
+        import tempfile
+        from modules.perfil_sqlite import configurar_sqlite, restaurar_journal_por_defecto, obtener_pragmas
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        url = f"sqlite:///{os.path.join(directorio.name, 'reclamos.db')}"
+        optimizado = create_engine(url)
+        configurar_sqlite(optimizado)
+        migrar_esquema(optimizado)
+        optimizado.dispose()
+
+        # El modo WAL quedó guardado en el archivo: un motor sin el perfil lo sigue usando
+        por_defecto = create_engine(url)
+        self.addCleanup(por_defecto.dispose)
+        with por_defecto.connect() as conexion:
+            self.assertEqual(obtener_pragmas(conexion)["journal_mode"], "wal")
+        restaurar_journal_por_defecto(por_defecto)
+        with por_defecto.connect() as conexion:
+            self.assertEqual(obtener_pragmas(conexion)["journal_mode"], "delete")
+        self.assertFalse(os.path.exists(os.path.join(directorio.name, 'reclamos.db-wal')))
+
+class TestMigraciones(unittest.TestCase):
+
+    def test_migrar_base_existente_crea_indices(self):
+        """Simula una base creada con el esquema anterior (sin índices y con adhesiones duplicadas)."""
+        engine = create_engine('sqlite:///:memory:')
+        with engine.begin() as conexion:
+            conexion.execute(text("CREATE TABLE usuarios (id INTEGER PRIMARY KEY, nombre VARCHAR, apellido VARCHAR, "
+                                  "username VARCHAR, email VARCHAR, password VARCHAR, rol VARCHAR, claustro VARCHAR, departamento VARCHAR)"))
+            conexion.execute(text("CREATE TABLE reclamos (id INTEGER PRIMARY KEY, descripcion VARCHAR, estado VARCHAR, "
+                                  "departamento VARCHAR, fecha_creacion DATETIME, fecha_resolucion DATETIME, id_usuario INTEGER, foto VARCHAR)"))
+            conexion.execute(text("CREATE TABLE adherencias (id INTEGER PRIMARY KEY, id_usuario INTEGER, id_reclamo INTEGER)"))
+            conexion.execute(text("INSERT INTO adherencias (id_usuario, id_reclamo) VALUES (1, 1), (1, 1), (2, 1)"))
+
+        migrar_esquema(engine)
+        migrar_esquema(engine) # Debe ser idempotente
+
+        with engine.connect() as conexion:
+            # Se consulta sqlite_master porque el inspector de SQLAlchemy omite los índices sobre expresiones
+            indices = dict(conexion.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'index'")).all())
+            self.assertTrue({'ix_reclamos_departamento_estado', 'ix_reclamos_id_usuario', 'ix_reclamos_fecha_creacion',
+                             'ix_adherencias_id_reclamo', 'ux_adherencias_usuario_reclamo'} <= set(indices))
+            self.assertIn("UNIQUE", indices['ux_adherencias_usuario_reclamo'])
+            self.assertEqual(conexion.execute(text("SELECT COUNT(*) FROM adherencias")).scalar(), 2)
+            # Las columnas nuevas se agregan a la tabla existente
+            columnas = [fila[1] for fila in conexion.execute(text("PRAGMA table_info(reclamos)"))]
+            self.assertEqual(columnas.count('minhash'), 1)
+            self.assertEqual(conexion.execute(text("SELECT COUNT(*) FROM reclamos_fts")).scalar(), 0)
+
+    def test_migrar_completa_fechas_de_creacion_nulas(self):
+        """Los reclamos sin fecha de creación de una base anterior no deben romper ni saltearse en la paginación."""
+        engine = create_engine('sqlite:///:memory:')
+        with engine.begin() as conexion:
+            conexion.execute(text("CREATE TABLE reclamos (id INTEGER PRIMARY KEY, descripcion VARCHAR, estado VARCHAR, "
+                                  "departamento VARCHAR, fecha_creacion DATETIME, fecha_resolucion DATETIME, id_usuario INTEGER, foto VARCHAR)"))
+            conexion.execute(text("INSERT INTO reclamos (descripcion, estado, departamento, fecha_creacion, id_usuario) VALUES "
+                                  "('Con fecha', 'pendiente', 'Soporte', '2024-01-01 10:00:00.000000', 1), "
+                                  "('Sin fecha 1', 'pendiente', 'Soporte', NULL, 1), "
+                                  "('Sin fecha 2', 'pendiente', 'Soporte', NULL, 1)"))
+
+        migrar_esquema(engine)
+
+        repo = RepositorioReclamosSQLAlchemy(sessionmaker(bind=engine)())
+        descripciones, cursor = [], None
+        while True:
+            pagina, cursor = repo.obtener_pagina(1, cursor)
+            descripciones += [r.descripcion for r in pagina]
+            if cursor is None:
+                break
+        self.assertEqual(descripciones, ["Con fecha", "Sin fecha 2", "Sin fecha 1"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 # tests/test_server.py
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 # Importamos la app directamente desde el archivo 'server' para asegurar
 # que estamos probando la instancia correcta con todas las rutas registradas.
@@ -44,8 +44,10 @@ class TestServer(unittest.TestCase):
             sess['user_id'] = user_id
 
     def test_pagina_inicio_publica(self):
-        """Verifica que la página de inicio carga correctamente."""
-        response = self.client.get('/')
+        """Verifica que la página de inicio carga correctamente, sin consultar reclamos."""
+        with patch('modules.gestor_reclamos.GestorDeReclamos.listar_reclamos_paginados') as mock_pagina:
+            response = self.client.get('/')
+            mock_pagina.assert_not_called()
         self.assertEqual(response.status_code, 200)
         self.assertIn(b"Bienvenido al Sistema de Reclamos", response.data)
 
@@ -62,13 +64,40 @@ class TestServer(unittest.TestCase):
 
     def test_acceso_a_dashboard_como_jefe(self):
         """Verifica que un usuario con rol 'jefe' puede acceder al dashboard."""
-        with patch('modules.analitica.Analitica.obtener_datos_dashboard', return_value=([], {})) as mock_dashboard_data:
+        with patch('modules.analitica.Analitica.obtener_datos_dashboard', return_value=([], {}, None)) as mock_dashboard_data:
             self._login(rol='jefe', departamento='Mantenimiento')
             response = self.client.get('/dashboard')
             
             self.assertEqual(response.status_code, 200)
             self.assertIn(b"Panel de Administraci\xc3\xb3n", response.data)
-            mock_dashboard_data.assert_called_once_with(departamento='Mantenimiento')
+            mock_dashboard_data.assert_called_once_with(departamento='Mantenimiento', cursor=None, limite=None)
+
+    def test_listar_reclamos_muestra_enlace_a_pagina_siguiente(self):
+        """Verifica que el listado pide una página y enlaza a la siguiente con su cursor."""
+        reclamo = Reclamo(p_id=7, p_descripcion="Test", p_estado="pendiente", pd_id_usuario=1, p_departamento="Soporte")
+        reclamo.adherentes = 0
+        with patch('modules.gestor_reclamos.GestorDeReclamos.listar_reclamos_paginados',
+                   return_value=([reclamo], "2025-01-01T10:00:00_7")) as mock_pagina:
+            self._login(rol='usuario')
+            response = self.client.get('/listar_reclamos?limite=1')
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b"cursor=2025-01-01T10:00:00_7", response.data)
+            mock_pagina.assert_called_once_with(None, 1, estado="pendiente")
+
+    def test_buscar_reclamos_como_usuario_busca_solo_pendientes(self):
+        """Verifica que la búsqueda de un usuario final se limita a reclamos pendientes y pagina."""
+        reclamo = Reclamo(p_id=7, p_descripcion="Proyector roto", p_estado="pendiente", pd_id_usuario=1, p_departamento="Soporte")
+        reclamo.adherentes = 0
+        with patch('modules.gestor_reclamos.GestorDeReclamos.buscar_reclamos',
+                   return_value=([reclamo], "1")) as mock_busqueda:
+            self._login(rol='usuario')
+            response = self.client.get('/buscar_reclamos?q=proyector&limite=1')
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b"Proyector roto", response.data)
+            self.assertIn(b"cursor=1", response.data)
+            mock_busqueda.assert_called_once_with("proyector", None, 1, estado="pendiente")
 
     def test_acceso_denegado_a_dashboard_para_usuario_normal(self):
         """Verifica que un usuario normal es redirigido del dashboard."""
@@ -92,6 +121,102 @@ class TestServer(unittest.TestCase):
             self.assertEqual(response.mimetype, 'text/html')
             mock_reporte.assert_called_with('Soporte', 'html')
 
+    def test_generar_reporte_repetido_responde_304(self):
+        """Verifica que una descarga repetida del mismo reporte no lo vuelve a generar."""
+        with patch('modules.analitica.Analitica.generar_reporte_formateado') as mock_reporte:
+            mock_reporte.return_value = ("<html><body>Reporte de Prueba</body></html>", "text/html", {})
+            self._login(rol='jefe', departamento='Soporte')
+            primera = self.client.get('/generar_reporte?formato=html')
+            etag = primera.headers['ETag']
+            self.assertIn("private", primera.headers['Cache-Control'])
+            self.assertIn('Last-Modified', primera.headers)
+
+            segunda = self.client.get('/generar_reporte?formato=html', headers={'If-None-Match': etag})
+            self.assertEqual(segunda.status_code, 304)
+            self.assertEqual(segunda.headers['ETag'], etag)
+            mock_reporte.assert_called_once()
+
+    def test_grafico_repetido_responde_304(self):
+        """Verifica que el navegador revalida el gráfico sin que se vuelva a dibujar."""
+        with patch('modules.analitica.Analitica.obtener_imagen_grafico', return_value=b"png") as mock_grafico:
+            self._login(rol='jefe', departamento='Soporte')
+            primera = self.client.get('/grafico/torta/Soporte')
+            self.assertEqual(primera.status_code, 200)
+            self.assertEqual(primera.mimetype, 'image/png')
+            etag = primera.headers['ETag']
+            self.assertIn("no-cache", primera.headers['Cache-Control'])
+
+            segunda = self.client.get('/grafico/torta/Soporte', headers={'If-None-Match': etag})
+            self.assertEqual(segunda.status_code, 304)
+            mock_grafico.assert_called_once_with('torta', 'Soporte')
+            self.assertEqual(self.client.get('/grafico/barras/Soporte').status_code, 400)
+
+    def test_generar_reporte_en_segundo_plano(self):
+        """Verifica el pedido asíncrono de un reporte, la consulta de su estado y la descarga."""
+        import time
+        with patch('modules.analitica.Analitica.generar_reporte_formateado') as mock_reporte:
+            mock_reporte.return_value = (b"%PDF-prueba", "application/pdf", {})
+            self._login(rol='jefe', departamento='Soporte')
+            respuesta = self.client.get('/generar_reporte?formato=pdf&async=1')
+            self.assertEqual(respuesta.status_code, 202)
+            trabajo = respuesta.get_json()
+            self.assertEqual(self.client.get('/generar_reporte?formato=pdf&async=1').get_json()["id"], trabajo["id"])
+
+            for _ in range(100):
+                estado = self.client.get(trabajo["url_estado"]).get_json()
+                if estado["estado"] == "terminado":
+                    break
+                time.sleep(0.02)
+            self.assertEqual(estado["estado"], "terminado")
+            descarga = self.client.get(estado["url_descarga"])
+            self.assertEqual(descarga.status_code, 200)
+            self.assertEqual(descarga.data, b"%PDF-prueba")
+            mock_reporte.assert_called_once_with('Soporte', 'pdf', ANY)
+            self.assertEqual(self.client.get('/reportes/inexistente').status_code, 404)
+            self.assertEqual(self.client.get('/generar_reporte?formato=docx&async=1').status_code, 400)
+
+    def test_peticiones_concurrentes_a_la_base_de_datos(self):
+        """
+        Verifica que muchas peticiones en paralelo consultan la base sin interferirse, y
+        que cada una toma una conexión del pool y la devuelve al terminar.
+        """
+        import gc
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import Lock
+        from sqlalchemy import event
+        from sqlalchemy.pool import Pool
+        movimientos = {"checkout": 0, "checkin": 0}
+        lock = Lock()
+        def contar(tipo):
+            def oyente(*args):
+                with lock:
+                    movimientos[tipo] += 1
+            return oyente
+        self._login(rol='usuario')
+        clientes = []
+        for _ in range(8):
+            cliente = app.test_client()
+            with cliente.session_transaction() as sess:
+                sess['_user_id'] = 99
+            clientes.append(cliente)
+        # Se cuentan solo los movimientos de las peticiones en paralelo: antes se recolectan
+        # las sesiones de otras pruebas, que devolverían sus conexiones al ser liberadas
+        gc.collect()
+        oyentes = [(tipo, contar(tipo)) for tipo in movimientos]
+        for tipo, oyente in oyentes:
+            event.listen(Pool, tipo, oyente)
+            self.addCleanup(event.remove, Pool, tipo, oyente)
+
+        def pedir(i):
+            respuesta = clientes[i % len(clientes)].get('/buscar_reclamos?q=aula')
+            return respuesta.status_code
+
+        with ThreadPoolExecutor(max_workers=8) as ejecutor:
+            codigos = list(ejecutor.map(pedir, range(64)))
+        self.assertEqual(codigos, [200] * 64)
+        self.assertGreater(movimientos["checkout"], 0)
+        self.assertEqual(movimientos["checkin"], movimientos["checkout"])
+
     def test_derivar_reclamo_como_secretario(self):
         """
         NUEVA PRUEBA: Verifica que un secretario puede derivar un reclamo.